@@ -1,22 +1,258 @@
-from fastapi import FastAPI
-from fastapi.responses import FileResponse
+import asyncio
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from typing import Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.exceptions import HTTPException
-from agent.graph import graph
+from agent.cache import ReportCache, SqliteCache, report_cache_key
+from agent.configuration import Configuration
+from agent.graph import compile_graph
+from agent.jobs import Job, JobManager, QueueFullError
+from agent.runs import format_sse, open_checkpointer, stream_report
+from agent.rubric import grading_stats
+from agent.search_client import close_tavily_client
+from agent.validation import get_job_description_classifier
+from agent.vectorstore import close_vector_indexes
 from pydantic import BaseModel
 
+REPORT_CACHE_PATH = os.getenv("REPORT_CACHE_DB", ".cache/report_cache.sqlite")
+REPORT_CACHE_TTL_SECONDS = int(os.getenv("REPORT_CACHE_TTL_SECONDS", "86400"))
+REPORT_CACHE_MAX_BYTES = int(os.getenv("REPORT_CACHE_MAX_BYTES", "67108864"))
+JOBS_DIR = os.getenv("JOBS_DIR", ".cache/jobs")
+MAX_CONCURRENT_RUNS = int(os.getenv("MAX_CONCURRENT_RUNS", "2"))
+MAX_QUEUED_RUNS = int(os.getenv("MAX_QUEUED_RUNS", "16"))
+# Configuration overrides passed to every report run, as a JSON object
+REPORT_CONFIGURABLE = json.loads(os.getenv("REPORT_CONFIGURABLE", "{}"))
+
+
 class ChatInput(BaseModel):
     user_message: str
+    # Runs with the same id resume from the last checkpoint if they failed
+    run_id: Optional[str] = None
+    # Skip the report cache and generate a new report
+    refresh: bool = False
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.report_cache = ReportCache(
+        SqliteCache(REPORT_CACHE_PATH, REPORT_CACHE_TTL_SECONDS, REPORT_CACHE_MAX_BYTES)
+    )
+    app.state.jobs = JobManager(
+        JOBS_DIR,
+        MAX_CONCURRENT_RUNS,
+        MAX_QUEUED_RUNS,
+        # Job files live as long as the reports they point at
+        ttl_seconds=REPORT_CACHE_TTL_SECONDS,
+        cached_report=lambda key: (app.state.report_cache.get(key) or {}).get(
+            "final_report"
+        ),
+    )
+    async with open_checkpointer() as checkpointer:
+        app.state.graph = compile_graph(checkpointer)
+        app.state.jobs.start()
+        yield
+        await app.state.jobs.stop()
+    app.state.report_cache.store.close()
+    await close_tavily_client()
+    await close_vector_indexes()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+def report_response(
+    entry: dict, key: str, status: str, coalesced: bool = False
+) -> Response:
+    age = max(0, int(time.time() - entry["created_at"]))
+    return Response(
+        content=entry["final_report"],
+        media_type="text/markdown",
+        headers={
+            "X-Cache": status,
+            "X-Coalesced": "true" if coalesced else "false",
+            "X-Cache-Key": key,
+            "Age": str(age),
+            "Cache-Control": f"private, max-age={REPORT_CACHE_TTL_SECONDS}",
+            "Content-Disposition": 'attachment; filename="final_report.md"',
+        },
+    )
+
+
+def wants_refresh(chat_input: ChatInput, request: Request) -> bool:
+    return chat_input.refresh or "no-cache" in request.headers.get(
+        "cache-control", ""
+    )
+
+
+def job_status(job: Job) -> dict:
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+        "error": job.error,
+    }
+
+
+def report_key(chat_input: ChatInput) -> str:
+    """Cache key of the report under the configuration its run is given."""
+    config = Configuration.from_runnable_config({"configurable": REPORT_CONFIGURABLE})
+    return report_cache_key(chat_input.user_message, config)
+
+
+def submit_job(app: FastAPI, chat_input: ChatInput, key: str) -> Job:
+    """Queue a graph run for ``chat_input`` that caches its report.
+
+    The run publishes its progress events to the job, so ``/reports/stream``
+    can follow a run that was submitted through any endpoint. Only reports
+    for valid job descriptions are cached.
+    """
+
+    async def work(job: Job) -> str:
+        final_report = None
+        # A resumed run has already passed validation
+        valid = True
+        async for event in stream_report(
+            app.state.graph,
+            chat_input.user_message,
+            chat_input.run_id,
+            REPORT_CONFIGURABLE,
+        ):
+            app.state.jobs.publish(job.id, event)
+            if event["event"] == "validation":
+                valid = event["data"]["valid"]
+            if event["event"] == "report":
+                final_report = event["data"]["final_report"]
+        print("response:", {"final_report": final_report})
+        if final_report is None:
+            raise RuntimeError("The report run finished without a report")
+        if valid:
+            await asyncio.to_thread(app.state.report_cache.set, key, final_report)
+        return final_report
 
-@app.post("/chat")
-async def chat(chat_input: ChatInput):
     try:
-        response = await graph.ainvoke({"topic": chat_input.user_message})
-        print("response:", response)
-        with open("final_report.md", "w") as f:
-            f.write(response["final_report"])
-        return FileResponse("final_report.md", media_type="text/markdown")
-    except Exception as e:
-        return HTTPException(status_code=500, detail=str(e))
+        return app.state.jobs.submit(key, work)
+    except QueueFullError as e:
+        raise HTTPException(
+            status_code=429, detail=str(e), headers={"Retry-After": "30"}
+        ) from e
+
+
+@app.post("/chat")
+async def chat(chat_input: ChatInput, request: Request):
+    """Blocking variant of ``POST /reports`` that waits for the report."""
+    cache: ReportCache = request.app.state.report_cache
+    jobs: JobManager = request.app.state.jobs
+    key = report_key(chat_input)
+    refresh = wants_refresh(chat_input, request)
+    if not refresh:
+        entry = await asyncio.to_thread(cache.get, key)
+        if entry is not None:
+            return report_response(entry, key, "HIT")
+    coalesced = jobs.is_active(key)
+    job = await jobs.wait(submit_job(request.app, chat_input, key).id)
+    if job.status != "done":
+        raise HTTPException(status_code=500, detail=job.error)
+    entry = {
+        "final_report": await asyncio.to_thread(jobs.report, job.id),
+        "created_at": job.finished_at,
+    }
+    return report_response(entry, key, "REFRESH" if refresh else "MISS", coalesced)
+
+
+@app.post("/reports", status_code=202)
+async def submit_report(chat_input: ChatInput, request: Request):
+    """Queue a report run and return its job id without waiting for it."""
+    jobs: JobManager = request.app.state.jobs
+    key = report_key(chat_input)
+    if not wants_refresh(chat_input, request):
+        entry = await asyncio.to_thread(request.app.state.report_cache.get, key)
+        if entry is not None:
+            job = await asyncio.to_thread(jobs.add_finished, key)
+            return JSONResponse(
+                {**job_status(job), "report": entry["final_report"]},
+                status_code=200,
+                headers={"X-Cache": "HIT"},
+            )
+    job = submit_job(request.app, chat_input, key)
+    return JSONResponse(
+        job_status(job),
+        status_code=202,
+        headers={"Location": f"/reports/{job.id}", "X-Cache": "MISS"},
+    )
+
+
+@app.post("/reports/stream")
+async def stream_report_events(chat_input: ChatInput, request: Request):
+    """Stream validation, plan, section and report events as server-sent events.
+
+    The run is queued like any other job; a request for a job description
+    that is already being generated follows that run instead of starting one.
+    """
+    cache: ReportCache = request.app.state.report_cache
+    jobs: JobManager = request.app.state.jobs
+    key = report_key(chat_input)
+    entry = None
+    if not wants_refresh(chat_input, request):
+        entry = await asyncio.to_thread(cache.get, key)
+    job = None if entry is not None else submit_job(request.app, chat_input, key)
+
+    async def events():
+        if job is None:
+            data = {"final_report": entry["final_report"]}
+            yield format_sse({"event": "report", "data": data})
+            return
+        yield format_sse({"event": "job", "data": job_status(job)})
+        async for event in jobs.events(job.id):
+            yield format_sse(event)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Cache": "HIT" if entry is not None else "MISS",
+        },
+    )
+
+
+@app.get("/reports/{job_id}")
+async def get_report(job_id: str, request: Request):
+    """Return the job's status, and its report once it is done."""
+    jobs: JobManager = request.app.state.jobs
+    job = await asyncio.to_thread(jobs.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown report job {job_id}")
+    status = job_status(job)
+    if job.status == "done":
+        status["report"] = await asyncio.to_thread(jobs.report, job_id)
+    return status
+
+
+@app.get("/metrics")
+async def metrics(request: Request):
+    report_cache: ReportCache = request.app.state.report_cache
+    jobs: JobManager = request.app.state.jobs
+    validation = get_job_description_classifier().stats
+    return {
+        "report_cache": {
+            **asdict(report_cache.stats),
+            "hit_rate": report_cache.stats.hit_rate,
+        },
+        "jobs": {**asdict(jobs.stats), "queued": jobs.queued, "running": jobs.running},
+        "validation": {
+            **asdict(validation),
+            "fast_path_share": validation.fast_path_share,
+        },
+        "grading": {
+            **asdict(grading_stats),
+            "grader_calls_saved": grading_stats.grader_calls_saved,
+        },
+    }
@@ -1,12 +1,21 @@
 import base64
 import os
+import time
 
 from dotenv import load_dotenv
 import requests
+from requests.adapters import HTTPAdapter
 import streamlit as st
 
 load_dotenv()
 FASTAPI_URL = os.getenv("FASTAPI_URL")
+POLL_INTERVAL_SECONDS = 2
+# Give up waiting for a report job after this long
+MAX_WAIT_SECONDS = 30 * 60
+# (connect, read) timeouts for calls to the backend
+REQUEST_TIMEOUT = (5, 30)
+# Older reports are collapsed; only the newest ones are rendered in full
+EXPANDED_REPORTS = 1
 
 # Initialize session state variables
 if "messages" not in st.session_state:
@@ -16,6 +25,16 @@ if "research_document" not in st.session_state:
 
 st.set_page_config(page_title="Job Interview Preparation Assistant", layout="wide")
 
+
+@st.cache_resource
+def get_session():
+    """Shared HTTP session so reruns reuse pooled connections to the backend."""
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+    return session
+
+
 # Sidebar
 with st.sidebar:
     st.title("Job Interview Preparation Assistant")
@@ -31,9 +50,11 @@ with st.sidebar:
 st.title("Job Interview Preparation Assistant")
 
 # Function to create a download link for the markdown file
+@st.cache_data(max_entries=64)
 def get_download_link(file_content, file_name):
     """
     Generates a link allowing the user to download a file from the app.
+    Cached so reruns do not re-encode every report.
     :param file_content: The content of the file to download.
     :param file_name: The name of the file to download.
     :return: A link to download the file.
@@ -42,11 +63,36 @@ def get_download_link(file_content, file_name):
     href = f'<a href="data:file/markdown;base64,{b64}" download="{file_name}">Download {file_name}</a>'
     return href
 
+
+def report_title(content):
+    """First heading of a report, used as the label of its collapsed view."""
+    for line in content.splitlines():
+        if line.startswith("#"):
+            return line.lstrip("#").strip()
+    return "Interview Preparation Guide"
+
+
+def render_report(content, index, collapsed):
+    """Render a report in full, or as a collapsed entry rendered on demand."""
+    if not collapsed:
+        st.markdown(content)
+        return
+    st.markdown(f"**{report_title(content)}** ({len(content.splitlines())} lines)")
+    # The markdown is only rendered while the toggle is on
+    if st.toggle("Show report", key=f"show_report_{index}"):
+        st.markdown(content)
+        st.markdown(get_download_link(content, "Interview_Preparation_Guide.md"), unsafe_allow_html=True)
+
 # Chat
-for message in st.session_state.messages:
+report_indices = [
+    i for i, message in enumerate(st.session_state.messages)
+    if message["role"] == "assistant" and message.get("is_markdown")
+]
+expanded_reports = set(report_indices[-EXPANDED_REPORTS:]) if EXPANDED_REPORTS else set()
+for i, message in enumerate(st.session_state.messages):
     with st.chat_message(message["role"]):
-        if message["role"] == "assistant" and "is_markdown" in message and message["is_markdown"]:
-            st.markdown(message["content"])
+        if message["role"] == "assistant" and message.get("is_markdown"):
+            render_report(message["content"], i, collapsed=i not in expanded_reports)
         else:
             st.write(message["content"])
 
@@ -60,15 +106,38 @@ if prompt := st.chat_input("Enter a job description to get started..."):
         with st.chat_message("assistant"):
             with st.spinner(f"Deep research in progress..."):
                 try:
-                    response = requests.post(
-                        f"{FASTAPI_URL}/chat",
+                    session = get_session()
+                    response = session.post(
+                        f"{FASTAPI_URL}/reports",
                         json={
                             "user_message": prompt
-                        }
+                        },
+                        timeout=REQUEST_TIMEOUT,
                     )
                     
-                    if response.status_code == 200:
-                        research_document = response.text
+                    # Poll the job until the report is ready
+                    job = response.json() if response.status_code in (200, 202) else None
+                    deadline = time.monotonic() + MAX_WAIT_SECONDS
+                    while job is not None and job["status"] in ("queued", "running"):
+                        if time.monotonic() > deadline:
+                            break
+                        time.sleep(POLL_INTERVAL_SECONDS)
+                        response = session.get(f"{FASTAPI_URL}/reports/{job['job_id']}", timeout=REQUEST_TIMEOUT)
+                        job = response.json() if response.status_code == 200 else None
+                    
+                    if job is not None and job["status"] in ("queued", "running", "failed"):
+                        if job["status"] == "failed":
+                            error = f"Report generation failed: {job['error']}"
+                        else:
+                            error = f"The report is still {job['status']} after {MAX_WAIT_SECONDS // 60} minutes. Please try again later."
+                        st.error(error)
+                        st.session_state.messages.append({
+                            "role": "assistant", 
+                            "content": f"Error: {error}",
+                            "is_markdown": False
+                        })
+                    elif job is not None and job["status"] == "done":
+                        research_document = job["report"]
                         
                         st.session_state.research_document = research_document
                         
@@ -0,0 +1,208 @@
+"""Persistent caches backed by a local SQLite file."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from agent.configuration import Configuration
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for a cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class SqliteCache:
+    """Key/value store of zlib-compressed JSON with TTL and LRU eviction.
+
+    Entries older than ``ttl_seconds`` are treated as misses. When the total
+    compressed size exceeds ``max_bytes`` the least recently read entries are
+    evicted first.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float, max_bytes: int) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for ``key`` or ``None`` on a miss."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            value, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._conn.commit()
+                self.stats.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.stats.hits += 1
+        return json.loads(zlib.decompress(value))
+
+    def set(self, key: str, value: Any) -> None:
+        """Store ``value`` under ``key`` and evict old entries if over budget."""
+        blob = zlib.compress(json.dumps(value).encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+            self.stats = CacheStats()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self) -> None:
+        (total,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, size FROM entries ORDER BY accessed_at ASC"
+        ).fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            self.stats.evictions += 1
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase ``query`` and collapse whitespace."""
+    return " ".join(query.lower().split())
+
+
+def search_cache_key(query: str, max_results: int, topic: str) -> str:
+    payload = f"{normalize_query(query)}\x1f{max_results}\x1f{topic}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SearchCache:
+    """Cache of Tavily search responses keyed by query, max results and topic."""
+
+    def __init__(self, store: SqliteCache) -> None:
+        self.store = store
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.store.stats
+
+    def get(self, query: str, max_results: int, topic: str) -> Optional[Dict]:
+        return self.store.get(search_cache_key(query, max_results, topic))
+
+    def set(self, query: str, max_results: int, topic: str, response: Dict) -> None:
+        self.store.set(search_cache_key(query, max_results, topic), response)
+
+
+def normalize_job_description(topic: str) -> str:
+    """Collapse whitespace so trivially different pastes of a JD compare equal."""
+    return " ".join(topic.split())
+
+
+def configuration_hash(config: Configuration) -> str:
+    """Hash every field of ``config`` so any setting change gives a new key."""
+    payload = json.dumps(asdict(config), sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def report_cache_key(topic: str, config: Configuration) -> str:
+    jd_hash = hashlib.sha256(
+        normalize_job_description(topic).encode("utf-8")
+    ).hexdigest()
+    return f"{jd_hash}:{configuration_hash(config)}"
+
+
+class ReportCache:
+    """Cache of final reports keyed by job description and configuration."""
+
+    def __init__(self, store: SqliteCache) -> None:
+        self.store = store
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.store.stats
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return ``{"final_report", "created_at"}`` for ``key`` or ``None``."""
+        return self.store.get(key)
+
+    def set(self, key: str, final_report: str) -> Dict[str, Any]:
+        entry = {"final_report": final_report, "created_at": time.time()}
+        self.store.set(key, entry)
+        return entry
+
+
+_search_caches: Dict[Tuple[str, float, int], SearchCache] = {}
+_search_caches_lock = threading.Lock()
+
+
+def get_search_cache(config: Configuration) -> Optional[SearchCache]:
+    """Return the shared search cache for ``config`` or ``None`` when bypassed."""
+    if not config.search_cache_enabled:
+        return None
+    key = (
+        config.search_cache_path,
+        config.search_cache_ttl_seconds,
+        config.search_cache_max_bytes,
+    )
+    with _search_caches_lock:
+        if key not in _search_caches:
+            _search_caches[key] = SearchCache(SqliteCache(*key))
+        return _search_caches[key]
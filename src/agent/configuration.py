@@ -38,9 +38,34 @@ class Configuration:
     writer_provider: str = "openai"
     writer_model: str = "gpt-4o-mini"
     search_api: str = "tavily"
+    fast_validation: bool = True # decide clear job descriptions without the LLM
     number_of_queries: int = 15
-    top_k: int = 2 # pinecone top k results
+    top_k: int = 2 # vector index top k results per query
+    rag_backend: str = "none" # "pinecone", "local" or "none"
+    pinecone_index: str = "resourcebooks"
+    local_index_path: str = ".cache/local_index.npz"
+    embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
     max_search_depth: int = 2
+    planning_mode: str = "sequential" # "pipelined" starts research as the plan streams
+    grading_mode: str = "separate" # "separate" (writer, then grader) or "combined"
+    # Delta revisions are graded by the separate grader even in combined mode
+    revision_mode: str = "rewrite" # "rewrite" the section or merge "delta" edits
+    final_context: str = "digest" # research sections for the final writers: "digest" or "full"
+    local_grading: bool = True # fail drafts that break the rubric without the LLM
+    min_section_questions: int = 3
+    min_section_words: int = 150
+    search_cache_enabled: bool = True # set False to bypass the search cache
+    search_cache_path: str = ".cache/search_cache.sqlite"
+    search_cache_ttl_seconds: int = 7 * 24 * 60 * 60
+    search_cache_max_bytes: int = 512 * 1024 * 1024
+    query_similarity_threshold: float = 0.85 # word overlap for sharing a search
+    search_max_concurrency: int = 8 # process-wide cap on in-flight searches
+    search_rate_per_second: float = 5.0
+    search_max_retries: int = 4
+    max_context_tokens: int = 16000 # token budget for search results per prompt
+    near_duplicate_threshold: float = 0.8 # estimated Jaccard similarity of pages
+    passage_top_k: int = 30 # BM25 passages per section sent to the writer
+    passage_max_chars: int = 1200
 
     @classmethod
     def from_runnable_config(
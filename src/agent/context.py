@@ -0,0 +1,164 @@
+"""Pack search results into a prompt under a total token budget."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, List, Sequence, Union
+
+import tiktoken
+
+from agent.sources import Source
+
+TOKENIZER_ENCODING = "o200k_base"
+# Page lengths are estimated at 4 characters per token, and at most 8
+# characters per token are assumed when cutting the prefix to tokenize
+APPROX_CHARS_PER_TOKEN = 4
+MAX_CHARS_PER_TOKEN = 8
+
+
+class ApproximateEncoding:
+    """Word and punctuation splitter used when the tiktoken files are unavailable."""
+
+    _TOKEN = re.compile(r"\s*\w+|\s*[^\w\s]|\s+")
+
+    def encode(self, text: str, **kwargs: Any) -> List[str]:
+        return self._TOKEN.findall(text)
+
+    def decode(self, tokens: Sequence[str]) -> str:
+        return "".join(tokens)
+
+
+@lru_cache(maxsize=None)
+def get_encoding() -> Union[tiktoken.Encoding, ApproximateEncoding]:
+    try:
+        return tiktoken.get_encoding(TOKENIZER_ENCODING)
+    except (OSError, ValueError) as e:
+        # tiktoken downloads its BPE files on first use, which fails offline
+        # (network errors are OSErrors) or with a corrupt download (ValueError)
+        print(f"Warning: tiktoken unavailable ({e}), approximating token counts")
+        return ApproximateEncoding()
+
+
+def count_tokens(text: str) -> int:
+    return len(get_encoding().encode(text, disallowed_special=()))
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // APPROX_CHARS_PER_TOKEN)
+
+
+@dataclass
+class PackedContext:
+    """Prompt text produced by ``pack_sources`` with its token accounting."""
+
+    text: str
+    packed_tokens: int
+    dropped_tokens: int
+    sources_packed: int
+    sources_dropped: int
+
+
+def allocate_budget(
+    lengths: Sequence[int], weights: Sequence[float], budget: int
+) -> List[int]:
+    """Split ``budget`` across items in proportion to ``weights``.
+
+    No item gets more than its length; budget an item cannot use is handed
+    to the remaining items in the next round (water filling).
+    """
+    allocation = [0] * len(lengths)
+    open_items = [i for i, length in enumerate(lengths) if length > 0]
+    remaining = budget
+    while open_items and remaining > 0:
+        total_weight = sum(weights[i] for i in open_items)
+        shares = {
+            i: (weights[i] / total_weight if total_weight else 1 / len(open_items))
+            * remaining
+            for i in open_items
+        }
+        capped = [i for i in open_items if allocation[i] + shares[i] >= lengths[i]]
+        if not capped:
+            for i in open_items:
+                allocation[i] += int(shares[i])
+            break
+        for i in capped:
+            remaining -= lengths[i] - allocation[i]
+            allocation[i] = lengths[i]
+        open_items = [i for i in open_items if i not in capped]
+    return allocation
+
+
+def format_source_header(source: Source) -> str:
+    return (
+        f"{'='*80}\n"
+        f"Source: {source.title}\n"
+        f"{'-'*80}\n"
+        f"URL: {source.url}\n===\n"
+        f"Most relevant content from source: {source.snippet}\n===\n"
+    )
+
+
+CONTEXT_PREFIX = "Content from sources:\n"
+TRUNCATION_MARKER = "... [truncated]"
+
+
+def format_source_body(text: str, truncated: bool) -> str:
+    marker = TRUNCATION_MARKER if truncated else ""
+    return f"Full source content: {text}{marker}\n\n{'='*80}\n\n"
+
+
+def pack_sources(sources: Sequence[Source], token_budget: int) -> PackedContext:
+    """Render ``sources`` into prompt text that fits in ``token_budget`` tokens.
+
+    The text is built in a single pass when the prompt is assembled. Sources
+    are ordered by their search relevance ``score``. Every source that fits
+    keeps its header and snippet, and the remaining budget is split across
+    the raw page contents in proportion to relevance. Page lengths are
+    estimated for the split, and only the prefix of each page that can fit
+    in its share is tokenized.
+    """
+    encoding = get_encoding()
+    ranked = sorted(sources, key=lambda s: s.score, reverse=True)
+
+    packed_sources: List[Source] = []
+    headers: List[str] = []
+    weights: List[float] = []
+    remaining = token_budget - count_tokens(CONTEXT_PREFIX)
+    dropped_tokens = 0
+    for source in ranked:
+        header = format_source_header(source)
+        # Reserve room for the separators around the body as well
+        header_tokens = count_tokens(header + format_source_body("", True))
+        if header_tokens > remaining:
+            dropped_tokens += header_tokens + estimate_tokens(source.raw_content)
+            continue
+        remaining -= header_tokens
+        packed_sources.append(source)
+        headers.append(header)
+        # Keep a floor so sources without a score still get some budget
+        weights.append(max(source.score, 0.01))
+
+    estimates = [estimate_tokens(s.raw_content) for s in packed_sources]
+    allocation = allocate_budget(estimates, weights, remaining)
+    parts = [CONTEXT_PREFIX]
+    packed_tokens = token_budget - remaining
+    for source, header, estimate, limit in zip(
+        packed_sources, headers, estimates, allocation, strict=True
+    ):
+        prefix = source.raw_content[: limit * MAX_CHARS_PER_TOKEN]
+        body = encoding.encode(prefix, disallowed_special=())[:limit]
+        text = encoding.decode(body)
+        parts.append(header)
+        parts.append(format_source_body(text, len(text) < len(source.raw_content)))
+        packed_tokens += len(body)
+        dropped_tokens += max(estimate - len(body), 0)
+
+    return PackedContext(
+        text="".join(parts).strip(),
+        packed_tokens=packed_tokens,
+        dropped_tokens=dropped_tokens,
+        sources_packed=len(headers),
+        sources_dropped=len(ranked) - len(headers),
+    )
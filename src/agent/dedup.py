@@ -0,0 +1,121 @@
+"""Content-level near-duplicate detection for search results."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from agent.sources import Source
+
+NUM_PERMUTATIONS = 64
+NUM_BANDS = 16
+SHINGLE_SIZE = 5
+
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_SHIFT = np.uint64(32)
+_SHINGLE_BASE = np.uint64(1_000_003)
+_rng = np.random.default_rng(7)
+_PERM_A = _rng.integers(0, 1 << 63, size=NUM_PERMUTATIONS, dtype=np.uint64) | 1
+_PERM_B = _rng.integers(0, 1 << 63, size=NUM_PERMUTATIONS, dtype=np.uint64)
+_WORD = re.compile(r"\w+")
+
+
+def shingle_hashes(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """Return the unique 32-bit hashes of the word ``size``-grams in ``text``."""
+    words = _WORD.findall(text.lower())
+    # Built-in string hashes are salted per process, which is fine because
+    # signatures are only compared within one process
+    word_hashes = np.fromiter(
+        map(hash, words), dtype=np.int64, count=len(words)
+    ).view(np.uint64)
+    if len(words) < size:
+        return np.array([word_hashes.sum() & _MAX_HASH], dtype=np.uint64)
+    # Polynomial rolling hash over each window of ``size`` word hashes
+    count = len(words) - size + 1
+    hashes = np.zeros(count, dtype=np.uint64)
+    for offset in range(size):
+        hashes = hashes * _SHINGLE_BASE + word_hashes[offset : offset + count]
+    return np.unique(hashes & _MAX_HASH)
+
+
+def minhash_signature(text: str) -> np.ndarray:
+    """MinHash signature of ``text`` with ``NUM_PERMUTATIONS`` values."""
+    hashes = shingle_hashes(text)
+    # Multiply-shift hashing: one universal hash function per permutation
+    permuted = (np.outer(hashes, _PERM_A) + _PERM_B) >> _SHIFT
+    return permuted.min(axis=0)
+
+
+@dataclass
+class DedupResult:
+    """Sources kept by ``drop_near_duplicates`` and what was removed."""
+
+    kept: List[Source]
+    removed: List[Source]
+
+    @property
+    def removed_bytes(self) -> int:
+        return sum(len(s.raw_content.encode("utf-8")) for s in self.removed)
+
+
+def drop_near_duplicates(sources: Sequence[Source], threshold: float) -> DedupResult:
+    """Keep the best copy of each cluster of near-duplicate pages.
+
+    Pages are compared by the estimated Jaccard similarity of their word
+    shingles. Locality-sensitive hashing over MinHash bands proposes the
+    candidate pairs, so the cost grows roughly linearly with the number of
+    pages. Within a cluster the copy with the highest search score (then the
+    longest text) is kept. Exact copies are grouped by their content hash
+    first and share one signature.
+    """
+    parent = list(range(len(sources)))
+    candidates: List[int] = []
+    first_copy: Dict[str, int] = {}
+    for i, source in enumerate(sources):
+        if not source.raw_content:
+            continue
+        if source.content_hash in first_copy:
+            parent[i] = first_copy[source.content_hash]
+        else:
+            first_copy[source.content_hash] = i
+            candidates.append(i)
+    signatures = {i: minhash_signature(sources[i].raw_content) for i in candidates}
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    rows = NUM_PERMUTATIONS // NUM_BANDS
+    for band in range(NUM_BANDS):
+        buckets: Dict[bytes, List[int]] = {}
+        for i in candidates:
+            key = signatures[i][band * rows : (band + 1) * rows].tobytes()
+            buckets.setdefault(key, []).append(i)
+        for members in buckets.values():
+            for pos, first in enumerate(members):
+                for other in members[pos + 1 :]:
+                    if find(first) == find(other):
+                        continue
+                    similarity = np.mean(signatures[first] == signatures[other])
+                    if similarity >= threshold:
+                        parent[find(other)] = find(first)
+
+    best: Dict[int, int] = {}
+    for i, source in enumerate(sources):
+        root = find(i)
+        current = best.get(root)
+        if current is None or (source.score, len(source.raw_content)) > (
+            sources[current].score,
+            len(sources[current].raw_content),
+        ):
+            best[root] = i
+    keep = set(best.values())
+    return DedupResult(
+        kept=[s for i, s in enumerate(sources) if i in keep],
+        removed=[s for i, s in enumerate(sources) if i not in keep],
+    )
@@ -0,0 +1,100 @@
+"""Compact digests of research sections for the final section writers.
+
+The introduction, roadmap and conclusion only need to know what the report
+covers, so instead of the full research sections they get a short digest of
+each: its opening sentence, subsection titles, key terms, table headers and
+the number of questions. Digests are built locally without a model call.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import List
+
+from agent.rubric import OPTION_LINE, TABLE_SEPARATOR, check_section
+from agent.state import Section
+
+_HEADING = re.compile(r"^\s*(#{1,6})\s+(.+?)\s*#*\s*$")
+_SOURCES_HEADING = re.compile(r"^\s*#{1,6}\s*Sources\s*:?\s*$", re.IGNORECASE)
+_BOLD = re.compile(r"\*\*([^*\n]{2,60})\*\*")
+_CITATION = re.compile(r"\s*\[\d+\]")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+def _cells(row: str) -> List[str]:
+    return [cell.strip() for cell in row.strip().strip("|").split("|")]
+
+
+def _opening(lines: List[str], max_words: int) -> str:
+    """First sentence of the first prose paragraph, cut to ``max_words``."""
+    for line in lines:
+        text = line.strip()
+        if (
+            not text
+            or text.startswith(("#", "|", "-", "*", ">", "```"))
+            or text[0].isdigit()
+            or "?" in text
+        ):
+            continue
+        sentence = _SENTENCE_END.split(_CITATION.sub("", text), maxsplit=1)[0]
+        words = sentence.split()
+        return " ".join(words[:max_words]) + (" ..." if len(words) > max_words else "")
+    return ""
+
+
+def _unique(items: List[str], limit: int) -> List[str]:
+    seen = {}
+    for item in items:
+        key = item.lower()
+        if item and key not in seen:
+            seen[key] = item
+    return list(seen.values())[:limit]
+
+
+def section_digest(section: Section, max_terms: int = 12, max_words: int = 30) -> str:
+    """Summarize a written section in a few lines."""
+    lines = section.content.splitlines()
+    end = next((i for i, l in enumerate(lines) if _SOURCES_HEADING.match(l)), None)
+    body = lines[:end]
+
+    subsections = []
+    tables = []
+    terms = []
+    for i, line in enumerate(body):
+        heading = _HEADING.match(line)
+        if heading and len(heading.group(1)) > 2:
+            subsections.append(heading.group(2))
+        elif TABLE_SEPARATOR.match(line) and i > 0:
+            tables.append(" | ".join(_cells(body[i - 1])))
+            # The first column of a table usually names skills or concepts
+            for row in body[i + 1 :]:
+                if not row.lstrip().startswith("|"):
+                    break
+                terms.append(_cells(row)[0].strip("* "))
+        elif not OPTION_LINE.match(line):
+            terms.extend(_BOLD.findall(line))
+
+    digest = [
+        f"Section: {section.name}",
+        f"Description: {section.description}",
+    ]
+    opening = _opening(body, max_words)
+    if opening:
+        digest.append(f"Summary: {opening}")
+    if subsections:
+        digest.append(f"Subsections: {'; '.join(_unique(subsections, max_terms))}")
+    if terms:
+        digest.append(f"Key concepts: {', '.join(_unique(terms, max_terms))}")
+    if tables:
+        digest.append(f"Tables: {'; '.join(tables)}")
+    questions = check_section(section.content).questions
+    if questions:
+        digest.append(f"Multiple choice questions: {questions}")
+    return "\n".join(digest)
+
+
+def format_digests(sections: List[Section]) -> str:
+    """Digest every section, in the format the final writers read."""
+    return "\n\n".join(
+        f"{idx}. {section_digest(section)}" for idx, section in enumerate(sections, 1)
+    )
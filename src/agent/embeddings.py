@@ -0,0 +1,174 @@
+"""Process-wide embedding service with micro-batching and a vector cache."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from langchain_core.embeddings import Embeddings
+from langchain_huggingface import HuggingFaceEmbeddings
+
+
+@dataclass
+class EmbeddingStats:
+    """Cache and batching counters for an ``EmbeddingService``."""
+
+    cache_hits: int = 0
+    cache_misses: int = 0
+    batches: int = 0
+    texts_encoded: int = 0
+
+
+def text_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+class EmbeddingService(Embeddings):
+    """Shared sentence-transformer wrapper.
+
+    The model is loaded on first use. Async requests arriving within
+    ``linger_seconds`` of each other (for example from parallel sections) are
+    encoded together in one forward pass, and every vector is kept in an LRU
+    cache keyed by the hash of its text so no text is encoded twice.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        linger_seconds: float = 0.01,
+        max_batch_size: int = 128,
+        cache_size: int = 50_000,
+        loader: Optional[Callable[[str], Embeddings]] = None,
+    ) -> None:
+        self.model_name = model_name
+        self.linger_seconds = linger_seconds
+        self.max_batch_size = max_batch_size
+        self.cache_size = cache_size
+        self.stats = EmbeddingStats()
+        self._loader = loader or (lambda name: HuggingFaceEmbeddings(model_name=name))
+        self._model: Optional[Embeddings] = None
+        self._model_lock = threading.Lock()
+        self._cache: OrderedDict[bytes, List[float]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._pending: List[Tuple[bytes, str, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._encoding: Set[asyncio.Future] = set()
+
+    @property
+    def model(self) -> Embeddings:
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._model = self._loader(self.model_name)
+        return self._model
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [text_key(text) for text in texts]
+        vectors = self._cached(keys)
+        missing = {
+            key: text
+            for key, text in zip(keys, texts, strict=True)
+            if key not in vectors
+        }
+        if missing:
+            vectors.update(self._encode(missing))
+        return [vectors[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [text_key(text) for text in texts]
+        vectors = self._cached(keys)
+        loop = asyncio.get_running_loop()
+        waiting: Dict[bytes, asyncio.Future] = {}
+        for key, text in zip(keys, texts, strict=True):
+            if key in vectors or key in waiting:
+                continue
+            future = loop.create_future()
+            waiting[key] = future
+            self._pending.append((key, text, future))
+        if waiting:
+            if len(self._pending) >= self.max_batch_size:
+                self._start_flush(0)
+            elif self._flush_task is None or self._flush_task.done():
+                self._start_flush(self.linger_seconds)
+            for key, future in waiting.items():
+                vectors[key] = await future
+        return [vectors[key] for key in keys]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
+
+    def _start_flush(self, delay: float) -> None:
+        self._flush_task = asyncio.ensure_future(self._flush(delay))
+
+    async def _flush(self, delay: float) -> None:
+        if delay:
+            await asyncio.sleep(delay)
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        unique = {key: text for key, text, _ in batch}
+        # The batch encodes in the background, so requests arriving meanwhile
+        # start the next batch instead of waiting for this one to finish
+        encoding = asyncio.ensure_future(asyncio.to_thread(self._encode, unique))
+        self._encoding.add(encoding)
+        encoding.add_done_callback(self._encoding.discard)
+        for key, _, future in batch:
+            encoding.add_done_callback(partial(_resolve, future, key))
+
+    def _cached(self, keys: List[bytes]) -> Dict[bytes, List[float]]:
+        found = {}
+        with self._cache_lock:
+            for key in keys:
+                vector = self._cache.get(key)
+                if vector is None:
+                    self.stats.cache_misses += 1
+                    continue
+                self._cache.move_to_end(key)
+                found[key] = vector
+                self.stats.cache_hits += 1
+        return found
+
+    def _encode(self, texts: Dict[bytes, str]) -> Dict[bytes, List[float]]:
+        encoded = self.model.embed_documents(list(texts.values()))
+        vectors = dict(zip(texts, encoded, strict=True))
+        with self._cache_lock:
+            self.stats.batches += 1
+            self.stats.texts_encoded += len(texts)
+            for key, vector in vectors.items():
+                self._cache[key] = vector
+                self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return vectors
+
+
+def _resolve(future: asyncio.Future, key: bytes, encoding: asyncio.Future) -> None:
+    """Pass the outcome of a batch on to one waiting request."""
+    if future.done():
+        return
+    if encoding.cancelled():
+        future.cancel()
+    elif encoding.exception() is not None:
+        future.set_exception(encoding.exception())
+    else:
+        future.set_result(encoding.result()[key])
+
+
+_services: Dict[str, EmbeddingService] = {}
+_services_lock = threading.Lock()
+
+
+def get_embedding_service(model_name: str) -> EmbeddingService:
+    """Return the process-wide embedding service for ``model_name``."""
+    with _services_lock:
+        if model_name not in _services:
+            _services[model_name] = EmbeddingService(model_name)
+        return _services[model_name]
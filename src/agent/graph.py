@@ -1,18 +1,29 @@
 import asyncio
-import os
-from typing import Any, Dict, Literal
+import time
+import uuid
+from typing import Any, Dict, Literal, Optional
 
 from dotenv import load_dotenv
-from langchain.chat_models import init_chat_model
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
-from langchain_huggingface import HuggingFaceEmbeddings
 
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import StateGraph, START, END
-from langgraph.types import Command, Send
-from pinecone import Pinecone
+from langgraph.types import Command, RetryPolicy, Send
 
+from agent.cache import get_search_cache
 from agent.configuration import Configuration
+from agent.context import estimate_tokens
+from agent.digest import format_digests
+from agent.embeddings import get_embedding_service
+from agent.models import model_registry
+from agent.planning import stream_sections
+from agent.query_registry import get_query_registry, release_query_registry
+from agent.revision import apply_revision, last_citation_number
+from agent.rubric import check_section, follow_up_queries, grading_stats
+from agent.scheduler import get_search_scheduler
+from agent.validation import get_job_description_classifier
+from agent.vectorstore import get_vector_index
 from agent.state import (
     JobDescriptionValidation,
     ReportState,
@@ -23,6 +34,8 @@ from agent.state import (
     Queries,
     Sections,
     Feedback,
+    SectionDraft,
+    SectionRevision,
 )
 from agent.prompts import (
     report_planner_query_writer_instructions,
@@ -31,33 +44,50 @@ from agent.prompts import (
     section_writer_inputs,
     section_writer_instructions,
     section_grader_instructions,
+    section_self_assessment_instructions,
+    section_delta_writer_instructions,
     final_section_writer_instructions,
 )
-from agent.utils import async_search, format_sections, search_pinecone
+from agent.utils import (
+    async_search,
+    format_sections,
+    rank_passages,
+    remove_near_duplicates,
+    render_sources,
+    search_vector_index,
+)
 
 load_dotenv()
 
 
-def is_valid_job_description(
+async def is_valid_job_description(
     state: ReportState, config: RunnableConfig
 ) -> Command[Literal["planning_node", END]]:
     """Validate the input of the report."""
     my_config = Configuration.from_runnable_config(config)
     job_description = state["topic"]
-    writer_provider = my_config.writer_provider
-    writer_model_name = my_config.writer_model
-    writer_model = init_chat_model(
-        model_provider=writer_provider, model=writer_model_name
-    )
-    structured_llm = writer_model.with_structured_output(JobDescriptionValidation)
-    system_instructions = "You are a job description validator. You will be given a text and you will need to validate if it is a valid job description. If the job description is not valid, you will return 'invalid'. If the job description is valid, you will return 'valid'."
-    messages = [
-        SystemMessage(content=system_instructions),
-        HumanMessage(content=job_description),
-    ]
-    results = structured_llm.invoke(messages)
-    print("Job description validation results: ", results)
-    if results.valid == "valid":
+    # Clear cases are decided locally; only ambiguous inputs reach the LLM
+    verdict = None
+    if my_config.fast_validation:
+        classifier = get_job_description_classifier()
+        verdict = classifier.classify(job_description)
+        print(
+            f"Job description fast path: {verdict or 'ambiguous'} "
+            f"({classifier.stats.fast_path_share:.0%} of inputs decided locally)"
+        )
+    if verdict is None:
+        structured_llm = model_registry.get_structured(
+            my_config.writer_provider, my_config.writer_model, JobDescriptionValidation
+        )
+        system_instructions = "You are a job description validator. You will be given a text and you will need to validate if it is a valid job description. If the job description is not valid, you will return 'invalid'. If the job description is valid, you will return 'valid'."
+        messages = [
+            SystemMessage(content=system_instructions),
+            HumanMessage(content=job_description),
+        ]
+        results = await structured_llm.ainvoke(messages)
+        print("Job description validation results: ", results)
+        verdict = results.valid
+    if verdict == "valid":
         return Command(goto="planning_node")
     else:
         return Command(
@@ -74,15 +104,21 @@ async def planning_node(state: ReportState, config: RunnableConfig):
     Generates search queries to gather context for planning
     Performs web searches using the search queries
     Uses an LLM to generate a structured plan with sections
+    With planning_mode "pipelined" the plan is streamed and each research
+    section starts its research as soon as it has been planned.
 
     Args:
         state: The current state of the report.
         config: The configuration for the runnable.
 
     Returns:
-       Dict containing the generated sections.
+       Dict containing the generated sections, and in pipelined mode the
+       completed research sections.
     """
     topic = state["topic"]
+    # Retries and resumes of a run share its query registry through the thread
+    thread_id = (config.get("configurable") or {}).get("thread_id")
+    report_id = thread_id or uuid.uuid4().hex
     myconfig = Configuration.from_runnable_config(config)
     report_structure = myconfig.report_structure
     num_queries = myconfig.number_of_queries
@@ -90,12 +126,9 @@ async def planning_node(state: ReportState, config: RunnableConfig):
     if isinstance(report_structure, dict):
         report_structure = str(report_structure)
 
-    writer_provider = myconfig.writer_provider
-    writer_model_name = myconfig.writer_model
-    writer_model = init_chat_model(
-        model_provider=writer_provider, model=writer_model_name
+    structured_llm = model_registry.get_structured(
+        myconfig.writer_provider, myconfig.writer_model, Queries
     )
-    structured_llm = writer_model.with_structured_output(Queries)
     system_instructions = report_planner_query_writer_instructions.format(
         topic=topic,
         report_organization=report_structure,
@@ -107,33 +140,49 @@ async def planning_node(state: ReportState, config: RunnableConfig):
             content="Generate search queries that will help with planning a comprehensive interview preparation guide report."
         ),
     ]
-    results = structured_llm.invoke(messages)
+    results = await structured_llm.ainvoke(messages)
     query_list = [query.search_query for query in results.queries]
-    source_str = await async_search(query_list, 2)
+    sources = await async_search(
+        query_list,
+        2,
+        get_search_cache(myconfig),
+        registry=get_query_registry(report_id, myconfig.query_similarity_threshold),
+        scheduler=get_search_scheduler(myconfig),
+    )
+    sources = await asyncio.to_thread(
+        remove_near_duplicates, sources, myconfig.near_duplicate_threshold, "planning"
+    )
     sections_system_instructions = report_planner_instructions.format(
         topic=topic,
         report_organization=report_structure,
-        context=source_str,
+        context=render_sources(sources, myconfig.max_context_tokens),
     )
 
-    planner_provider = myconfig.planner_provider
-    planner_model_name = myconfig.planner_model
     planner_message = """Generate the sections of the interview preparation guide report. Your response must include at least 8 main body sections with each 'sections' field containing a list of sections. 
                         Each section must have: name, description, plan, research, and content fields."""
-    planner_model = init_chat_model(
-        model_provider=planner_provider, model=planner_model_name
+    if myconfig.planning_mode == "pipelined":
+        return await plan_and_research(
+            topic,
+            report_id,
+            [
+                SystemMessage(content=sections_system_instructions),
+                HumanMessage(content=planner_message),
+            ],
+            config,
+        )
+    structured_planner_llm = model_registry.get_structured(
+        myconfig.planner_provider, myconfig.planner_model, Sections
     )
-    structured_planner_llm = planner_model.with_structured_output(Sections)
     messages = [
         SystemMessage(content=sections_system_instructions),
         HumanMessage(content=planner_message),
     ]
-    report_sections = structured_planner_llm.invoke(messages)
+    report_sections = await structured_planner_llm.ainvoke(messages)
     sections = report_sections.sections
-    return {"sections": sections}
+    return {"sections": sections, "report_id": report_id}
 
 
-def section_generate_query(state: SectionState, config: RunnableConfig):
+async def section_generate_query(state: SectionState, config: RunnableConfig):
     """Generate search queries for researching a specific section.
 
     This node uses an LLM to generate targeted search queries based on the
@@ -156,12 +205,9 @@ def section_generate_query(state: SectionState, config: RunnableConfig):
     num_queries = my_config.number_of_queries
 
     # Generate queries
-    writer_provider = my_config.writer_provider
-    writer_model_name = my_config.writer_model
-    writer_model = init_chat_model(
-        model=writer_model_name, model_provider=writer_provider
+    structured_llm = model_registry.get_structured(
+        my_config.writer_provider, my_config.writer_model, Queries
     )
-    structured_llm = writer_model.with_structured_output(Queries)
 
     # Format system instructions
     system_instructions = query_writer_instructions.format(
@@ -169,7 +215,7 @@ def section_generate_query(state: SectionState, config: RunnableConfig):
     )
 
     # Generate queries
-    queries = structured_llm.invoke(
+    queries = await structured_llm.ainvoke(
         [
             SystemMessage(content=system_instructions),
             HumanMessage(content="Generate search queries on the provided topic."),
@@ -179,11 +225,71 @@ def section_generate_query(state: SectionState, config: RunnableConfig):
     return {"search_queries": queries.queries}
 
 
+async def plan_and_research(
+    topic: str, report_id: str, messages: list, config: RunnableConfig
+) -> Dict[str, Any]:
+    """Stream the plan and research each section while the rest is planned.
+
+    A research section that fails here does not fail the node: it is left
+    out of the completed sections, so ``map_section_generation`` sends it
+    through the checkpointed section subgraph like a sequential plan.
+    """
+    myconfig = Configuration.from_runnable_config(config)
+    planner = model_registry.get_tool_caller(
+        myconfig.planner_provider, myconfig.planner_model, Sections
+    )
+    sections = []
+    research = []
+    first_started = None
+    try:
+        async for section in stream_sections(planner, messages):
+            sections.append(section)
+            if section.research:
+                first_started = first_started or time.perf_counter()
+                research.append(
+                    asyncio.create_task(
+                        pipelined_section_graph.ainvoke(
+                            {
+                                "topic": topic,
+                                "report_id": report_id,
+                                "section": section,
+                                "search_iterations": 0,
+                            },
+                            config,
+                        )
+                    )
+                )
+        if first_started is not None:
+            print(
+                f"Pipelined planning: {len(research)} research sections, the first "
+                f"started {time.perf_counter() - first_started:.1f}s before the "
+                "plan was complete"
+            )
+        results = await asyncio.gather(*research, return_exceptions=True)
+    except BaseException:
+        # Only the plan itself failing fails the node; stop its research
+        for task in research:
+            task.cancel()
+        raise
+    completed = []
+    for result in results:
+        if isinstance(result, BaseException):
+            print(f"Pipelined planning: a section failed ({result}), retrying it later")
+            continue
+        completed.extend(result["completed_sections"])
+    return {"sections": sections, "report_id": report_id, "completed_sections": completed}
+
+
 def map_section_generation(
     state: ReportState, config: RunnableConfig
-) -> Command[Literal["generate_sections"]]:
+) -> Command[Literal["generate_sections", "collect_sections"]]:
     topic = state["topic"]
     sections = state["sections"]
+    # Sections finished before a resumed run was interrupted are not redone
+    completed = {s.name for s in state.get("completed_sections", [])}
+    pending = [s for s in sections if s.research and s.name not in completed]
+    if not pending:
+        return Command(goto="collect_sections")
     sections_str = "\n\n".join(
         f"Section: {section.name}\n"
         f"Description: {section.description}\n"
@@ -194,10 +300,14 @@ def map_section_generation(
         goto=[
             Send(
                 "generate_sections",
-                {"topic": topic, "section": s, "search_iterations": 0},
+                {
+                    "topic": topic,
+                    "report_id": state["report_id"],
+                    "section": s,
+                    "search_iterations": 0,
+                },
             )
-            for s in sections
-            if s.research
+            for s in pending
         ]
     )
 
@@ -222,24 +332,71 @@ async def search_web(state: SectionState, config: RunnableConfig):
     top_k = my_config.top_k
 
     # Perform search
-    source_str = await async_search(query_list, max_search_depth)
-    # pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
-    # index = pc.Index("resourcebooks")
-    # embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
-    # pinecone_search_str = search_pinecone(index, embeddings, query_list, top_k)
+    registry = get_query_registry(
+        state["report_id"], my_config.query_similarity_threshold
+    )
+    web_search = async_search(
+        query_list,
+        max_search_depth,
+        get_search_cache(my_config),
+        registry=registry,
+        scheduler=get_search_scheduler(my_config),
+    )
+    vector_index = get_vector_index(my_config)
+    if vector_index is None:
+        sources, rag_context = await web_search, ""
+    else:
+        # Reference book retrieval runs alongside the web search
+        sources, rag_context = await asyncio.gather(
+            web_search,
+            search_vector_index(
+                vector_index,
+                get_embedding_service(my_config.embedding_model),
+                query_list,
+                top_k,
+            ),
+        )
+
+    # Follow-up rounds only process pages this section has not seen yet
+    seen_urls = set(state.get("seen_urls", []))
+    new_sources = [s for s in sources if s.url not in seen_urls]
+    seen_urls.update(s.url for s in sources)
+    new_sources = await asyncio.to_thread(
+        remove_near_duplicates,
+        new_sources,
+        my_config.near_duplicate_threshold,
+        state["section"].name,
+    )
+    # Keep only the passages that match the section and its queries
+    new_sources = await asyncio.to_thread(
+        rank_passages,
+        new_sources,
+        [state["section"].description, *query_list],
+        my_config.passage_top_k,
+        my_config.passage_max_chars,
+        state["section"].name,
+    )
 
     return {
-        "source_str": source_str,
+        "sources": [*state.get("sources", []), *new_sources],
+        "new_sources": new_sources,
+        "seen_urls": sorted(seen_urls),
+        "rag_context": rag_context,
         "search_iterations": state["search_iterations"] + 1,
     }
 
 
-def write_and_grade_sections(
+async def write_and_grade_sections(
     state: SectionState, config: RunnableConfig
 ) -> Command[Literal[END, "search_web_rag"]]:
     """Write the section content and grade the section for quality.
     Quality pass if the section has enough content, is relevant to the section topic and description.
     If fail, then trigger more search queries to gather more context.
+    With grading_mode "combined" the writer grades its own draft in the same call.
+    With revision_mode "delta" revisions only write the text the draft is
+    missing, which is merged into the existing draft. The merged draft is
+    graded by the separate grader even in combined mode, and those calls are
+    counted in ``grading_stats.delta_revision_grades``.
 
     Args:
         state: Current state containing section details
@@ -251,17 +408,19 @@ def write_and_grade_sections(
     # Get state
     topic = state["topic"]
     section = state["section"]
-    source_str = state["source_str"]
 
     # Get configuration
     my_config = Configuration.from_runnable_config(config)
 
+    # The first draft uses every source; revisions only see the new evidence
+    # since the draft already incorporates the earlier sources
+    is_revision = state["search_iterations"] > 1
+    evidence = state["new_sources"] if is_revision else state["sources"]
+    source_str = render_sources(evidence, my_config.max_context_tokens)
+    if state.get("rag_context"):
+        source_str += f"\n\nContent from reference books:\n{state['rag_context']}"
+
     # Write the section content
-    writer_provider = my_config.writer_provider
-    writer_model_name = my_config.writer_model
-    writer_model = init_chat_model(
-        model_provider=writer_provider, model=writer_model_name
-    )
     section_writer_inputs_formatted = section_writer_inputs.format(
         topic=topic,
         section_name=section.name,
@@ -269,56 +428,135 @@ def write_and_grade_sections(
         context=source_str,
         section_content=section.content,
     )
-    messages = [
-        SystemMessage(content=section_writer_instructions),
-        HumanMessage(content=section_writer_inputs_formatted),
-    ]
-    section_content = writer_model.invoke(messages)
-    section.content = section_content.content
+    feedback = None
+    if is_revision and section.content and my_config.revision_mode == "delta":
+        # Only the missing text is generated and merged into the draft; the
+        # merged draft is graded as usual
+        revision_model = model_registry.get_structured(
+            my_config.writer_provider, my_config.writer_model, SectionRevision
+        )
+        gaps = state.get("revision_notes") or [
+            q.search_query for q in state.get("search_queries", [])
+        ]
+        messages = [
+            SystemMessage(
+                content=section_delta_writer_instructions.format(
+                    gaps="\n".join(f"- {gap}" for gap in gaps),
+                    next_question_number=check_section(section.content).questions + 1,
+                    next_citation_number=last_citation_number(section.content) + 1,
+                )
+            ),
+            HumanMessage(content=section_writer_inputs_formatted),
+        ]
+        revision = await revision_model.ainvoke(messages)
+        section.content = apply_revision(section.content, revision)
+    elif my_config.grading_mode == "combined":
+        # One structured call writes the section and grades it
+        draft_model = model_registry.get_structured(
+            my_config.writer_provider, my_config.writer_model, SectionDraft
+        )
+        messages = [
+            SystemMessage(
+                content=section_writer_instructions
+                + section_self_assessment_instructions.format(
+                    number_of_follow_up_queries=my_config.number_of_queries
+                )
+            ),
+            HumanMessage(content=section_writer_inputs_formatted),
+        ]
+        draft = await draft_model.ainvoke(messages)
+        section.content = draft.content
+        feedback = Feedback(
+            grade=draft.grade, follow_up_queries=draft.follow_up_queries
+        )
+    else:
+        writer_model = model_registry.get(
+            my_config.writer_provider, my_config.writer_model
+        )
+        messages = [
+            SystemMessage(content=section_writer_instructions),
+            HumanMessage(content=section_writer_inputs_formatted),
+        ]
+        section_content = await writer_model.ainvoke(messages)
+        section.content = section_content.content
+
+    # The last allowed iteration publishes the draft whatever the grade
+    # (in combined mode the self-assessment has already been paid for)
+    if state["search_iterations"] >= my_config.max_search_depth:
+        if feedback is None:
+            grading_stats.final_iteration_skips += 1
+        return Command(update={"completed_sections": [section]}, goto=END)
 
-    grading_provider = my_config.planner_provider
-    grading_model_name = my_config.planner_model
-    grading_model = init_chat_model(
-        model_provider=grading_provider, model=grading_model_name
-    )
-    grading_model_with_structured_output = grading_model.with_structured_output(
-        Feedback
-    )
-    section_grader_instructions_formatted = section_grader_instructions.format(
-        topic=topic,
-        section_topic=section.description,
-        section=section.content,
-        number_of_follow_up_queries=my_config.number_of_queries,
-    )
-    section_grader_message = (
-        "Grade the report and consider follow-up questions for missing information. "
-        "If the grade is 'pass', return empty strings for all follow-up queries. "
-        "If the grade is 'fail', provide specific search queries to gather missing information."
-    )
+    # Drafts that clearly break the rubric go back to research without an
+    # LLM grading call
+    if my_config.local_grading:
+        rubric = check_section(
+            section.content,
+            my_config.min_section_questions,
+            my_config.min_section_words,
+        )
+        if not rubric.passed:
+            if feedback is None:
+                grading_stats.local_failures += 1
+            print(
+                f"Local grading ({section.name}): fail, {'; '.join(rubric.failures)} "
+                f"({grading_stats.grader_calls_saved} grader calls saved)"
+            )
+            return Command(
+                update={
+                    "search_queries": follow_up_queries(
+                        section.name, section.description, rubric
+                    ),
+                    "section": section,
+                    "revision_notes": rubric.failures,
+                },
+                goto="search_web_rag",
+            )
 
-    messages = [
-        SystemMessage(content=section_grader_instructions_formatted),
-        HumanMessage(content=section_grader_message),
-    ]
-    feedback = grading_model_with_structured_output.invoke(messages)
+    if feedback is None:
+        grading_model_with_structured_output = model_registry.get_structured(
+            my_config.planner_provider, my_config.planner_model, Feedback
+        )
+        section_grader_instructions_formatted = section_grader_instructions.format(
+            topic=topic,
+            section_topic=section.description,
+            section=section.content,
+            new_evidence=source_str if is_revision else "",
+            number_of_follow_up_queries=my_config.number_of_queries,
+        )
+        section_grader_message = (
+            "Grade the report and consider follow-up questions for missing information. "
+            "If the grade is 'pass', return empty strings for all follow-up queries. "
+            "If the grade is 'fail', provide specific search queries to gather missing information."
+        )
+
+        messages = [
+            SystemMessage(content=section_grader_instructions_formatted),
+            HumanMessage(content=section_grader_message),
+        ]
+        feedback = await grading_model_with_structured_output.ainvoke(messages)
+        grading_stats.llm_grades += 1
+        if my_config.grading_mode == "combined":
+            grading_stats.delta_revision_grades += 1
 
     # Check if the section is complete
-    if (
-        feedback.grade == "pass"
-        or state["search_iterations"] >= my_config.max_search_depth
-    ):
+    if feedback.grade == "pass":
         # Publish the section to completed sections
         return Command(update={"completed_sections": [section]}, goto=END)
 
     # Update the existing section with new content and update search queries
     else:
         return Command(
-            update={"search_queries": feedback.follow_up_queries, "section": section},
-            goto="search_web",
+            update={
+                "search_queries": feedback.follow_up_queries,
+                "section": section,
+                "revision_notes": feedback.missing,
+            },
+            goto="search_web_rag",
         )
 
 
-def write_roadmap_conclusion(state: SectionState, config: RunnableConfig):
+async def write_roadmap_conclusion(state: SectionState, config: RunnableConfig):
     """Write the introduction and conclusion of the report.
 
     Args:
@@ -344,13 +582,11 @@ def write_roadmap_conclusion(state: SectionState, config: RunnableConfig):
     )
 
     # Generate section
-    writer_provider = my_config.writer_provider
-    writer_model_name = my_config.writer_model
-    writer_model = init_chat_model(
-        model=writer_model_name, model_provider=writer_provider
+    writer_model = model_registry.get(
+        my_config.writer_provider, my_config.writer_model
     )
 
-    section_content = writer_model.invoke(
+    section_content = await writer_model.ainvoke(
         [
             SystemMessage(content=system_instructions),
             HumanMessage(
@@ -373,14 +609,34 @@ def collect_completed_sections(state: ReportState, config: RunnableConfig):
         state: Current state with completed sections as context
         config: Configuration for writing model
     Returns:
-        Dict with formatted sections as context
+        Dict with formatted sections (or their digests) as context
     """
     completed_sections = state["completed_sections"]
+    my_config = Configuration.from_runnable_config(config)
 
-    # Format completed section to str to use as context for final sections
+    # Format completed section to str to use as context for final sections.
+    # The final writers only need an overview, so by default they get a
+    # compact digest of each section instead of its full text
     completed_report_sections = format_sections(completed_sections)
+    if my_config.final_context == "digest":
+        full_tokens = estimate_tokens(completed_report_sections)
+        completed_report_sections = format_digests(completed_sections)
+        print(
+            f"Section digests: ~{estimate_tokens(completed_report_sections)} tokens "
+            f"instead of ~{full_tokens} per final section writer"
+        )
+
+    # All research is done, so the report's query registry can be dropped
+    registry = release_query_registry(state["report_id"])
+    print(
+        f"Query registry: {registry.searches_run} searches run, "
+        f"{registry.searches_saved} duplicate searches saved"
+    )
 
-    return {"report_sections_from_research": completed_report_sections}
+    return {
+        "report_sections_from_research": completed_report_sections,
+        "searches_saved": registry.searches_saved,
+    }
 
 
 def compile_final_report(state: ReportState):
@@ -441,18 +697,32 @@ def initiate_final_section_writing(state: ReportState):
     ]
 
 
+# Transient model and search errors are retried in place, so one flaky call
+# does not fail the superstep and cancel the sibling sections
+node_retry = RetryPolicy(max_attempts=3)
+
 section_workflow = StateGraph(SectionState, output=SectionOutputState)
 
-section_workflow.add_node("section_generate_query", section_generate_query)
-section_workflow.add_node("search_web_rag", search_web)
+section_workflow.add_node(
+    "section_generate_query", section_generate_query, retry=node_retry
+)
+section_workflow.add_node("search_web_rag", search_web, retry=node_retry)
 # section_workflow.add_node("search_rag", search_rag)
-section_workflow.add_node("write_and_grade_section", write_and_grade_sections)
+section_workflow.add_node(
+    "write_and_grade_section", write_and_grade_sections, retry=node_retry
+)
 
 section_workflow.add_edge(START, "section_generate_query")
 section_workflow.add_edge("section_generate_query", "search_web_rag")
 # section_workflow.add_edge("section_generate_query_node", "search_rag")
 section_workflow.add_edge("search_web_rag", "write_and_grade_section")
 # section_workflow.add_edge("search_rag", "write_section")
+
+# Sections researched inside planning_node run as plain subgraph calls; they
+# are checkpointed with the planning node's result, and failed ones are sent
+# through generate_sections afterwards
+pipelined_section_graph = section_workflow.compile(checkpointer=False)
+
 # Define a new graph
 report_workflow = StateGraph(
     ReportState,
@@ -461,12 +731,16 @@ report_workflow = StateGraph(
     config_schema=Configuration,
 )
 
-report_workflow.add_node("is_valid_job_description", is_valid_job_description)
-report_workflow.add_node("planning_node", planning_node)
+report_workflow.add_node(
+    "is_valid_job_description", is_valid_job_description, retry=node_retry
+)
+report_workflow.add_node("planning_node", planning_node, retry=node_retry)
 report_workflow.add_node("map_section_generation", map_section_generation)
 report_workflow.add_node("generate_sections", section_workflow.compile())
 report_workflow.add_node("collect_sections", collect_completed_sections)
-report_workflow.add_node("write_roadmap_conclusion", write_roadmap_conclusion)
+report_workflow.add_node(
+    "write_roadmap_conclusion", write_roadmap_conclusion, retry=node_retry
+)
 report_workflow.add_node("compile_final_report", compile_final_report)
 
 report_workflow.add_edge(START, "is_valid_job_description")
@@ -482,6 +756,11 @@ report_workflow.add_edge("compile_final_report", END)
 graph = report_workflow.compile()
 
 
+def compile_graph(checkpointer: Optional[BaseCheckpointSaver] = None):
+    """Compile the report graph, optionally with a durable checkpointer."""
+    return report_workflow.compile(checkpointer=checkpointer)
+
+
 async def main():
 
     sample_jd = """Full job description
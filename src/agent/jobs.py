@@ -0,0 +1,347 @@
+"""Background report jobs run by a bounded pool of workers."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+import traceback
+import uuid
+from dataclasses import asdict, dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+Event = Dict[str, Any]
+INTERRUPTED = "interrupted before it finished, please submit it again"
+# Finished job files are checked for expiry at most this often
+PRUNE_INTERVAL_SECONDS = 60 * 60
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+@dataclass
+class Job:
+    """Status of one report job. ``status`` is queued, running, done or failed.
+
+    A ``cached`` job has no report file; its report is looked up by ``key``.
+    """
+
+    id: str
+    key: str
+    status: str = "queued"
+    created_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    cached: bool = False
+
+
+Work = Callable[[Job], Awaitable[str]]
+
+
+@dataclass
+class JobStats:
+    """Counters for a ``JobManager``."""
+
+    submitted: int = 0
+    deduplicated: int = 0
+    rejected: int = 0
+    completed: int = 0
+    failed: int = 0
+
+
+class JobManager:
+    """Queue of report jobs drained by ``max_concurrency`` workers.
+
+    At most ``max_queue`` jobs wait for a worker; further submissions raise
+    ``QueueFullError`` so the caller can push back. Submitting a key that
+    already has a queued or running job returns that job instead of a new
+    one. Each job's status and report are written to their own files under
+    ``storage_dir``; only active jobs are kept in memory, and finished jobs
+    can still be read after a restart until they are ``ttl_seconds`` old.
+    Jobs that were queued or running when the manager stopped are marked
+    failed. Reports of cached jobs come from ``cached_report``.
+
+    Work can ``publish`` progress events for its job, which any number of
+    ``events`` subscribers receive from the start.
+    """
+
+    def __init__(
+        self,
+        storage_dir: str,
+        max_concurrency: int = 2,
+        max_queue: int = 16,
+        ttl_seconds: Optional[float] = None,
+        cached_report: Optional[Callable[[str], Optional[str]]] = None,
+    ) -> None:
+        self.storage_dir = storage_dir
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.ttl_seconds = ttl_seconds
+        self.cached_report = cached_report
+        self.stats = JobStats()
+        self._pruned_at = 0.0
+        self._jobs: Dict[str, Job] = {}
+        self._active: Dict[str, str] = {}
+        self._finished: Dict[str, asyncio.Event] = {}
+        self._events: Dict[str, List[Event]] = {}
+        self._signals: Dict[str, asyncio.Event] = {}
+        self._queue: Optional[asyncio.Queue[Tuple[Job, Work]]] = None
+        self._workers: List[asyncio.Task] = []
+        os.makedirs(storage_dir, exist_ok=True)
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    @property
+    def running(self) -> int:
+        return sum(1 for job in self._jobs.values() if job.status == "running")
+
+    def start(self) -> None:
+        """Start the worker tasks on the running event loop."""
+        # Jobs left queued or running by a process that died cannot resume
+        for name in os.listdir(self.storage_dir):
+            if name.endswith(".json"):
+                job = self.get(name[: -len(".json")])
+                if job is not None and job.status in ("queued", "running"):
+                    self._fail(job, INTERRUPTED)
+        self.prune()
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.max_concurrency)
+        ]
+
+    async def stop(self) -> None:
+        """Cancel the workers and mark every unfinished job failed."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        while self._queue is not None and not self._queue.empty():
+            job, _ = self._queue.get_nowait()
+            self._fail(job, INTERRUPTED)
+            self._active.pop(job.key, None)
+            self._jobs.pop(job.id, None)
+            self._publish_end(job)
+            self._finished.pop(job.id).set()
+
+    def is_active(self, key: str) -> bool:
+        return key in self._active
+
+    def submit(self, key: str, work: Work) -> Job:
+        """Queue ``work`` under ``key`` and return its job.
+
+        Identical requests arriving while a job for ``key`` is queued or
+        running share that job, so only one graph run is started for them.
+        """
+        if self._queue is None:
+            raise RuntimeError("JobManager.start() has not been called")
+        active = self._active.get(key)
+        if active is not None:
+            self.stats.deduplicated += 1
+            return self._jobs[active]
+        job = Job(id=uuid.uuid4().hex, key=key, created_at=time.time())
+        try:
+            self._queue.put_nowait((job, work))
+        except asyncio.QueueFull:
+            self.stats.rejected += 1
+            raise QueueFullError(
+                f"{self.max_queue} report jobs already queued"
+            ) from None
+        self._jobs[job.id] = job
+        self._active[key] = job.id
+        self._finished[job.id] = asyncio.Event()
+        self._events[job.id] = []
+        self._signals[job.id] = asyncio.Event()
+        self.stats.submitted += 1
+        self._save(job)
+        return job
+
+    def add_finished(self, key: str) -> Job:
+        """Record a finished job for a report held in the report cache."""
+        now = time.time()
+        job = Job(
+            id=uuid.uuid4().hex,
+            key=key,
+            status="done",
+            created_at=now,
+            started_at=now,
+            finished_at=now,
+            cached=True,
+        )
+        self._save(job)
+        self._maybe_prune()
+        return job
+
+    def prune(self) -> int:
+        """Delete the files of finished jobs older than ``ttl_seconds``."""
+        self._pruned_at = time.time()
+        if self.ttl_seconds is None:
+            return 0
+        removed = 0
+        cutoff = self._pruned_at - self.ttl_seconds
+        for name in os.listdir(self.storage_dir):
+            job_id, _, extension = name.partition(".")
+            if job_id in self._jobs or extension not in ("json", "md"):
+                continue
+            path = os.path.join(self.storage_dir, name)
+            try:
+                if os.path.getmtime(path) >= cutoff:
+                    continue
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            if extension == "json":
+                removed += 1
+        return removed
+
+    def publish(self, job_id: str, event: Event) -> None:
+        """Send a progress event to the subscribers of an active job."""
+        events = self._events.get(job_id)
+        if events is None:
+            return
+        events.append(event)
+        self._signals.pop(job_id).set()
+        self._signals[job_id] = asyncio.Event()
+
+    async def events(self, job_id: str) -> AsyncIterator[Event]:
+        """Yield every event of the job, from its first, until it finishes.
+
+        A failed job ends with an ``error`` event. For a job that has already
+        finished, only its ``report`` or ``error`` event is available.
+        """
+        history = self._events.get(job_id)
+        if history is None:
+            job = await asyncio.to_thread(self.get, job_id)
+            if job is not None and job.status == "done":
+                report = await asyncio.to_thread(self.report, job_id)
+                yield {"event": "report", "data": {"final_report": report}}
+            elif job is not None and job.status == "failed":
+                yield {"event": "error", "data": {"detail": job.error}}
+            return
+        sent = 0
+        while True:
+            # Taken before reading the history so no event is missed
+            signal = self._signals.get(job_id)
+            while sent < len(history):
+                yield history[sent]
+                sent += 1
+            if signal is None:
+                return
+            await signal.wait()
+
+    async def wait(self, job_id: str) -> Optional[Job]:
+        """Wait until the job has finished and return it."""
+        event = self._finished.get(job_id)
+        if event is not None:
+            await event.wait()
+        return await asyncio.to_thread(self.get, job_id)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        # Job ids are uuid hex strings; anything else could escape the directory
+        if not job_id.isalnum():
+            return None
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        path = self._path(job_id, "json")
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return Job(**json.load(f))
+
+    def report(self, job_id: str) -> Optional[str]:
+        """Return the report of a finished job, or ``None``."""
+        if not job_id.isalnum():
+            return None
+        job = self.get(job_id)
+        if job is not None and job.cached:
+            return self.cached_report(job.key) if self.cached_report else None
+        path = self._path(job_id, "md")
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return f.read()
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        while True:
+            job, work = await self._queue.get()
+            job.status = "running"
+            job.started_at = time.time()
+            await asyncio.to_thread(self._save, job)
+            report = None
+            try:
+                report = await work(job)
+                job.status = "done"
+                self.stats.completed += 1
+            # Whatever the work raises fails only its own job, with the traceback
+            except Exception as e:  # noqa: BLE001
+                job.status = "failed"
+                job.error = str(e)
+                self.stats.failed += 1
+                print(f"Report job {job.id} failed: {e}")
+                traceback.print_exc()
+            except asyncio.CancelledError:
+                job.status = "failed"
+                job.error = INTERRUPTED
+                self.stats.failed += 1
+                raise
+            finally:
+                job.finished_at = time.time()
+                self._active.pop(job.key, None)
+                await asyncio.to_thread(self._save, job, report)
+                # Finished jobs are served from disk
+                self._jobs.pop(job.id, None)
+                self._publish_end(job)
+                self._finished.pop(job.id).set()
+                self._queue.task_done()
+            await asyncio.to_thread(self._maybe_prune)
+
+    def _publish_end(self, job: Job) -> None:
+        # Subscribers see the history they hold, then stop
+        if job.status == "failed":
+            self.publish(job.id, {"event": "error", "data": {"detail": job.error}})
+        self._events.pop(job.id, None)
+        signal = self._signals.pop(job.id, None)
+        if signal is not None:
+            signal.set()
+
+    def _maybe_prune(self) -> None:
+        if time.time() - self._pruned_at >= PRUNE_INTERVAL_SECONDS:
+            self.prune()
+
+    def _fail(self, job: Job, error: str) -> None:
+        job.status = "failed"
+        job.error = error
+        job.finished_at = time.time()
+        self.stats.failed += 1
+        self._save(job)
+
+    def _path(self, job_id: str, extension: str) -> str:
+        return os.path.join(self.storage_dir, f"{job_id}.{extension}")
+
+    def _save(self, job: Job, report: Optional[str] = None) -> None:
+        # The report is written before the status so "done" implies it exists
+        if report is not None:
+            self._write(self._path(job.id, "md"), report)
+        self._write(self._path(job.id, "json"), json.dumps(asdict(job)))
+
+    @staticmethod
+    def _write(path: str, content: str) -> None:
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(content)
+        os.replace(tmp, path)
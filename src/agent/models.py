@@ -0,0 +1,91 @@
+"""Process-wide registry of chat model clients shared by all graph nodes."""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from langchain.chat_models import init_chat_model
+
+
+@dataclass
+class ModelRegistryStats:
+    """Counters describing how often the registry reuses a warm client."""
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+Key = Tuple[str, str, Optional[type], str]
+
+
+class ModelRegistry:
+    """Cache of chat models keyed by (provider, model, output schema, binding).
+
+    Building a chat model creates a new API client with its own HTTP
+    connection pool, so every node shares the instances held here instead of
+    calling ``init_chat_model`` on each invocation.
+    """
+
+    def __init__(self, factory: Callable[..., Any] = init_chat_model) -> None:
+        self.factory = factory
+        self.stats = ModelRegistryStats()
+        self._models: Dict[Key, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, provider: str, model: str) -> Any:
+        """Return the shared chat model for ``provider`` and ``model``."""
+        return self._get_or_build((provider, model, None, ""))
+
+    def get_structured(self, provider: str, model: str, schema: type) -> Any:
+        """Return the shared chat model bound to a structured output ``schema``."""
+        return self._get_or_build((provider, model, schema, "structured"))
+
+    def get_tool_caller(self, provider: str, model: str, schema: type) -> Any:
+        """Return the shared chat model forced to call the ``schema`` tool.
+
+        Unlike ``get_structured`` the raw tool call can be streamed.
+        """
+        return self._get_or_build((provider, model, schema, "tool"))
+
+    def clear(self) -> None:
+        """Drop every cached client and reset the counters."""
+        with self._lock:
+            self._models.clear()
+            self.stats = ModelRegistryStats()
+
+    def _get_or_build(self, key: Key) -> Any:
+        with self._lock:
+            if key in self._models:
+                self.stats.hits += 1
+                return self._models[key]
+            self.stats.misses += 1
+            provider, model, schema, binding = key
+            if schema is None:
+                instance = self.factory(model_provider=provider, model=model)
+            elif binding == "tool":
+                instance = self._get_base(provider, model).bind_tools(
+                    [schema], tool_choice=schema.__name__
+                )
+            else:
+                # Structured variants wrap the same underlying client
+                instance = self._get_base(provider, model).with_structured_output(
+                    schema
+                )
+            self._models[key] = instance
+            return instance
+
+    def _get_base(self, provider: str, model: str) -> Any:
+        key = (provider, model, None, "")
+        if key not in self._models:
+            self._models[key] = self.factory(model_provider=provider, model=model)
+        return self._models[key]
+
+
+model_registry = ModelRegistry()
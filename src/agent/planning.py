@@ -0,0 +1,38 @@
+"""Stream the report plan section by section.
+
+The planner returns its ``Sections`` tool call as a stream of argument
+fragments. ``stream_sections`` parses the partial JSON as it arrives and
+yields each section once its object is complete, so research on the first
+sections can start while the planner is still writing the rest.
+"""
+
+from __future__ import annotations
+
+from typing import Any, AsyncIterator, List
+
+from langchain_core.utils.json import parse_partial_json
+
+from agent.state import Section, Sections
+
+
+async def stream_sections(model: Any, messages: List[Any]) -> AsyncIterator[Section]:
+    """Yield the planned sections in order as the planner streams them.
+
+    ``model`` must be bound to the ``Sections`` tool. A section is complete
+    once the next one has started; the last one once the stream has ended.
+    """
+    args = ""
+    emitted = 0
+    async for chunk in model.astream(messages):
+        # The planner is forced to make a single tool call
+        fragment = "".join(c.get("args") or "" for c in chunk.tool_call_chunks)
+        args += fragment
+        # Only the opening brace of the next section can complete one
+        if "{" not in fragment:
+            continue
+        planned = (parse_partial_json(args) or {}).get("sections") or []
+        while emitted < len(planned) - 1:
+            yield Section.model_validate(planned[emitted])
+            emitted += 1
+    for section in Sections.model_validate_json(args).sections[emitted:]:
+        yield section
@@ -114,7 +114,7 @@ section_writer_instructions = """Write one section of a interview preparation gu
 - Use simple, clear language
 - Use short paragraphs (2-3 sentences max)
 - Use ## for section title (Markdown format)
-- Include at least 2 popular multiple choice interview questions along with their correct answers related to the topic discussed in the section. Example format: ```Which of the following is true about X?``` with multiple choice answers
+- Include at least 3 popular multiple choice interview questions along with their correct answers related to the topic discussed in the section. Example format: ```Which of the following is true about X?``` with multiple choice answers
 </Writing Guidelines>
 
 <Citation Rules>
@@ -169,12 +169,18 @@ section_grader_instructions = """Review a interview preparation guide section re
 {section}
 </section content>
 
+<New evidence gathered for this revision (if populated)>
+{new_evidence}
+</New evidence gathered for this revision>
+
 <task>
 Evaluate whether the section content adequately addresses the section topic.
 
 If the section content does not adequately address the section topic, generate {number_of_follow_up_queries} follow-up search queries to gather missing information.
 
 If the section has multiple choice questions, evaluate the correctness of the answers.
+
+If the grade is 'fail', list what the section is missing or gets wrong, one short item each.
 </task>
 
 <format>
@@ -186,6 +192,71 @@ grade: Literal["pass","fail"] = Field(
 follow_up_queries: List[SearchQuery] = Field(
     description="List of follow-up search queries.",
 )
+missing: List[str] = Field(
+    description="What the section is missing or gets wrong, if the grade is 'fail'.",
+)
+</format>
+"""
+
+section_delta_writer_instructions = """Revise one section of a interview preparation guide report by adding only what it is missing.
+
+<Task>
+1. Review the existing section content and the gaps found by the reviewer.
+2. Look at the new source material gathered for these gaps.
+3. Write ONLY the new text that fills the gaps. The edits are merged into the existing section, which is kept as it is.
+</Task>
+
+<Gaps>
+{gaps}
+</Gaps>
+
+<Edit kinds>
+- subsection: a new "### ..." subsection with its paragraphs, inserted before the multiple choice questions
+- questions: additional multiple choice questions with their correct answers, numbered from {next_question_number}
+- table_rows: markdown rows ("| ... | ... |") appended to the existing table, or a full table if the section has none
+- sources: new source lines appended to the ### Sources list, numbered from [{next_citation_number}]
+</Edit kinds>
+
+<Writing Guidelines>
+- Never repeat text, questions, table rows or sources that are already in the section
+- Keep additions short: at most 200 words in total
+- Cite new sources in the added text with their new numbers and add them with a sources edit
+- Use simple, clear language
+</Writing Guidelines>
+
+<format>
+Call the SectionRevision tool and output with the following schema:
+
+edits: List[SectionEdit] = Field(
+    description="Targeted additions that address the gaps in the section."
+)
+SectionEdit:
+    kind: Literal["subsection", "questions", "table_rows", "sources"]
+    content: str
+</format>
+"""
+
+section_self_assessment_instructions = """
+<Self-assessment>
+After writing, review your section relative to the section topic, as a separate grader would:
+- Evaluate whether the section content adequately addresses the section topic
+- If the section has multiple choice questions, evaluate the correctness of the answers
+- If the section does not adequately address the section topic, grade it 'fail' and generate {number_of_follow_up_queries} follow-up search queries to gather missing information
+- If it does, grade it 'pass' and return no follow-up queries
+</Self-assessment>
+
+<format>
+Call the SectionDraft tool and output with the following schema:
+
+content: str = Field(
+    description="The full markdown content of the section, including its sources."
+)
+grade: Literal["pass","fail"] = Field(
+    description="Self-assessment of whether the section meets requirements ('pass') or needs more research ('fail')."
+)
+follow_up_queries: List[SearchQuery] = Field(
+    description="List of follow-up search queries.",
+)
 </format>
 """
 
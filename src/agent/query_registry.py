@@ -0,0 +1,120 @@
+"""Report-wide registry that runs identical or near-duplicate searches once.
+
+Registries hold in-flight search futures, which cannot be stored in the
+checkpointed ``ReportState``. They live in this process-wide map instead,
+keyed by the report's ``report_id``. ``planning_node`` derives that id from
+the run's checkpoint thread, so a retried or resumed run finds the same
+registry again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import threading
+import time
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+_NON_WORD = re.compile(r"[^\w\s]")
+# Registries of runs that failed or were cancelled are never released, so
+# ones without a search for this long are dropped
+REGISTRY_IDLE_SECONDS = 30 * 60
+
+
+def query_tokens(query: str) -> FrozenSet[str]:
+    """Lowercase ``query``, drop punctuation and return its set of words."""
+    return frozenset(_NON_WORD.sub(" ", query.lower()).split())
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class QueryRegistry:
+    """Shares search results between all sections of one report.
+
+    The first section to ask for a query starts the search; every later
+    request for the same query, or one whose word set is at least
+    ``similarity_threshold`` similar, awaits that search instead of running
+    its own. Searches that fail are forgotten, so a retry runs them again.
+    """
+
+    def __init__(self, similarity_threshold: float = 0.85) -> None:
+        self.similarity_threshold = similarity_threshold
+        self.searches_run = 0
+        self.searches_saved = 0
+        self.last_used = time.monotonic()
+        self._exact: Dict[Tuple[Any, FrozenSet[str]], asyncio.Future] = {}
+        self._entries: Dict[Any, List[Tuple[FrozenSet[str], asyncio.Future]]] = {}
+
+    async def search(
+        self,
+        query: str,
+        params: Any,
+        run: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Return the result of ``run`` for ``query``, sharing it with duplicates.
+
+        ``params`` holds the search options (max results, topic) that must
+        match for two queries to share a result.
+        """
+        self.last_used = time.monotonic()
+        tokens = query_tokens(query)
+        future = self._lookup(tokens, params)
+        if future is not None:
+            self.searches_saved += 1
+            return await asyncio.shield(future)
+        future = asyncio.ensure_future(run())
+        self._exact[(params, tokens)] = future
+        self._entries.setdefault(params, []).append((tokens, future))
+        future.add_done_callback(partial(self._forget_failed, params, tokens))
+        self.searches_run += 1
+        return await asyncio.shield(future)
+
+    def _forget_failed(
+        self, params: Any, tokens: FrozenSet[str], future: asyncio.Future
+    ) -> None:
+        if not future.cancelled() and future.exception() is None:
+            return
+        if self._exact.get((params, tokens)) is future:
+            del self._exact[(params, tokens)]
+        entries = self._entries.get(params, [])
+        entries[:] = [entry for entry in entries if entry[1] is not future]
+
+    def _lookup(
+        self, tokens: FrozenSet[str], params: Any
+    ) -> Optional[asyncio.Future]:
+        future = self._exact.get((params, tokens))
+        if future is not None:
+            return future
+        for other, other_future in self._entries.get(params, []):
+            if jaccard(tokens, other) >= self.similarity_threshold:
+                return other_future
+        return None
+
+
+_registries: Dict[str, QueryRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_query_registry(
+    report_id: str, similarity_threshold: float = 0.85
+) -> QueryRegistry:
+    """Return the registry for ``report_id``, creating it on first use."""
+    now = time.monotonic()
+    with _registries_lock:
+        for key, registry in list(_registries.items()):
+            if now - registry.last_used > REGISTRY_IDLE_SECONDS:
+                del _registries[key]
+        if report_id not in _registries:
+            _registries[report_id] = QueryRegistry(similarity_threshold)
+        return _registries[report_id]
+
+
+def release_query_registry(report_id: str) -> QueryRegistry:
+    """Forget the registry for ``report_id`` and return it for its stats."""
+    with _registries_lock:
+        return _registries.pop(report_id, None) or QueryRegistry()
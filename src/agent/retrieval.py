@@ -0,0 +1,156 @@
+"""Passage-level BM25 ranking of page content."""
+
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, replace
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from agent.sources import Source, content_hash
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+_PARAGRAPH = re.compile(r"\n\s*\n")
+STOPWORDS = frozenset(
+    {
+        "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how", "in",
+        "is", "it", "of", "on", "or", "that", "the", "this", "to", "was", "what",
+        "when", "where", "which", "with", "you", "your",
+    }
+)
+PASSAGE_SEPARATOR = "\n[...]\n"
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def split_passages(text: str, max_chars: int) -> List[str]:
+    """Split ``text`` into passages of roughly ``max_chars`` along paragraphs."""
+    passages: List[str] = []
+    current: List[str] = []
+    size = 0
+    for paragraph in _PARAGRAPH.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        # Very long paragraphs (pages without blank lines) are cut by length
+        pieces = [
+            paragraph[i : i + max_chars] for i in range(0, len(paragraph), max_chars)
+        ]
+        for piece in pieces:
+            if current and size + len(piece) > max_chars:
+                passages.append("\n\n".join(current))
+                current, size = [], 0
+            current.append(piece)
+            size += len(piece)
+    if current:
+        passages.append("\n\n".join(current))
+    return passages
+
+
+class BM25Index:
+    """In-memory Okapi BM25 index over a list of passages."""
+
+    def __init__(self, passages: Sequence[str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.size = len(passages)
+        postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        lengths = []
+        for i, passage in enumerate(passages):
+            counts = Counter(tokenize(passage))
+            lengths.append(sum(counts.values()))
+            for term, tf in counts.items():
+                docs, tfs = postings.setdefault(term, ([], []))
+                docs.append(i)
+                tfs.append(tf)
+        self.doc_lengths = np.asarray(lengths, dtype=np.float64)
+        self.avg_length = float(self.doc_lengths.mean()) if self.size else 0.0
+        self.postings = {
+            term: (np.asarray(docs), np.asarray(tfs, dtype=np.float64))
+            for term, (docs, tfs) in postings.items()
+        }
+
+    def score(self, query: str) -> np.ndarray:
+        """Return the BM25 score of every passage for ``query``."""
+        scores = np.zeros(self.size)
+        if not self.size or not self.avg_length:
+            return scores
+        for term in set(tokenize(query)):
+            if term not in self.postings:
+                continue
+            docs, tfs = self.postings[term]
+            idf = math.log(1 + (self.size - len(docs) + 0.5) / (len(docs) + 0.5))
+            lengths = self.doc_lengths[docs] / self.avg_length
+            norm = self.k1 * (1 - self.b + self.b * lengths)
+            scores[docs] += idf * tfs * (self.k1 + 1) / (tfs + norm)
+        return scores
+
+
+@dataclass
+class PassageSelection:
+    """Sources reduced to their best passages, with size accounting."""
+
+    sources: List[Source]
+    passages_kept: int
+    passages_total: int
+    chars_before: int
+    chars_after: int
+
+
+def select_passages(
+    sources: Sequence[Source], queries: Sequence[str], top_k: int, max_chars: int
+) -> PassageSelection:
+    """Keep only the ``top_k`` passages across ``sources`` that best match ``queries``.
+
+    Each query is scored separately and normalized by its best passage, so
+    the section description and every search query carry the same weight.
+    Selected passages stay in page order, and a source's score becomes its
+    best passage score. Sources with no selected passage are dropped.
+    """
+    owners: List[int] = []
+    passages: List[str] = []
+    for i, source in enumerate(sources):
+        for passage in split_passages(source.raw_content, max_chars):
+            owners.append(i)
+            passages.append(passage)
+    chars_before = sum(len(s.raw_content) for s in sources)
+    if not passages:
+        return PassageSelection(list(sources), 0, 0, chars_before, chars_before)
+
+    index = BM25Index(passages)
+    total = np.zeros(len(passages))
+    for query in queries:
+        scores = index.score(query)
+        if scores.max() > 0:
+            total += scores / scores.max()
+    best = sorted(np.argsort(-total, kind="stable")[:top_k])
+
+    chosen: Dict[int, List[int]] = {}
+    for p in best:
+        chosen.setdefault(owners[p], []).append(p)
+    selected = []
+    for i, source in enumerate(sources):
+        if i not in chosen and source.raw_content:
+            continue
+        picks = chosen.get(i, [])
+        raw_content = PASSAGE_SEPARATOR.join(passages[p] for p in picks)
+        selected.append(
+            replace(
+                source,
+                raw_content=raw_content,
+                content_hash=content_hash(raw_content or source.snippet),
+                score=float(max((total[p] for p in picks), default=source.score)),
+            )
+        )
+    return PassageSelection(
+        sources=selected,
+        passages_kept=len(best),
+        passages_total=len(passages),
+        chars_before=chars_before,
+        chars_after=sum(len(s.raw_content) for s in selected),
+    )
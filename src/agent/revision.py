@@ -0,0 +1,126 @@
+"""Merge targeted edits into an existing section draft.
+
+In delta revision mode the writer only produces the text a failed draft is
+missing (a subsection, more questions, table rows, new sources), and these
+edits are spliced into the current draft instead of rewriting it.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import List, Optional
+
+from agent.rubric import OPTION_LINE, TABLE_SEPARATOR
+from agent.state import SectionRevision
+
+_SOURCES_HEADING = re.compile(r"^\s*#{1,6}\s*Sources\s*:?\s*$", re.IGNORECASE)
+_CITATION = re.compile(r"\[(\d+)\]")
+
+
+def last_citation_number(content: str) -> int:
+    """Highest ``[n]`` citation number used in ``content`` (0 if none)."""
+    return max((int(n) for n in _CITATION.findall(content)), default=0)
+
+
+def _next_nonblank(lines: List[str], start: int) -> Optional[int]:
+    for i in range(start, len(lines)):
+        if lines[i].strip():
+            return i
+    return None
+
+
+def _first_question(lines: List[str]) -> Optional[int]:
+    """Index of the first multiple-choice question, or of the heading above it."""
+    for i, line in enumerate(lines):
+        if "?" not in line or OPTION_LINE.match(line):
+            continue
+        following = _next_nonblank(lines, i + 1)
+        if following is None or not OPTION_LINE.match(lines[following]):
+            continue
+        previous = i - 1
+        while previous >= 0 and not lines[previous].strip():
+            previous -= 1
+        if previous >= 0 and lines[previous].lstrip().startswith("#"):
+            return previous
+        return i
+    return None
+
+
+def _last_option(lines: List[str]) -> Optional[int]:
+    for i in range(len(lines) - 1, -1, -1):
+        if OPTION_LINE.match(lines[i]):
+            # Keep an answer line that directly follows the options
+            following = i + 1
+            while following < len(lines) and lines[following].strip():
+                following += 1
+            return following - 1
+    return None
+
+
+def _insert(lines: List[str], index: int, text: str) -> List[str]:
+    return [*lines[:index], "", *text.splitlines(), "", *lines[index:]]
+
+
+def _add_subsection(body: List[str], text: str) -> List[str]:
+    index = _first_question(body)
+    return _insert(body, len(body) if index is None else index, text)
+
+
+def _add_questions(body: List[str], text: str) -> List[str]:
+    index = _last_option(body)
+    return _insert(body, len(body) if index is None else index + 1, text)
+
+
+def _add_table_rows(body: List[str], text: str) -> List[str]:
+    start = next((i for i, l in enumerate(body) if TABLE_SEPARATOR.match(l)), None)
+    if start is None:
+        # No table to extend yet, so the edit is a whole table
+        return _add_subsection(body, text)
+    end = start + 1
+    while end < len(body) and body[end].lstrip().startswith("|"):
+        end += 1
+    rows = [
+        line
+        for line in text.splitlines()
+        if line.lstrip().startswith("|") and not TABLE_SEPARATOR.match(line)
+    ]
+    return [*body[:end], *rows, *body[end:]]
+
+
+def apply_revision(content: str, revision: SectionRevision) -> str:
+    """Return ``content`` with every edit in ``revision`` merged in place.
+
+    Subsections go before the multiple-choice questions, new questions after
+    the last one, table rows at the end of the first table and sources at the
+    end of the sources list.
+    """
+    lines = content.rstrip("\n").splitlines()
+    split = next(
+        (i for i, line in enumerate(lines) if _SOURCES_HEADING.match(line)), None
+    )
+    body = lines if split is None else lines[:split]
+    sources = [] if split is None else lines[split:]
+    while body and not body[-1].strip():
+        body.pop()
+
+    for edit in revision.edits:
+        text = edit.content.strip("\n")
+        if not text.strip():
+            continue
+        if edit.kind == "subsection":
+            body = _add_subsection(body, text)
+        elif edit.kind == "questions":
+            body = _add_questions(body, text)
+        elif edit.kind == "table_rows":
+            body = _add_table_rows(body, text)
+        elif edit.kind == "sources":
+            if not sources:
+                sources = ["### Sources"]
+            sources = [*sources, *text.splitlines()]
+
+    merged = "\n".join(body).rstrip("\n")
+    # Collapse the blank lines left around insertions
+    merged = re.sub(r"\n{3,}", "\n\n", merged)
+    if sources:
+        merged += "\n\n" + "\n".join(sources)
+    return merged + "\n"
@@ -0,0 +1,112 @@
+"""Local structural checks of section drafts against the report rubric.
+
+The rubric asks every research section for a list or table and at least
+three multiple-choice questions. Drafts that clearly miss these are sent
+back to research without spending a call on the LLM grader.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import List
+
+from agent.state import SearchQuery
+
+TABLE_SEPARATOR = re.compile(r"^\s*\|?\s*:?-{3,}:?\s*(?:\|\s*:?-{3,}:?\s*)+\|?\s*$")
+_LIST_ITEM = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+\S")
+OPTION_LINE = re.compile(r"^\s*(?:[-*+]\s*)?(?:\*\*)?\(?[A-Ea-e][).:](?:\*\*)?\s+\S")
+
+
+@dataclass
+class RubricResult:
+    """Structure found in a draft and the rubric checks it failed."""
+
+    questions: int
+    has_table: bool
+    has_list: bool
+    words: int
+    failures: List[str] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return not self.failures
+
+
+def check_section(
+    content: str, min_questions: int = 3, min_words: int = 150
+) -> RubricResult:
+    """Parse a markdown draft and check it against the structural rubric.
+
+    A multiple-choice question is a line containing "?" followed by at least
+    two option lines such as "- A) ..." or "b. ...". Option and question
+    lines do not count towards the list requirement.
+    """
+    questions = 0
+    list_items = 0
+    has_table = False
+    options = 0
+    in_question = False
+    for line in content.splitlines():
+        if OPTION_LINE.match(line):
+            options += 1
+            continue
+        if not line.strip():
+            continue
+        if in_question and options >= 2:
+            questions += 1
+        in_question = "?" in line
+        options = 0
+        if TABLE_SEPARATOR.match(line):
+            has_table = True
+        elif not in_question and _LIST_ITEM.match(line):
+            list_items += 1
+    if in_question and options >= 2:
+        questions += 1
+
+    result = RubricResult(
+        questions=questions,
+        has_table=has_table,
+        has_list=list_items >= 2,
+        words=len(content.split()),
+    )
+    if questions < min_questions:
+        result.failures.append(
+            f"{questions} of {min_questions} multiple-choice questions"
+        )
+    if not (result.has_table or result.has_list):
+        result.failures.append("no table or list")
+    if result.words < min_words:
+        result.failures.append(f"{result.words} of {min_words} words")
+    return result
+
+
+def follow_up_queries(
+    section_name: str, section_topic: str, result: RubricResult
+) -> List[SearchQuery]:
+    """Search queries that target what a structurally failing draft is missing."""
+    queries = [f"{section_topic} explained with examples"]
+    if not (result.has_table or result.has_list):
+        queries.append(f"{section_name} key concepts comparison")
+    if any("questions" in failure for failure in result.failures):
+        queries.append(f"{section_name} interview questions and answers")
+    return [SearchQuery(search_query=q) for q in queries]
+
+
+@dataclass
+class GradingStats:
+    """How section drafts were graded and how many LLM grader calls were saved."""
+
+    llm_grades: int = 0
+    local_failures: int = 0
+    final_iteration_skips: int = 0
+    # Separate grader calls for delta revisions in combined grading mode,
+    # where the edits cannot grade the merged draft themselves
+    delta_revision_grades: int = 0
+
+    @property
+    def grader_calls_saved(self) -> int:
+        return self.local_failures + self.final_iteration_skips
+
+
+grading_stats = GradingStats()
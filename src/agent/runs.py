@@ -0,0 +1,170 @@
+"""Resumable report runs backed by a durable SQLite checkpointer."""
+
+from __future__ import annotations
+
+import json
+import os
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from langgraph.graph.state import CompiledStateGraph
+
+from agent.cache import report_cache_key
+from agent.configuration import Configuration
+
+CHECKPOINT_PATH = os.getenv("CHECKPOINT_DB", ".cache/checkpoints.sqlite")
+
+
+@asynccontextmanager
+async def open_checkpointer(
+    path: str = CHECKPOINT_PATH,
+) -> AsyncIterator[AsyncSqliteSaver]:
+    """Open the SQLite checkpointer at ``path`` for the lifetime of the context."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    async with AsyncSqliteSaver.from_conn_string(path) as checkpointer:
+        yield checkpointer
+
+
+async def prepare_run(
+    graph: CompiledStateGraph,
+    topic: str,
+    run_id: Optional[str] = None,
+    configurable: Optional[Dict[str, Any]] = None,
+) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+    """Return the graph input and config for a run, resuming unfinished threads.
+
+    Runs are grouped by ``run_id``, or by the job description and
+    configuration when no id is given. Every run gets its own checkpoint
+    thread; the group's latest thread is only reused while it is unfinished,
+    so a new run never inherits the sections of an earlier one.
+    """
+    configurable = configurable or {}
+    key = run_id or report_cache_key(
+        topic, Configuration.from_runnable_config({"configurable": configurable})
+    )
+    thread_id = await latest_thread(graph, key)
+    if thread_id is not None:
+        config = run_config(thread_id, key, configurable)
+        snapshot = await graph.aget_state(config)
+        if snapshot.next:
+            return None, config
+    config = run_config(f"{key}:{uuid.uuid4().hex[:12]}", key, configurable)
+    return {"topic": topic}, config
+
+
+def run_config(
+    thread_id: str, key: str, configurable: Dict[str, Any]
+) -> Dict[str, Any]:
+    # The key is stored in every checkpoint's metadata to find the thread again
+    return {
+        "configurable": {**configurable, "thread_id": thread_id},
+        "metadata": {"report_key": key},
+    }
+
+
+async def latest_thread(graph: CompiledStateGraph, key: str) -> Optional[str]:
+    """Thread id of the most recent run for ``key``, if there is one."""
+    async for checkpoint in graph.checkpointer.alist(
+        None, filter={"report_key": key}, limit=1
+    ):
+        return checkpoint.config["configurable"]["thread_id"]
+    return None
+
+
+async def run_report(
+    graph: CompiledStateGraph,
+    topic: str,
+    run_id: Optional[str] = None,
+    configurable: Optional[Dict[str, Any]] = None,
+    max_attempts: int = 2,
+) -> Dict[str, Any]:
+    """Run the report graph for ``run_id``, resuming where it stopped.
+
+    If the thread has an unfinished checkpoint (a previous attempt failed or
+    the process died), the run continues from the last completed step instead
+    of starting over: finished nodes, including research sections that
+    already completed in the failed step, are not executed again. Failures
+    are retried by resuming, up to ``max_attempts`` attempts in total.
+    """
+    graph_input, config = await prepare_run(graph, topic, run_id, configurable)
+    thread_id = config["configurable"]["thread_id"]
+    attempt = 1
+    while True:
+        try:
+            return await graph.ainvoke(graph_input, config)
+        except Exception as e:
+            if attempt >= max_attempts:
+                raise
+            print(f"Report run {thread_id} failed on attempt {attempt} ({e}), resuming")
+            attempt += 1
+            graph_input = None
+
+
+def report_events(node: str, update: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Translate one node update from ``graph.astream`` into progress events."""
+    update = update or {}
+    if node == "is_valid_job_description":
+        return [{"event": "validation", "data": {"valid": "final_report" not in update}}]
+    if node == "planning_node":
+        sections = [
+            {"name": s.name, "description": s.description, "research": s.research}
+            for s in update["sections"]
+        ]
+        # Pipelined planning finishes research sections inside the planning node
+        return [{"event": "plan", "data": {"sections": sections}}] + report_events(
+            "generate_sections", update
+        )
+    if node in ("generate_sections", "write_roadmap_conclusion"):
+        return [
+            {"event": "section", "data": {"name": s.name, "content": s.content}}
+            for s in update.get("completed_sections", [])
+        ]
+    return []
+
+
+async def stream_report(
+    graph: CompiledStateGraph,
+    topic: str,
+    run_id: Optional[str] = None,
+    configurable: Optional[Dict[str, Any]] = None,
+    max_attempts: int = 2,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Run the report graph and yield progress events as nodes finish.
+
+    Events are ``validation``, ``plan``, one ``section`` per finished
+    section (research sections arrive one by one as their subgraphs
+    complete) and finally ``report`` with the compiled markdown. Like
+    ``run_report``, an unfinished thread is resumed rather than restarted,
+    and failures are retried by resuming.
+    """
+    graph_input, config = await prepare_run(graph, topic, run_id, configurable)
+    thread_id = config["configurable"]["thread_id"]
+    final_report = None
+    attempt = 1
+    while True:
+        try:
+            async for chunk in graph.astream(
+                graph_input, config, stream_mode="updates"
+            ):
+                for node, update in chunk.items():
+                    for event in report_events(node, update):
+                        yield event
+                    if update and "final_report" in update:
+                        final_report = update["final_report"]
+            break
+        except Exception as e:
+            if attempt >= max_attempts:
+                raise
+            print(f"Report run {thread_id} failed on attempt {attempt} ({e}), resuming")
+            attempt += 1
+            graph_input = None
+    yield {"event": "report", "data": {"final_report": final_report}}
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Encode an event from ``stream_report`` as a server-sent event."""
+    return f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
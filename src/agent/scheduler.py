@@ -0,0 +1,165 @@
+"""Process-wide scheduler that every web search goes through."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import httpx
+
+from agent.configuration import Configuration
+
+T = TypeVar("T")
+
+
+@dataclass
+class SchedulerStats:
+    """Queue and retry metrics for a ``SearchScheduler``."""
+
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    retries: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+    @property
+    def mean_wait_seconds(self) -> float:
+        started = self.completed + self.failed
+        return self.total_wait_seconds / started if started else 0.0
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Return True for rate-limit responses and timeouts."""
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError, httpx.TimeoutException)):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code == 429
+    return getattr(exc, "status_code", None) == 429
+
+
+class TokenBucket:
+    """Token bucket allowing ``rate`` acquisitions per second with bursts of ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def try_acquire(self) -> float:
+        """Take a token and return 0, or return the seconds until one is available."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+
+class SearchScheduler:
+    """Runs searches with a concurrency cap, a rate limit and retries.
+
+    At most ``max_concurrency`` searches are in flight and new ones start at
+    no more than ``rate_per_second``. Rate-limit errors and timeouts are
+    retried up to ``max_retries`` times with jittered exponential backoff.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        rate_per_second: float = 5.0,
+        max_retries: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 20.0,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.bucket = TokenBucket(rate_per_second, max(1.0, rate_per_second))
+        self.stats = SchedulerStats()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._bucket_lock: Optional[asyncio.Lock] = None
+
+    async def run(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Schedule ``fn`` and return its result, retrying transient failures."""
+        self.stats.submitted += 1
+        attempt = 0
+        while True:
+            try:
+                return await self._run_once(fn)
+            except Exception as exc:
+                if attempt >= self.max_retries or not is_retryable(exc):
+                    self.stats.failed += 1
+                    raise
+                attempt += 1
+                self.stats.retries += 1
+                await asyncio.sleep(self._backoff(attempt))
+
+    async def _run_once(self, fn: Callable[[], Awaitable[T]]) -> T:
+        semaphore, bucket_lock = self._primitives()
+        submitted_at = time.monotonic()
+        self.stats.queue_depth += 1
+        self.stats.max_queue_depth = max(
+            self.stats.max_queue_depth, self.stats.queue_depth
+        )
+        try:
+            await semaphore.acquire()
+            try:
+                async with bucket_lock:
+                    while (delay := self.bucket.try_acquire()) > 0:
+                        await asyncio.sleep(delay)
+            except BaseException:
+                semaphore.release()
+                raise
+        finally:
+            self.stats.queue_depth -= 1
+        waited = time.monotonic() - submitted_at
+        self.stats.total_wait_seconds += waited
+        self.stats.max_wait_seconds = max(self.stats.max_wait_seconds, waited)
+        try:
+            result = await fn()
+        finally:
+            semaphore.release()
+        self.stats.completed += 1
+        return result
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter keeps retries from concurrent searches from lining up
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def _primitives(self) -> tuple[asyncio.Semaphore, asyncio.Lock]:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._bucket_lock = asyncio.Lock()
+        return self._semaphore, self._bucket_lock
+
+
+_scheduler: Optional[SearchScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_search_scheduler(config: Configuration) -> SearchScheduler:
+    """Return the process-wide scheduler, creating it from ``config`` on first use."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = SearchScheduler(
+                max_concurrency=config.search_max_concurrency,
+                rate_per_second=config.search_rate_per_second,
+                max_retries=config.search_max_retries,
+            )
+        return _scheduler
@@ -0,0 +1,139 @@
+"""Long-lived Tavily search client sharing one HTTP connection pool."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Any, Dict, Optional
+
+import httpx
+
+TAVILY_BASE_URL = "https://api.tavily.com"
+
+
+class TavilySearchClient:
+    """Async Tavily client that keeps its connections alive between searches.
+
+    ``tavily.AsyncTavilyClient`` opens a fresh ``httpx.AsyncClient`` for every
+    request, so each search pays for a new TCP and TLS handshake. This client
+    creates one pool lazily and reuses it until ``aclose`` is called. Like
+    the SDK, it routes requests through ``TAVILY_HTTP_PROXY`` and
+    ``TAVILY_HTTPS_PROXY`` when they are set.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: str = TAVILY_BASE_URL,
+        timeout: float = 60.0,
+        max_connections: int = 32,
+        max_keepalive_connections: int = 16,
+        keepalive_expiry: float = 120.0,
+        proxies: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self.api_key = api_key or os.getenv("TAVILY_API_KEY", "")
+        self.base_url = base_url
+        self.timeout = timeout
+        proxies = proxies or {}
+        self.proxies = {
+            scheme: proxy
+            for scheme, proxy in (
+                ("http://", proxies.get("http", os.getenv("TAVILY_HTTP_PROXY"))),
+                ("https://", proxies.get("https", os.getenv("TAVILY_HTTPS_PROXY"))),
+            )
+            if proxy
+        }
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def get_client(self) -> httpx.AsyncClient:
+        """Return the pool for the running event loop, replacing a stale one."""
+        # A pool is bound to the event loop it was created on
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            old_client, old_loop = self._client, self._loop
+            mounts = {
+                scheme: httpx.AsyncHTTPTransport(proxy=proxy, limits=self.limits)
+                for scheme, proxy in self.proxies.items()
+            }
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={
+                    "Content-Type": "application/json",
+                    "Authorization": f"Bearer {self.api_key}",
+                },
+                limits=self.limits,
+                timeout=self.timeout,
+                mounts=mounts or None,
+            )
+            self._loop = loop
+            if old_client is not None:
+                await retire_client(old_client, old_loop)
+        return self._client
+
+    async def search(
+        self,
+        query: str,
+        max_results: int = 5,
+        include_raw_content: bool = False,
+        topic: str = "general",
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """Run a Tavily search and return the decoded JSON response."""
+        payload = {
+            "api_key": self.api_key,
+            "query": query,
+            "max_results": max_results,
+            "include_raw_content": include_raw_content,
+            "topic": topic,
+            **kwargs,
+        }
+        client = await self.get_client()
+        response = await client.post("/search", json=payload)
+        response.raise_for_status()
+        return response.json()
+
+    async def aclose(self) -> None:
+        """Close the connection pool; the next search opens a new one."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._loop = None
+
+
+async def retire_client(
+    client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]
+) -> None:
+    """Close a pool that was created on another event loop."""
+    if client.is_closed:
+        return
+    if loop is not None and loop.is_running():
+        # Its connections belong to that loop, so close them there
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        return
+    try:
+        await client.aclose()
+    except RuntimeError as e:
+        print(f"Warning: could not close a stale Tavily connection pool: {e}")
+
+
+_tavily_client: Optional[TavilySearchClient] = None
+
+
+def get_tavily_client() -> TavilySearchClient:
+    """Return the process-wide Tavily client, creating it on first use."""
+    global _tavily_client
+    if _tavily_client is None:
+        _tavily_client = TavilySearchClient()
+    return _tavily_client
+
+
+async def close_tavily_client() -> None:
+    """Release the shared client's connections, e.g. on app shutdown."""
+    if _tavily_client is not None:
+        await _tavily_client.aclose()
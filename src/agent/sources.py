@@ -0,0 +1,80 @@
+"""Typed records for search results, rendered to prompt text only on demand."""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+def content_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass(slots=True)
+class Source:
+    """One unique web page returned by a search."""
+
+    url: str
+    title: str
+    snippet: str
+    raw_content: str
+    score: float
+    content_hash: str
+
+    @classmethod
+    def from_search_result(cls, result: Dict) -> Source:
+        raw_content = result.get("raw_content")
+        if raw_content is None:
+            print(f"Warning: No raw_content found for source {result['url']}")
+            raw_content = ""
+        return cls(
+            url=result["url"],
+            title=result.get("title") or "",
+            snippet=result.get("content") or "",
+            raw_content=raw_content,
+            score=result.get("score") or 0.0,
+            content_hash=content_hash(raw_content or result.get("content") or ""),
+        )
+
+
+class SourceStore:
+    """Ordered collection of sources, unique by URL."""
+
+    __slots__ = ("_by_url",)
+
+    def __init__(self, sources: Optional[Iterable[Source]] = None) -> None:
+        self._by_url: Dict[str, Source] = {}
+        for source in sources or ():
+            self.add(source)
+
+    def add(self, source: Source) -> bool:
+        """Add ``source`` and return True if its URL was not stored yet."""
+        if source.url in self._by_url:
+            return False
+        self._by_url[source.url] = source
+        return True
+
+    def add_search_results(self, search_results: Iterable[Dict]) -> List[Source]:
+        """Add every result of Tavily ``search_results``; return the new sources."""
+        added = []
+        for response in search_results:
+            for result in response["results"]:
+                if result["url"] in self._by_url:
+                    continue
+                source = Source.from_search_result(result)
+                self._by_url[source.url] = source
+                added.append(source)
+        return added
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._by_url
+
+    def __iter__(self) -> Iterator[Source]:
+        return iter(self._by_url.values())
+
+    def __len__(self) -> int:
+        return len(self._by_url)
+
+    def to_list(self) -> List[Source]:
+        return list(self._by_url.values())
@@ -5,6 +5,8 @@ from typing import Dict, List, Literal, TypedDict, Annotated
 from pydantic import BaseModel, Field
 import operator
 
+from agent.sources import Source
+
 
 class Section(BaseModel):
     name: str = Field(description="Name of this section in the report")
@@ -39,18 +41,25 @@ class ReportStateOutput(TypedDict):
 
 class ReportState(TypedDict):
     topic: str
+    report_id: str
     sections: List[Section]
     completed_sections: Annotated[list, operator.add]
     report_sections_from_research: str
     final_report: str
+    searches_saved: int
 
 
 class SectionState(TypedDict):
     topic: str
+    report_id: str
     section: Section
     search_iterations: int
     search_queries: list[SearchQuery]
-    source_str: str
+    sources: list[Source]
+    new_sources: list[Source]
+    seen_urls: list[str]
+    revision_notes: list[str]
+    rag_context: str
     report_sections_from_research: str
     completed_sections: list[Section]
 
@@ -66,6 +75,37 @@ class Feedback(BaseModel):
     follow_up_queries: list[SearchQuery] = Field(
         description="Follow-up queries to refine the search for more information."
     )
+    missing: list[str] = Field(
+        default_factory=list,
+        description="What the section is missing or gets wrong, if the grade is 'fail'.",
+    )
+
+
+class SectionDraft(BaseModel):
+    content: str = Field(
+        description="The full markdown content of the section, including its sources."
+    )
+    grade: Literal["pass", "fail"] = Field(
+        description="Self-assessment of whether the section meets requirements ('pass') or needs more research ('fail')."
+    )
+    follow_up_queries: list[SearchQuery] = Field(
+        description="Follow-up queries to gather missing information if the grade is 'fail'."
+    )
+
+
+class SectionEdit(BaseModel):
+    kind: Literal["subsection", "questions", "table_rows", "sources"] = Field(
+        description="Where the new text goes: a new subsection, more multiple choice questions, rows for the existing table, or entries for the sources list."
+    )
+    content: str = Field(
+        description="Markdown to add. Only new text, never text already in the section."
+    )
+
+
+class SectionRevision(BaseModel):
+    edits: list[SectionEdit] = Field(
+        description="Targeted additions that address the gaps in the section."
+    )
 
 class JobDescriptionValidation(BaseModel):
     valid: Literal["valid", "invalid"] = Field(
@@ -0,0 +1,211 @@
+"""Stub chat models and search payloads for tests and benchmarks.
+
+The stubs reply with canned, schema-valid output after a fixed latency so the
+graph can be exercised end to end without network access.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.messages.tool import tool_call_chunk
+
+from agent.state import (
+    Feedback,
+    JobDescriptionValidation,
+    Queries,
+    SearchQuery,
+    Section,
+    SectionDraft,
+    SectionEdit,
+    SectionRevision,
+    Sections,
+)
+
+STUB_SECTION_CONTENT = """## Stub section
+
+Placeholder prose standing in for a researched section. It is long enough
+to satisfy the structural rubric so stub runs exercise the LLM grader path.
+""" + " ".join(["Filler text describing the stub concept in more detail."] * 16) + """
+
+| Concept | Description |
+|---------|-------------|
+| Stub | Placeholder content |
+
+1. Which answer is correct?
+   - A) One
+   - B) Two
+
+2. Which option is a placeholder?
+   - A) Stub
+   - B) Real
+
+3. How many questions does the stub have?
+   - A) Three
+   - B) Four
+"""
+
+# Characters per chunk when a stub streams its response
+STREAM_CHUNK_CHARS = 16
+
+
+def default_sections(num_research_sections: int) -> Sections:
+    """Build a plan with an intro, ``num_research_sections`` bodies and a conclusion."""
+    sections = [
+        Section(name="Introduction", description="Intro", research=False, content="")
+    ]
+    sections.extend(
+        Section(
+            name=f"Skill {i}",
+            description=f"Technical skill number {i}",
+            research=True,
+            content="",
+        )
+        for i in range(1, num_research_sections + 1)
+    )
+    sections.append(
+        Section(name="Conclusion", description="Summary", research=False, content="")
+    )
+    return Sections(sections=sections)
+
+
+class StubChatModel:
+    """Chat model test double with a fixed latency and canned responses."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        num_research_sections: int = 3,
+        num_queries: int = 3,
+        schema: Optional[type] = None,
+        calls: Optional[List[Optional[type]]] = None,
+        responder: Optional[Callable[[Optional[type], list], Any]] = None,
+    ) -> None:
+        self.latency = latency
+        self.num_research_sections = num_research_sections
+        self.num_queries = num_queries
+        self.schema = schema
+        self.calls = calls if calls is not None else []
+        self.responder = responder
+
+    def bind_tools(self, tools: list, **kwargs: Any) -> StubChatModel:
+        return self.with_structured_output(tools[0])
+
+    def with_structured_output(self, schema: type, **kwargs: Any) -> StubChatModel:
+        return StubChatModel(
+            latency=self.latency,
+            num_research_sections=self.num_research_sections,
+            num_queries=self.num_queries,
+            schema=schema,
+            calls=self.calls,
+            responder=self.responder,
+        )
+
+    async def ainvoke(self, messages: list, config: Any = None, **kwargs: Any) -> Any:
+        await asyncio.sleep(self.latency)
+        return self._respond(messages)
+
+    async def astream(
+        self, messages: list, config: Any = None, **kwargs: Any
+    ) -> AsyncIterator[AIMessageChunk]:
+        """Stream the response in small chunks spread over the latency.
+
+        Structured responses arrive as tool call argument fragments, like a
+        model bound to the schema as a tool.
+        """
+        response = self._respond(messages)
+        text = (
+            response.content if self.schema is None else response.model_dump_json()
+        )
+        pieces = [
+            text[i : i + STREAM_CHUNK_CHARS]
+            for i in range(0, len(text), STREAM_CHUNK_CHARS)
+        ]
+        for i, piece in enumerate(pieces):
+            await asyncio.sleep(self.latency / len(pieces))
+            if self.schema is None:
+                yield AIMessageChunk(content=piece)
+                continue
+            first = i == 0
+            yield AIMessageChunk(
+                content="",
+                tool_call_chunks=[
+                    tool_call_chunk(
+                        name=self.schema.__name__ if first else None,
+                        args=piece,
+                        id="stub_call" if first else None,
+                        index=0,
+                    )
+                ],
+            )
+
+    def invoke(self, messages: list, config: Any = None, **kwargs: Any) -> Any:
+        time.sleep(self.latency)
+        return self._respond(messages)
+
+    def _respond(self, messages: list) -> Any:
+        self.calls.append(self.schema)
+        if self.responder is not None:
+            return self.responder(self.schema, messages)
+        return self.default_response(self.schema)
+
+    def default_response(self, schema: Optional[type]) -> Any:
+        if schema is JobDescriptionValidation:
+            return JobDescriptionValidation(valid="valid")
+        if schema is Queries:
+            return Queries(
+                queries=[
+                    SearchQuery(search_query=f"stub query {i}")
+                    for i in range(self.num_queries)
+                ]
+            )
+        if schema is Sections:
+            return default_sections(self.num_research_sections)
+        if schema is Feedback:
+            return Feedback(grade="pass", follow_up_queries=[])
+        if schema is SectionDraft:
+            return SectionDraft(
+                content=STUB_SECTION_CONTENT, grade="pass", follow_up_queries=[]
+            )
+        if schema is SectionRevision:
+            return SectionRevision(
+                edits=[
+                    SectionEdit(
+                        kind="questions",
+                        content="4. Which stub edit is this?\n   - A) Delta\n   - B) Rewrite",
+                    )
+                ]
+            )
+        return AIMessage(content=STUB_SECTION_CONTENT)
+
+
+def stub_model_factory(**kwargs: Any) -> Callable[..., StubChatModel]:
+    """Return a ``ModelRegistry`` factory that builds ``StubChatModel`` instances."""
+    calls: List[Optional[type]] = []
+
+    def factory(model_provider: str, model: str) -> StubChatModel:
+        return StubChatModel(calls=calls, **kwargs)
+
+    factory.calls = calls  # type: ignore[attr-defined]
+    return factory
+
+
+def fake_search_response(query: str, max_results: int = 2) -> Dict[str, Any]:
+    """Build a Tavily-shaped search response for ``query``."""
+    slug = "-".join(query.lower().split())
+    return {
+        "query": query,
+        "results": [
+            {
+                "url": f"https://example.com/{slug}/{i}",
+                "title": f"{query} ({i})",
+                "content": f"Snippet about {query}.",
+                "raw_content": f"Full page about {query}. " * 50,
+                "score": 1.0 / (i + 1),
+            }
+            for i in range(max_results)
+        ],
+    }
@@ -1,61 +1,113 @@
 import asyncio
-from pinecone.data.index import Index
-from tavily import AsyncTavilyClient
-from langchain_huggingface import HuggingFaceEmbeddings
+from functools import partial
+from typing import Optional
 
+from langchain_core.embeddings import Embeddings
+
+from agent.cache import SearchCache
+from agent.context import pack_sources
+from agent.dedup import drop_near_duplicates
+from agent.query_registry import QueryRegistry
+from agent.retrieval import select_passages
+from agent.scheduler import SearchScheduler
+from agent.search_client import get_tavily_client
+from agent.sources import Source, SourceStore
 from agent.state import Section
+from agent.vectorstore import VectorIndex
+
+
+async def async_search(
+    query_list: list[str],
+    max_depth: int,
+    cache: Optional[SearchCache] = None,
+    topic: str = "general",
+    registry: Optional[QueryRegistry] = None,
+    scheduler: Optional[SearchScheduler] = None,
+) -> list[Source]:
+    """Perform a web search using the given query list and return the unique sources.
+
+    Responses found in ``cache`` are reused; only the misses hit Tavily. When a
+    report-wide ``registry`` is given, duplicate queries from other sections
+    share a single search. Tavily calls go through ``scheduler`` when given.
+    """
+    tavily = get_tavily_client()
 
-async def async_search(query_list: list[str], max_depth: int) -> str:
-    """Perform a web search using the given query list and return the results."""
-    tavily = AsyncTavilyClient()
-    searches = []
-    for query in query_list:
-        searches.append(
-            tavily.search(
-                query, max_results=max_depth, include_raw_content=True, topic="general"
-            )
+    async def search_one(query: str) -> dict:
+        if cache is not None:
+            cached = await asyncio.to_thread(cache.get, query, max_depth, topic)
+            if cached is not None:
+                return cached
+        search = partial(
+            tavily.search,
+            query,
+            max_results=max_depth,
+            include_raw_content=True,
+            topic=topic,
         )
+        response = await (scheduler.run(search) if scheduler else search())
+        if cache is not None:
+            await asyncio.to_thread(cache.set, query, max_depth, topic, response)
+        return response
+
+    if registry is None:
+        searches = [search_one(query) for query in query_list]
+    else:
+        searches = [
+            registry.search(query, (max_depth, topic), partial(search_one, query))
+            for query in query_list
+        ]
     search_results = await asyncio.gather(*searches)
-    return unique_formatted_sources(search_results)
+    return unique_sources(search_results)
 
 
-def unique_formatted_sources(
-    search_results, max_tokens_per_source: int = 4000
-) -> str:
-    """Format the search results into a unique string."""
-    sources = []
-    for result in search_results:
-        sources.extend(result["results"])
-
-    unique_url_sources = {source["url"]: source for source in sources}
-    formatted_text = "Content from sources:\n"
-    for i, source in enumerate(unique_url_sources.values(), 1):
-        formatted_text += f"{'='*80}\n"  # Clear section separator
-        formatted_text += f"Source: {source['title']}\n"
-        formatted_text += f"{'-'*80}\n"  # Subsection separator
-        formatted_text += f"URL: {source['url']}\n===\n"
-        formatted_text += (
-            f"Most relevant content from source: {source['content']}\n===\n"
+def unique_sources(search_results) -> list[Source]:
+    """Collect the search results into ``Source`` records, unique by URL."""
+    store = SourceStore()
+    store.add_search_results(search_results)
+    return store.to_list()
+
+
+def remove_near_duplicates(
+    sources: list[Source], threshold: float, label: str
+) -> list[Source]:
+    """Drop near-duplicate pages from ``sources`` and log the bytes saved."""
+    result = drop_near_duplicates(sources, threshold)
+    if result.removed:
+        print(
+            f"Near-duplicate filter ({label}): removed {len(result.removed)} of "
+            f"{len(sources)} pages, {result.removed_bytes} bytes"
         )
+    return result.kept
+
+
+def rank_passages(
+    sources: list[Source], queries: list[str], top_k: int, max_chars: int, label: str
+) -> list[Source]:
+    """Reduce ``sources`` to their ``top_k`` passages that best match ``queries``."""
+    selection = select_passages(sources, queries, top_k, max_chars)
+    print(
+        f"Passage ranking ({label}): kept {selection.passages_kept} of "
+        f"{selection.passages_total} passages, {selection.chars_after} of "
+        f"{selection.chars_before} chars"
+    )
+    return selection.sources
+
 
-        char_limit = max_tokens_per_source * 4
-        # Handle None raw_content
-        raw_content = source.get("raw_content", "")
-        if raw_content is None:
-            raw_content = ""
-            print(f"Warning: No raw_content found for source {source['url']}")
-        if len(raw_content) > char_limit:
-            raw_content = raw_content[:char_limit] + "... [truncated]"
-        formatted_text += f"Full source content limited to {max_tokens_per_source} tokens: {raw_content}\n\n"
-        formatted_text += f"{'='*80}\n\n"  # End section separator
+def render_sources(sources: list[Source], max_context_tokens: int = 16000) -> str:
+    """Render ``sources`` to prompt text of at most ``max_context_tokens`` tokens."""
+    packed = pack_sources(sources, max_context_tokens)
+    print(
+        f"Context packer: packed {packed.packed_tokens} tokens from "
+        f"{packed.sources_packed} sources, dropped {packed.dropped_tokens} tokens "
+        f"and {packed.sources_dropped} sources"
+    )
+    return packed.text
 
-    return formatted_text.strip()
 
 def format_sections(sections: list[Section]) -> str:
     """ Format a list of sections into a string """
-    formatted_str = ""
-    for idx, section in enumerate(sections, 1):
-        formatted_str += f"""
+    return "".join(
+        f"""
 {'='*60}
 Section {idx}: {section.name}
 {'='*60}
@@ -68,30 +120,34 @@ Content:
 {section.content if section.content else '[Not yet written]'}
 
 """
-    return formatted_str
+        for idx, section in enumerate(sections, 1)
+    )
 
 
 def format_rag_contexts(matches: list) -> str:
-    """Formats Pinecone results into a readable string."""
+    """Formats vector index matches into a readable string."""
     contexts = []
     for x in matches:
         text = (
-            f"Text: {x['metadata']['text']}\n"
+            f"Text: {x['metadata'].get('text', '')}\n"
             f"Title: {x['metadata'].get('title', 'N/A')}\n"
             f"Author: {x['metadata'].get('author', 'N/A')}\n"
         )
         contexts.append(text)
     return "\n---\n".join(contexts)
 
-def search_pinecone(index: Index, embeddings: HuggingFaceEmbeddings, query_list: list[str], top_k: int = 5) -> str:
-    responses = []
-    for query in query_list:
-        query_emb = embeddings.embed_query(query)
 
-        response = index.query(
-            vector=query_emb,
-            top_k=top_k,
-            include_metadata=True
-        )
-        responses.append(format_rag_contexts(response.get(["matches"], [])))
-    return "\n---\n".join(responses)
\ No newline at end of file
+async def search_vector_index(
+    index: VectorIndex, embeddings: Embeddings, query_list: list[str], top_k: int = 5
+) -> str:
+    """Retrieve the ``top_k`` reference passages for every query in ``query_list``.
+
+    All queries are embedded in one batch and the vector queries run
+    concurrently; passages matched by several queries are listed once.
+    """
+    if not query_list:
+        return ""
+    vectors = await embeddings.aembed_documents(query_list)
+    responses = await index.query_many(vectors, top_k)
+    unique_matches = {match["id"]: match for matches in responses for match in matches}
+    return format_rag_contexts(list(unique_matches.values()))
@@ -0,0 +1,296 @@
+"""Local fast-path classifier for job description validation.
+
+Clear job postings and clear non-postings are decided in-process from
+section headers and a small hashed bag-of-words logistic regression; only
+ambiguous inputs are sent to the LLM validator.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+NUM_FEATURES = 1 << 12
+_WORD = re.compile(r"[a-z][a-z+#']*")
+_HEADERS = re.compile(
+    r"^\s*(?:#+\s*)?(?:about (?:the|this) (?:role|job|position|team)|"
+    r"(?:key |your |job )?responsibilities|what you(?:'ll| will) do|"
+    r"(?:minimum |preferred |basic )?qualifications|requirements|"
+    r"what we(?:'re| are) looking for|who you are|nice to have|"
+    r"benefits|perks|compensation|job description|role overview|"
+    r"skills(?: and experience)?)\s*:?\s*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+# Matched against lowercased text, which is several times faster than IGNORECASE
+_JOB_PHRASES = re.compile(
+    r"\b(?:years? of (?:professional |relevant |industry )?experience|"
+    r"experience (?:with|in)|degree in|bachelor|equal opportunity|"
+    r"we are (?:looking|hiring|seeking)|you will|apply|full[- ]time|salary)"
+)
+# A bare job title is not a posting but is worth asking the LLM about
+_ROLE_WORDS = re.compile(
+    r"\b(?:engineer|developer|scientist|analyst|architect|manager|designer|"
+    r"administrator|consultant|specialist|intern|lead|programmer)s?\b",
+    re.IGNORECASE,
+)
+
+SEED_JOB_DESCRIPTIONS = [
+    """Software Engineer, Backend
+About the role
+You will design and build APIs that serve millions of users.
+Responsibilities:
+- Build and operate Python services on Kubernetes
+- Own features end to end, from design docs to on-call
+Qualifications:
+- 3+ years of experience with backend development
+- Experience with PostgreSQL and Redis
+- Bachelor's degree in Computer Science or equivalent""",
+    """Data Scientist
+What you'll do
+Build forecasting models and run A/B tests with product teams.
+What we're looking for
+- 2 years of experience with Python, SQL and statistics
+- Experience with scikit-learn, pandas and experimentation platforms
+Benefits
+Health insurance, 401k matching, remote-friendly.""",
+    """Frontend Engineer (React)
+We are looking for a frontend engineer to join our design systems team.
+Responsibilities
+- Build accessible React components in TypeScript
+- Improve web performance and Core Web Vitals
+Requirements
+- 4+ years of experience in frontend development
+- Strong knowledge of HTML, CSS and JavaScript""",
+    """Machine Learning Engineer
+Minimum qualifications:
+Bachelor's degree or equivalent practical experience.
+2 years of experience with machine learning frameworks such as PyTorch or TensorFlow.
+Preferred qualifications:
+Master's degree in Computer Science.
+Experience deploying models to production and building data pipelines.""",
+    """DevOps Engineer - full-time, hybrid
+Key responsibilities
+- Maintain CI/CD pipelines in GitHub Actions and Jenkins
+- Manage AWS infrastructure with Terraform
+Skills and experience
+- Experience with Docker, Kubernetes and Linux administration
+- Scripting in Bash or Python
+Compensation: $120k-$150k plus equity.""",
+    """Senior Site Reliability Engineer
+About the team
+Our SRE team keeps the payments platform available around the clock.
+You will define SLOs, automate toil and lead incident reviews.
+Qualifications
+- 5+ years of experience operating distributed systems
+- Deep knowledge of observability tooling (Prometheus, Grafana)
+We are an equal opportunity employer.""",
+    """Android Developer
+Job description
+Develop and maintain our Android app written in Kotlin.
+Requirements:
+- 3 years of experience with Android SDK and Jetpack Compose
+- Familiarity with REST APIs and offline storage
+Nice to have
+- Experience with Kotlin Multiplatform""",
+    """Data Engineer
+Role overview
+Build batch and streaming pipelines on Spark and Kafka.
+Responsibilities
+- Model data in the warehouse (Snowflake, dbt)
+- Ensure data quality and lineage
+Requirements
+- Experience with Airflow, SQL and Python
+- Bachelor's degree in a quantitative field""",
+    """Security Engineer
+What you will do
+Run threat modeling, review code for vulnerabilities and respond to incidents.
+Who you are
+- 3+ years of experience in application security
+- Knowledge of OWASP Top 10, cloud IAM and penetration testing
+Apply with your resume and a short cover letter.""",
+    """Full Stack Developer (Node.js / Vue)
+We are hiring a full stack developer for our logistics platform.
+Responsibilities:
+- Develop features across Node.js services and Vue front end
+- Write unit and integration tests
+Qualifications:
+- 2+ years of professional experience in web development
+- Experience with MongoDB or MySQL
+Salary: competitive, with annual bonus.""",
+    """Embedded Software Engineer
+Key responsibilities
+Write firmware in C and C++ for ARM Cortex-M microcontrollers.
+Debug hardware and software integration issues with oscilloscopes.
+Qualifications
+Degree in Electrical or Computer Engineering.
+Experience with RTOS, SPI, I2C and UART.""",
+    """Cloud Solutions Architect
+About the role
+Help enterprise customers migrate workloads to Azure.
+Requirements
+- 7+ years of experience in IT infrastructure or software engineering
+- Azure certifications preferred
+- Excellent communication skills with technical and business audiences""",
+]
+
+SEED_NON_JOB_DESCRIPTIONS = [
+    "hello",
+    "Can you help me prepare for my interview tomorrow?",
+    "asdf qwerty test test 123",
+    """Chocolate chip cookies
+Ingredients: 2 cups flour, 1 cup butter, 1 cup sugar, 2 eggs, chocolate chips.
+Preheat the oven to 180C. Mix the butter and sugar, add eggs, fold in the flour
+and chips. Bake for 12 minutes until golden.""",
+    """The city council voted on Tuesday to expand the bike lane network downtown.
+Officials said construction will begin in the spring and last about six months.
+Local businesses expressed mixed reactions to the plan.""",
+    """def fibonacci(n):
+    if n < 2:
+        return n
+    return fibonacci(n - 1) + fibonacci(n - 2)
+print(fibonacci(10))""",
+    """Dear team, the quarterly all-hands meeting is moved to Thursday at 3pm.
+Please update your calendars and send agenda items to the office manager.""",
+    """The Great Barrier Reef is the world's largest coral reef system, composed
+of over 2,900 individual reefs stretching for over 2,300 kilometres off the
+coast of Queensland, Australia.""",
+    "What is the difference between a process and a thread?",
+    """Once upon a time a fox lived at the edge of a forest. Every morning it
+walked to the river, watched the fish and dreamed of catching one.""",
+    """Terms of service: by using this website you agree to the collection of
+cookies. We may update these terms at any time without notice.""",
+    "Write me a poem about the ocean and the moon.",
+]
+
+
+def tokens(text: str) -> List[str]:
+    words = _WORD.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:], strict=False)]
+
+
+def header_count(text: str) -> int:
+    """Number of distinct job posting section headers such as "Requirements"."""
+    return len({m.strip(" #:").lower() for m in _HEADERS.findall(text)})
+
+
+def features(text: str) -> np.ndarray:
+    """Hashed log term frequencies plus header and job-phrase counts."""
+    words = tokens(text)
+    # Built-in string hashes are salted per process, which is fine because
+    # the model is trained in the process that uses it
+    hashed = np.fromiter(map(hash, words), dtype=np.int64, count=len(words))
+    vector = np.bincount(hashed % NUM_FEATURES, minlength=NUM_FEATURES + 2)
+    vector = vector.astype(np.float64)
+    np.log1p(vector, out=vector)
+    norm = np.linalg.norm(vector)
+    if norm:
+        vector /= norm
+    vector[NUM_FEATURES] = min(header_count(text), 4) / 4
+    vector[NUM_FEATURES + 1] = min(len(_JOB_PHRASES.findall(text.lower())), 4) / 4
+    return vector
+
+
+class LinearClassifier:
+    """L2-regularized logistic regression trained by gradient descent."""
+
+    def __init__(self, weights: np.ndarray, bias: float) -> None:
+        self.weights = weights
+        self.bias = bias
+
+    @classmethod
+    def train(
+        cls,
+        positives: Sequence[str],
+        negatives: Sequence[str],
+        epochs: int = 300,
+        learning_rate: float = 1.0,
+        l2: float = 1e-3,
+    ) -> LinearClassifier:
+        x = np.stack([features(t) for t in [*positives, *negatives]])
+        y = np.array([1.0] * len(positives) + [0.0] * len(negatives))
+        weights = np.zeros(x.shape[1])
+        bias = 0.0
+        for _ in range(epochs):
+            p = 1 / (1 + np.exp(-(x @ weights + bias)))
+            error = p - y
+            weights -= learning_rate * (x.T @ error / len(y) + l2 * weights)
+            bias -= learning_rate * float(error.mean())
+        return cls(weights, bias)
+
+    def probability(self, text: str) -> float:
+        return float(1 / (1 + np.exp(-(features(text) @ self.weights + self.bias))))
+
+
+@dataclass
+class ValidationStats:
+    """How many validations were decided locally or sent to the LLM."""
+
+    fast_valid: int = 0
+    fast_invalid: int = 0
+    escalated: int = 0
+
+    @property
+    def fast_path_share(self) -> float:
+        total = self.fast_valid + self.fast_invalid + self.escalated
+        return (self.fast_valid + self.fast_invalid) / total if total else 0.0
+
+
+class JobDescriptionClassifier:
+    """Decides clear cases locally and returns ``None`` for ambiguous ones.
+
+    A text is accepted when it has at least ``min_headers`` posting section
+    headers and the model is confident it is a posting; it is rejected when
+    it has no headers, no job phrases, no role words and the model is
+    confident it is not.
+    """
+
+    def __init__(
+        self,
+        model: LinearClassifier,
+        accept_threshold: float = 0.75,
+        reject_threshold: float = 0.1,
+        min_headers: int = 2,
+    ) -> None:
+        self.model = model
+        self.accept_threshold = accept_threshold
+        self.reject_threshold = reject_threshold
+        self.min_headers = min_headers
+        self.stats = ValidationStats()
+
+    def classify(self, text: str) -> Optional[str]:
+        """Return "valid", "invalid", or ``None`` when the LLM should decide."""
+        probability = self.model.probability(text)
+        headers = header_count(text)
+        if headers >= self.min_headers and probability >= self.accept_threshold:
+            self.stats.fast_valid += 1
+            return "valid"
+        if (
+            headers == 0
+            and not _JOB_PHRASES.search(text.lower())
+            and not _ROLE_WORDS.search(text)
+            and probability <= self.reject_threshold
+        ):
+            self.stats.fast_invalid += 1
+            return "invalid"
+        self.stats.escalated += 1
+        return None
+
+
+_classifier: Optional[JobDescriptionClassifier] = None
+_classifier_lock = threading.Lock()
+
+
+def get_job_description_classifier() -> JobDescriptionClassifier:
+    """Return the process-wide classifier, training it on the seed data once."""
+    global _classifier
+    with _classifier_lock:
+        if _classifier is None:
+            model = LinearClassifier.train(
+                SEED_JOB_DESCRIPTIONS, SEED_NON_JOB_DESCRIPTIONS
+            )
+            _classifier = JobDescriptionClassifier(model)
+        return _classifier
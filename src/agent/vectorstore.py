@@ -0,0 +1,224 @@
+"""Vector indexes used for retrieval from the reference book corpus."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+from typing import Any, Dict, List, Optional, Protocol, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from pinecone import PineconeAsyncio
+
+from agent.configuration import Configuration
+
+Match = Dict[str, Any]
+
+
+class VectorIndex(Protocol):
+    async def query_many(
+        self, vectors: Sequence[Sequence[float]], top_k: int
+    ) -> List[List[Match]]:
+        """Return the ``top_k`` matches (id, score, metadata) for each vector."""
+        ...
+
+
+class LocalVectorIndex:
+    """In-process cosine-similarity index backed by a NumPy matrix.
+
+    Drop-in replacement for the Pinecone index for offline runs and tests.
+    """
+
+    def __init__(self, dimension: int) -> None:
+        self.dimension = dimension
+        self.ids: List[str] = []
+        self.metadata: List[Dict[str, Any]] = []
+        self._vectors = np.zeros((0, dimension), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def upsert(
+        self,
+        ids: Sequence[str],
+        vectors: Sequence[Sequence[float]],
+        metadata: Sequence[Dict[str, Any]],
+    ) -> None:
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dimension)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        self._vectors = np.vstack([self._vectors, matrix / np.maximum(norms, 1e-12)])
+        self.ids.extend(ids)
+        self.metadata.extend(metadata)
+
+    def query(self, vectors: Sequence[Sequence[float]], top_k: int) -> List[List[Match]]:
+        """Score every query vector against the index with one matrix product."""
+        if not self.ids:
+            return [[] for _ in vectors]
+        queries = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dimension)
+        queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+        scores = queries @ self._vectors.T
+        k = min(top_k, len(self.ids))
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for row, candidates in zip(scores, top, strict=True):
+            ordered = candidates[np.argsort(-row[candidates])]
+            results.append(
+                [
+                    {
+                        "id": self.ids[i],
+                        "score": float(row[i]),
+                        "metadata": self.metadata[i],
+                    }
+                    for i in ordered
+                ]
+            )
+        return results
+
+    async def query_many(
+        self, vectors: Sequence[Sequence[float]], top_k: int
+    ) -> List[List[Match]]:
+        return await asyncio.to_thread(self.query, vectors, top_k)
+
+    def save(self, path: str) -> None:
+        np.savez_compressed(
+            path,
+            vectors=self._vectors,
+            ids=np.asarray(self.ids),
+            metadata=np.asarray([json.dumps(m) for m in self.metadata]),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> LocalVectorIndex:
+        data = np.load(path)
+        index = cls(data["vectors"].shape[1])
+        index._vectors = data["vectors"]
+        index.ids = [str(i) for i in data["ids"]]
+        index.metadata = [json.loads(m) for m in data["metadata"]]
+        return index
+
+
+class PineconeVectorIndex:
+    """Pinecone index queried concurrently through the asyncio client.
+
+    The index host is looked up once and the client session is kept open
+    for later queries until ``close`` is called.
+    """
+
+    def __init__(self, index_name: str, api_key: Optional[str] = None) -> None:
+        self.index_name = index_name
+        self.api_key = api_key or os.getenv("PINECONE_API_KEY")
+        self._client: Optional[PineconeAsyncio] = None
+        self._index: Any = None
+        self._lock = asyncio.Lock()
+
+    async def _get_index(self) -> Any:
+        async with self._lock:
+            if self._index is None:
+                self._client = PineconeAsyncio(api_key=self.api_key)
+                host = (await self._client.describe_index(self.index_name)).host
+                self._index = self._client.IndexAsyncio(host=host)
+            return self._index
+
+    async def close(self) -> None:
+        if self._index is not None:
+            await self._index.close()
+        if self._client is not None:
+            await self._client.close()
+        self._index = self._client = None
+
+    async def query_many(
+        self, vectors: Sequence[Sequence[float]], top_k: int
+    ) -> List[List[Match]]:
+        index = await self._get_index()
+        responses = await asyncio.gather(
+            *(
+                index.query(vector=list(vector), top_k=top_k, include_metadata=True)
+                for vector in vectors
+            )
+        )
+        return [
+            [
+                {"id": m.id, "score": m.score, "metadata": m.metadata or {}}
+                for m in response.matches
+            ]
+            for response in responses
+        ]
+
+
+def build_local_index(
+    documents: Sequence[Dict[str, Any]], embeddings: Embeddings, path: str
+) -> LocalVectorIndex:
+    """Embed ``documents`` and save them as a local index at ``path``.
+
+    Each document needs a ``text`` and may carry a ``title`` and ``author``;
+    all of it is kept as the match metadata.
+    """
+    vectors = embeddings.embed_documents([d["text"] for d in documents])
+    index = LocalVectorIndex(len(vectors[0]) if vectors else 0)
+    index.upsert([str(i) for i in range(len(documents))], vectors, documents)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # np.savez_compressed appends .npz unless the path already ends with it
+    index.save(path)
+    return index
+
+
+_local_indexes: Dict[str, LocalVectorIndex] = {}
+_missing_local_indexes: set = set()
+_pinecone_indexes: Dict[str, PineconeVectorIndex] = {}
+
+
+def get_vector_index(config: Configuration) -> Optional[VectorIndex]:
+    """Return the retrieval backend selected by ``config.rag_backend``.
+
+    A local backend whose index file has not been built yet is skipped with
+    a warning, so sections are written from the web results alone.
+    """
+    if config.rag_backend == "pinecone":
+        name = config.pinecone_index
+        if name not in _pinecone_indexes:
+            _pinecone_indexes[name] = PineconeVectorIndex(name)
+        return _pinecone_indexes[name]
+    if config.rag_backend == "local":
+        path = config.local_index_path
+        if path not in _local_indexes:
+            if not os.path.exists(path):
+                if path not in _missing_local_indexes:
+                    _missing_local_indexes.add(path)
+                    print(
+                        f"Warning: no local index at {path}, using web results "
+                        "only. Build one with python -m agent.vectorstore"
+                    )
+                return None
+            _local_indexes[path] = LocalVectorIndex.load(path)
+        return _local_indexes[path]
+    return None
+
+
+async def close_vector_indexes() -> None:
+    """Close the shared Pinecone sessions, e.g. on app shutdown."""
+    for index in _pinecone_indexes.values():
+        await index.close()
+
+
+def main() -> None:
+    """Build the local index from a JSON lines file of reference passages."""
+    from agent.embeddings import get_embedding_service
+
+    config = Configuration()
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("corpus", help="JSON lines with text, title and author")
+    parser.add_argument("--output", default=config.local_index_path)
+    args = parser.parse_args()
+    with open(args.corpus) as f:
+        documents = [json.loads(line) for line in f if line.strip()]
+    embeddings = get_embedding_service(config.embedding_model)
+    index = build_local_index(documents, embeddings, args.output)
+    print(f"Indexed {len(index)} passages into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
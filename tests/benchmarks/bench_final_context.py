@@ -0,0 +1,111 @@
+"""Benchmark the context sent to the introduction, roadmap and conclusion writers.
+
+Builds a report of research sections the size the section writer is asked
+for (400-500 words, a table, three questions and sources) and formats the
+final writer prompts with the full sections and with their digests.
+
+    python tests/benchmarks/bench_final_context.py
+"""
+import importlib
+import time
+
+from agent.context import count_tokens
+from agent.prompts import final_section_writer_instructions
+from agent.state import Section
+
+graph_module = importlib.import_module("agent.graph")
+
+NUM_RESEARCH_SECTIONS = 6
+FINAL_SECTIONS = ["Introduction", "Roadmap", "Conclusion/Summary"]
+REPEATS = 20
+
+
+def research_section(i: int) -> Section:
+    prose = " ".join(
+        [f"Skill {i} matters because production systems depend on it every day [1]."]
+        * 10
+    )
+    content = f"""## Skill {i}
+
+{prose}
+
+### How skill {i} works
+
+{prose}
+
+### Common pitfalls
+
+{prose}
+
+| Concept | Description | When to use |
+|---------|-------------|-------------|
+| **Concept {i}a** | What it does and why it matters | Small services |
+| **Concept {i}b** | What it does and why it matters | Large systems |
+| **Concept {i}c** | What it does and why it matters | Batch workloads |
+
+1. Which statement about skill {i} is true?
+   - A) It matters in production
+   - B) It never matters
+   Answer: A
+
+2. When is concept {i}b the better choice?
+   - A) Large systems
+   - B) Small scripts
+   Answer: A
+
+3. What does concept {i}c suit best?
+   - A) Batch workloads
+   - B) Nothing
+   Answer: A
+
+### Sources
+[1] Skill {i} guide: https://example.com/skill-{i}
+[2] Skill {i} reference: https://example.com/skill-{i}/reference
+"""
+    return Section(
+        name=f"Skill {i}",
+        description=f"Technical skill number {i}",
+        research=True,
+        content=content,
+    )
+
+
+def final_prompt_tokens(mode: str) -> None:
+    state = {
+        "completed_sections": [
+            research_section(i) for i in range(1, NUM_RESEARCH_SECTIONS + 1)
+        ],
+        "report_id": f"bench-{mode}",
+    }
+    config = {"configurable": {"final_context": mode}}
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        context = graph_module.collect_completed_sections(state, config)[
+            "report_sections_from_research"
+        ]
+    elapsed = (time.perf_counter() - start) / REPEATS
+    prompt_tokens = sum(
+        count_tokens(
+            final_section_writer_instructions.format(
+                topic="Backend engineer",
+                section_name=name,
+                section_topic=name,
+                context=context,
+            )
+        )
+        for name in FINAL_SECTIONS
+    )
+    print(
+        f"{mode:6}: {count_tokens(context)} context tokens, "
+        f"{prompt_tokens} prompt tokens across {len(FINAL_SECTIONS)} final writers, "
+        f"{elapsed * 1000:.2f} ms to build the context"
+    )
+
+
+def main() -> None:
+    for mode in ("full", "digest"):
+        final_prompt_tokens(mode)
+
+
+if __name__ == "__main__":
+    main()
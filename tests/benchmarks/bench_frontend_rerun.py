@@ -0,0 +1,65 @@
+"""Benchmark Streamlit rerun latency with a long chat history.
+
+Loads ``frontend/app.py`` (or the app passed on the command line) in
+Streamlit's headless test runner with 20 large reports in session state and
+times reruns, as triggered by any widget interaction.
+
+    python tests/benchmarks/bench_frontend_rerun.py [path/to/app.py]
+"""
+import os
+import statistics
+import sys
+import time
+
+from streamlit.testing.v1 import AppTest
+
+NUM_REPORTS = 20
+SECTIONS_PER_REPORT = 12
+RERUNS = 5
+
+
+def large_report(n: int) -> str:
+    lines = [f"# Interview Preparation Guide {n}"]
+    for s in range(SECTIONS_PER_REPORT):
+        lines.append(f"\n## Skill {s}\n")
+        lines.append("| Concept | Description | Importance |")
+        lines.append("|---------|-------------|------------|")
+        lines.extend(
+            f"| Concept {c} | Description of concept {c} for skill {s} | Required |"
+            for c in range(40)
+        )
+        for q in range(10):
+            lines.append(f"\n{q + 1}. Which statement about concept {q} is correct?")
+            lines.extend(f"   - {option}) Option {option}" for option in "ABCD")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    path = sys.argv[1] if len(sys.argv) > 1 else "frontend/app.py"
+    reports = [large_report(n) for n in range(NUM_REPORTS)]
+    app = AppTest.from_file(os.path.abspath(path), default_timeout=60)
+    app.session_state["messages"] = [
+        message
+        for n, report in enumerate(reports)
+        for message in (
+            {"role": "user", "content": f"Job description {n}"},
+            {"role": "assistant", "content": report, "is_markdown": True},
+        )
+    ]
+    app.session_state["research_document"] = reports[-1]
+    app.run()  # first run fills st.cache_data
+    timings = []
+    for _ in range(RERUNS):
+        start = time.perf_counter()
+        app.run()
+        timings.append(time.perf_counter() - start)
+    markdown_chars = sum(len(m.value) for m in app.markdown)
+    print(
+        f"{path}: {NUM_REPORTS} reports of {len(reports[0].splitlines())} lines, "
+        f"rerun median {statistics.median(timings) * 1000:.0f} ms, "
+        f"{markdown_chars / 1e6:.1f} MB of markdown sent"
+    )
+
+
+if __name__ == "__main__":
+    main()
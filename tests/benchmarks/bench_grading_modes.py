@@ -0,0 +1,112 @@
+"""Benchmark the separate and combined write-and-grade modes per section.
+
+Runs the section subgraph with stub models that take a fixed latency per
+call. Every section fails its first grade and passes its second, so each
+section is written twice. Prompt and output tokens are counted for every
+model call.
+
+    python tests/benchmarks/bench_grading_modes.py
+"""
+import asyncio
+import importlib
+import time
+from collections import Counter
+
+from langchain_core.messages import AIMessage
+
+from agent.context import count_tokens
+from agent.models import model_registry
+from agent.state import Feedback, Queries, SearchQuery, Section, SectionDraft
+from agent.testing import STUB_SECTION_CONTENT, StubChatModel, fake_search_response
+from agent.utils import unique_sources
+
+graph_module = importlib.import_module("agent.graph")
+
+LATENCY = 0.1
+NUM_SECTIONS = 8
+FOLLOW_UPS = [SearchQuery(search_query="follow up query")]
+
+
+class Responder:
+    """Fails each section's first grade and counts calls and tokens."""
+
+    def __init__(self) -> None:
+        self.graded = set()
+        self.calls = Counter()
+        self.tokens = Counter()
+
+    def __call__(self, schema, messages):
+        prompt = "\n".join(m.content for m in messages)
+        if schema is Queries:
+            response = Queries(queries=[SearchQuery(search_query="stub query")])
+        elif schema is Feedback:
+            section = prompt.split("<section topic>")[1].split("</section topic>")[0]
+            grade = "pass" if section in self.graded else "fail"
+            self.graded.add(section)
+            response = Feedback(grade=grade, follow_up_queries=FOLLOW_UPS)
+        elif schema is SectionDraft:
+            section = prompt.split("<Section topic>")[1].split("</Section topic>")[0]
+            grade = "pass" if section in self.graded else "fail"
+            self.graded.add(section)
+            response = SectionDraft(
+                content=STUB_SECTION_CONTENT, grade=grade, follow_up_queries=FOLLOW_UPS
+            )
+        else:
+            response = AIMessage(content=STUB_SECTION_CONTENT)
+        if schema is not Queries:
+            output = response.content if schema is None else response.model_dump_json()
+            self.calls["write/grade"] += 1
+            self.tokens["prompt"] += count_tokens(prompt)
+            self.tokens["output"] += count_tokens(output)
+        return response
+
+
+async def fake_search(query_list, max_depth, *args, **kwargs):
+    return unique_sources([fake_search_response(q, 2) for q in query_list])
+
+
+async def run_mode(mode: str) -> None:
+    responder = Responder()
+    model_registry.factory = lambda **kw: StubChatModel(
+        latency=LATENCY, responder=responder
+    )
+    model_registry.clear()
+    workflow = graph_module.section_workflow.compile()
+    config = {"configurable": {"grading_mode": mode, "max_search_depth": 3}}
+
+    async def one_section(i: int) -> float:
+        section = Section(
+            name=f"Skill {i}",
+            description=f"Technical skill number {i}",
+            research=True,
+            content="",
+        )
+        start = time.perf_counter()
+        await workflow.ainvoke(
+            {
+                "topic": "Backend engineer",
+                "report_id": f"bench-{mode}",
+                "section": section,
+                "search_iterations": 0,
+            },
+            config,
+        )
+        return time.perf_counter() - start
+
+    timings = await asyncio.gather(*(one_section(i) for i in range(NUM_SECTIONS)))
+    print(
+        f"{mode:8}: {sum(timings) / NUM_SECTIONS:.2f} s per section, "
+        f"{responder.calls['write/grade'] / NUM_SECTIONS:.1f} write/grade calls, "
+        f"{responder.tokens['prompt'] // NUM_SECTIONS} prompt + "
+        f"{responder.tokens['output'] // NUM_SECTIONS} output tokens per section"
+    )
+
+
+async def main() -> None:
+    graph_module.async_search = fake_search
+    for mode in ("separate", "combined"):
+        await run_mode(mode)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
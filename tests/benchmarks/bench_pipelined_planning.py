@@ -0,0 +1,81 @@
+"""Benchmark end-to-end report latency with sequential and pipelined planning.
+
+Runs the full report graph with stub models. The planner is the slow model
+and streams its plan over its whole latency; every other call takes a short
+fixed latency. Searches go through a provider that serves a few queries at
+a time, like a rate-limited search API.
+
+    python tests/benchmarks/bench_pipelined_planning.py
+"""
+import asyncio
+import importlib
+import time
+
+from agent.configuration import Configuration
+from agent.models import model_registry
+from agent.testing import StubChatModel, fake_search_response
+from agent.utils import unique_sources
+
+graph_module = importlib.import_module("agent.graph")
+
+PLANNER_LATENCY = 3.0
+LATENCY = 0.2
+NUM_RESEARCH_SECTIONS = 8
+NUMBER_OF_QUERIES = 5
+SEARCH_LATENCY = 0.1
+SEARCH_CONCURRENCY = 4
+RUNS = 3
+
+
+def stub_factory(model_provider: str, model: str) -> StubChatModel:
+    planner = model == Configuration().planner_model
+    return StubChatModel(
+        latency=PLANNER_LATENCY if planner else LATENCY,
+        num_research_sections=NUM_RESEARCH_SECTIONS,
+        num_queries=NUMBER_OF_QUERIES,
+    )
+
+
+def throttled_search():
+    limit = asyncio.Semaphore(SEARCH_CONCURRENCY)
+
+    async def search(query):
+        async with limit:
+            await asyncio.sleep(SEARCH_LATENCY)
+            return fake_search_response(query, 2)
+
+    async def fake_search(query_list, max_depth, *args, **kwargs):
+        responses = await asyncio.gather(*(search(q) for q in query_list))
+        return unique_sources(responses)
+
+    return fake_search
+
+
+async def run_mode(mode: str) -> None:
+    config = {
+        "configurable": {
+            "planning_mode": mode,
+            "number_of_queries": NUMBER_OF_QUERIES,
+            "search_cache_enabled": False,
+        }
+    }
+    timings = []
+    for _ in range(RUNS):
+        model_registry.clear()
+        graph_module.async_search = throttled_search()
+        start = time.perf_counter()
+        result = await graph_module.graph.ainvoke({"topic": "Backend engineer"}, config)
+        timings.append(time.perf_counter() - start)
+        assert result["final_report"].count("## Stub section") == NUM_RESEARCH_SECTIONS + 2
+    timings.sort()
+    print(f"{mode:10}: {timings[len(timings) // 2]:.2f} s end to end (median of {RUNS})")
+
+
+async def main() -> None:
+    model_registry.factory = stub_factory
+    for mode in ("sequential", "pipelined"):
+        await run_mode(mode)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
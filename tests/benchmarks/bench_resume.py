@@ -0,0 +1,103 @@
+"""Benchmark recovering from a failure injected late in a report run.
+
+Compares re-running the whole graph from scratch with resuming from the
+SQLite checkpoint, using stub models with a fixed latency per call.
+
+    python tests/benchmarks/bench_resume.py
+"""
+import asyncio
+import importlib
+import re
+import tempfile
+import time
+
+from agent.models import model_registry
+from agent.runs import open_checkpointer, run_report
+from agent.state import Queries, SearchQuery
+from agent.testing import StubChatModel, fake_search_response
+from agent.utils import unique_sources
+
+graph_module = importlib.import_module("agent.graph")
+
+LATENCY = 0.05
+NUM_SECTIONS = 8
+
+
+class Failure:
+    """Fails the writer of the last research section once.
+
+    The last section's searches are slower, so the failure lands after the
+    other sections have finished, as it would for a late network error.
+    """
+
+    def __init__(self) -> None:
+        self.armed = True
+        self.calls = 0
+
+    def __call__(self, schema, messages):
+        self.calls += 1
+        if (
+            self.armed
+            and schema is None
+            and f"Skill {NUM_SECTIONS}" in messages[-1].content
+        ):
+            self.armed = False
+            raise RuntimeError("injected failure")
+        prompt = "\n".join(m.content for m in messages)
+        skill = re.search(r"Technical skill number (\d+)", prompt)
+        if schema is Queries and skill:
+            return Queries(
+                queries=[
+                    SearchQuery(search_query=f"skill {skill.group(1)} query {i}")
+                    for i in range(3)
+                ]
+            )
+        return StubChatModel(num_research_sections=NUM_SECTIONS).default_response(
+            schema
+        )
+
+
+async def fake_search(query_list, max_depth, *args, **kwargs):
+    slow = any(q.startswith(f"skill {NUM_SECTIONS} ") for q in query_list)
+    await asyncio.sleep(LATENCY * (4 if slow else 1))
+    return unique_sources([fake_search_response(q, 1) for q in query_list])
+
+
+async def recover(graph, checkpointed: bool) -> tuple:
+    failure = Failure()
+    model_registry.factory = lambda **kw: StubChatModel(
+        latency=LATENCY, num_research_sections=NUM_SECTIONS, responder=failure
+    )
+    model_registry.clear()
+    try:
+        if checkpointed:
+            # Seed the failed attempt through run_report so its checkpoints
+            # carry the run id the resume looks them up by
+            await run_report(graph, "Backend engineer", "bench", max_attempts=1)
+        else:
+            await graph.ainvoke({"topic": "Backend engineer"})
+    except RuntimeError:
+        pass
+    calls_before = failure.calls
+    start = time.perf_counter()
+    if checkpointed:
+        await run_report(graph, "Backend engineer", "bench")
+    else:
+        await graph.ainvoke({"topic": "Backend engineer"})
+    return time.perf_counter() - start, failure.calls - calls_before
+
+
+async def main() -> None:
+    graph_module.async_search = fake_search
+    scratch_time, scratch_calls = await recover(graph_module.compile_graph(), False)
+    with tempfile.TemporaryDirectory() as tmp:
+        async with open_checkpointer(f"{tmp}/checkpoints.sqlite") as saver:
+            resume_time, resume_calls = await recover(
+                graph_module.compile_graph(saver), True
+            )
+    print(f"rerun from scratch : {scratch_time:.2f} s, {scratch_calls} LLM calls")
+    print(f"resume checkpoint  : {resume_time:.2f} s, {resume_calls} LLM calls")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
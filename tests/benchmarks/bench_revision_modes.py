@@ -0,0 +1,172 @@
+"""Benchmark the rewrite and delta revision modes per section.
+
+Runs the section subgraph with stub models. Every section fails its first
+two grades, so it is written once and revised twice. Each revision adds a
+subsection, a question and a source: in rewrite mode the writer returns the
+whole section again, in delta mode only the additions. Writer output tokens
+are counted per iteration. Delta mode is also run with combined grading, where
+the first draft grades itself but the revisions still need the grader.
+
+    python tests/benchmarks/bench_revision_modes.py
+"""
+import asyncio
+import importlib
+from collections import defaultdict
+
+from langchain_core.messages import AIMessage
+
+from agent.context import count_tokens
+from agent.models import model_registry
+from agent.state import (
+    Feedback,
+    Queries,
+    SearchQuery,
+    Section,
+    SectionDraft,
+    SectionEdit,
+    SectionRevision,
+)
+from agent.testing import STUB_SECTION_CONTENT, StubChatModel, fake_search_response
+from agent.utils import unique_sources
+
+graph_module = importlib.import_module("agent.graph")
+
+NUM_SECTIONS = 8
+MAX_SEARCH_DEPTH = 3
+FIRST_DRAFT = STUB_SECTION_CONTENT + "\n### Sources\n[1] Stub guide: https://example.com/1\n"
+
+
+def additions(iteration: int) -> list:
+    """Edits a revision makes: one subsection, one question and one source."""
+    subsection = f"### Detail {iteration}\n\n" + " ".join(
+        ["Extra explanation grounded in the new evidence for this gap."] * 8
+    )
+    question = (
+        f"{iteration + 3}. Which detail does revision {iteration} add?\n"
+        f"   - A) Detail {iteration}\n   - B) Nothing"
+    )
+    source = f"[{iteration + 1}] Follow-up source: https://example.com/{iteration + 1}"
+    return [
+        SectionEdit(kind="subsection", content=subsection),
+        SectionEdit(kind="questions", content=question),
+        SectionEdit(kind="sources", content=source),
+    ]
+
+
+def rewritten(iteration: int) -> str:
+    """Full section a rewrite produces after ``iteration`` revisions."""
+    body, sources = FIRST_DRAFT.split("### Sources")
+    edits = [edit for i in range(1, iteration + 1) for edit in additions(i)]
+    for edit in edits:
+        if edit.kind == "sources":
+            sources += edit.content + "\n"
+        else:
+            body += "\n" + edit.content + "\n"
+    return body + "### Sources" + sources
+
+
+class Responder:
+    """Fails each section until its last iteration and counts writer output."""
+
+    def __init__(self) -> None:
+        self.iterations = defaultdict(int)
+        self.grades = defaultdict(int)
+        self.output = defaultdict(list)
+        self.grader_calls = 0
+
+    def grade(self, section: str) -> str:
+        self.grades[section] += 1
+        return "pass" if self.grades[section] >= MAX_SEARCH_DEPTH else "fail"
+
+    def __call__(self, schema, messages):
+        prompt = "\n".join(m.content for m in messages)
+        section = prompt.split("<Section topic>")[-1].split("</Section topic>")[0]
+        if schema is Queries:
+            return Queries(queries=[SearchQuery(search_query="stub query")])
+        if schema is Feedback:
+            section = prompt.split("<section topic>")[1].split("</section topic>")[0]
+            self.grader_calls += 1
+            return Feedback(
+                grade=self.grade(section),
+                follow_up_queries=[SearchQuery(search_query="follow up query")],
+                missing=["a subsection and a question on the new evidence"],
+            )
+        iteration = self.iterations[section]
+        self.iterations[section] += 1
+        if schema is SectionRevision:
+            response = SectionRevision(edits=additions(iteration))
+            output = response.model_dump_json()
+        elif schema is SectionDraft:
+            response = SectionDraft(
+                content=rewritten(iteration),
+                grade=self.grade(section),
+                follow_up_queries=[SearchQuery(search_query="follow up query")],
+            )
+            output = response.model_dump_json()
+        else:
+            response = AIMessage(content=rewritten(iteration))
+            output = response.content
+        self.output[iteration].append(count_tokens(output))
+        return response
+
+
+async def fake_search(query_list, max_depth, *args, **kwargs):
+    return unique_sources([fake_search_response(q, 2) for q in query_list])
+
+
+async def run_mode(mode: str, grading: str = "separate") -> None:
+    responder = Responder()
+    model_registry.factory = lambda **kw: StubChatModel(responder=responder)
+    model_registry.clear()
+    workflow = graph_module.section_workflow.compile()
+    config = {
+        "configurable": {
+            "revision_mode": mode,
+            "grading_mode": grading,
+            "max_search_depth": MAX_SEARCH_DEPTH,
+        }
+    }
+    results = await asyncio.gather(
+        *(
+            workflow.ainvoke(
+                {
+                    "topic": "Backend engineer",
+                    "report_id": f"bench-{mode}",
+                    "section": Section(
+                        name=f"Skill {i}",
+                        description=f"Technical skill number {i}",
+                        research=True,
+                        content="",
+                    ),
+                    "search_iterations": 0,
+                },
+                config,
+            )
+            for i in range(NUM_SECTIONS)
+        )
+    )
+    per_iteration = ", ".join(
+        f"{sum(tokens) // len(tokens)}" for _, tokens in sorted(responder.output.items())
+    )
+    total = sum(map(sum, responder.output.values())) // NUM_SECTIONS
+    final = count_tokens(results[0]["completed_sections"][0].content)
+    print(
+        f"{mode:7} ({grading:8} grading): writer output tokens per iteration "
+        f"[{per_iteration}], {total} per section, final section {final} tokens, "
+        f"{responder.grader_calls / NUM_SECTIONS:.1f} grader calls per section"
+    )
+
+
+async def main() -> None:
+    graph_module.async_search = fake_search
+    for mode, grading in (
+        ("rewrite", "separate"),
+        ("delta", "separate"),
+        ("rewrite", "combined"),
+        ("delta", "combined"),
+    ):
+        await run_mode(mode, grading)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
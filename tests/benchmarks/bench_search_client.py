@@ -0,0 +1,80 @@
+"""Benchmark a shared keep-alive Tavily client against a client per search.
+
+Runs against a local HTTP stand-in for the Tavily API, so the numbers only
+include connection setup and client construction, not TLS or network latency.
+
+    python tests/benchmarks/bench_search_client.py
+"""
+import asyncio
+import json
+import time
+
+import httpx
+
+from agent.search_client import TavilySearchClient
+from agent.testing import fake_search_response
+
+NUM_SEARCHES = 200
+
+
+async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.decode("latin-1").split("\r\n"):
+                if line.lower().startswith("content-length:"):
+                    length = int(line.split(":", 1)[1])
+            payload = json.loads(await reader.readexactly(length))
+            body = json.dumps(
+                fake_search_response(payload["query"], payload["max_results"])
+            ).encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                b"Connection: keep-alive\r\n"
+                + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+
+async def per_search_clients(base_url: str) -> float:
+    """Old behaviour: a new ``httpx.AsyncClient`` for every search."""
+    start = time.perf_counter()
+    for i in range(NUM_SEARCHES):
+        async with httpx.AsyncClient(base_url=base_url) as client:
+            response = await client.post(
+                "/search", json={"query": f"query {i}", "max_results": 2}
+            )
+            response.json()
+    return time.perf_counter() - start
+
+
+async def shared_client(base_url: str) -> float:
+    client = TavilySearchClient(api_key="bench", base_url=base_url)
+    start = time.perf_counter()
+    for i in range(NUM_SEARCHES):
+        await client.search(f"query {i}", max_results=2)
+    elapsed = time.perf_counter() - start
+    await client.aclose()
+    return elapsed
+
+
+async def main() -> None:
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    host, port = server.sockets[0].getsockname()[:2]
+    base_url = f"http://{host}:{port}"
+    async with server:
+        fresh = await per_search_clients(base_url)
+        shared = await shared_client(base_url)
+    print(f"client per search : {fresh / NUM_SEARCHES * 1000:.2f} ms/search")
+    print(f"shared client     : {shared / NUM_SEARCHES * 1000:.2f} ms/search")
+    print(f"saved per search  : {(fresh - shared) / NUM_SEARCHES * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+"""Micro-benchmark of source formatting over synthetic search payloads.
+
+Compares the previous approach, which built the prompt with repeated string
+``+=``, against building ``Source`` records and rendering them in one pass.
+
+    python tests/benchmarks/bench_source_store.py
+"""
+import time
+import tracemalloc
+
+from agent.context import pack_sources
+from agent.testing import fake_search_response
+from agent.utils import unique_sources
+
+NUM_QUERIES = 30
+RESULTS_PER_QUERY = 5
+PAGE_CHARS = 60_000
+
+
+def synthetic_payloads() -> list:
+    payloads = []
+    for q in range(NUM_QUERIES):
+        response = fake_search_response(f"synthetic query {q}", RESULTS_PER_QUERY)
+        for result in response["results"]:
+            result["raw_content"] = (result["raw_content"] * 100)[:PAGE_CHARS]
+        payloads.append(response)
+    return payloads
+
+
+def legacy_format(search_results, max_tokens_per_source: int = 4000) -> str:
+    sources = []
+    for result in search_results:
+        sources.extend(result["results"])
+    unique_url_sources = {source["url"]: source for source in sources}
+    formatted_text = "Content from sources:\n"
+    for source in unique_url_sources.values():
+        formatted_text += f"{'='*80}\n"
+        formatted_text += f"Source: {source['title']}\n"
+        formatted_text += f"{'-'*80}\n"
+        formatted_text += f"URL: {source['url']}\n===\n"
+        formatted_text += f"Most relevant content from source: {source['content']}\n===\n"
+        raw_content = source.get("raw_content") or ""
+        char_limit = max_tokens_per_source * 4
+        if len(raw_content) > char_limit:
+            raw_content = raw_content[:char_limit] + "... [truncated]"
+        formatted_text += f"Full source content limited to {max_tokens_per_source} tokens: {raw_content}\n\n"
+        formatted_text += f"{'='*80}\n\n"
+    return formatted_text.strip()
+
+
+def measure(label: str, fn) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<32} {elapsed * 1000:8.1f} ms   peak {peak / 2**20:7.1f} MiB")
+
+
+def main() -> None:
+    payloads = synthetic_payloads()
+    sources = unique_sources(payloads)
+    pack_sources(sources[:1], 100)  # load the tokenizer outside the timings
+    measure("legacy += formatting", lambda: legacy_format(payloads))
+    measure("build Source records", lambda: unique_sources(payloads))
+    measure("render packed prompt (16k tok)", lambda: pack_sources(sources, 16000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+from agent.cache import ReportCache, SearchCache, SqliteCache, report_cache_key
+from agent.configuration import Configuration
+
+
+def test_search_cache_normalizes_queries(tmp_path) -> None:
+    cache = SearchCache(SqliteCache(str(tmp_path / "c.sqlite"), 60, 1 << 20))
+    cache.set("Python  Interview Questions", 2, "general", {"results": [1]})
+    assert cache.get("python interview questions", 2, "general") == {"results": [1]}
+    assert cache.get("python interview questions", 3, "general") is None
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_expired_entries_miss(tmp_path) -> None:
+    store = SqliteCache(str(tmp_path / "c.sqlite"), -1, 1 << 20)
+    store.set("k", {"v": 1})
+    assert store.get("k") is None
+
+
+def test_lru_eviction_by_size(tmp_path) -> None:
+    store = SqliteCache(str(tmp_path / "c.sqlite"), 60, 40)
+    store.set("old", {"v": "a"})
+    store.set("new", {"v": "b"})
+    store.get("new")
+    store.set("big", {"v": "x" * 10})
+    assert store.get("old") is None
+    assert store.get("new") == {"v": "b"}
+    assert store.stats.evictions == 1
+
+
+def test_report_cache_key_depends_on_jd_and_configuration(tmp_path) -> None:
+    config = Configuration()
+    key = report_cache_key("Backend  engineer\n Python", config)
+    assert key == report_cache_key("Backend engineer Python", config)
+    assert key != report_cache_key("Frontend engineer", config)
+    assert key != report_cache_key(
+        "Backend engineer Python", Configuration(writer_model="gpt-4o")
+    )
+
+    cache = ReportCache(SqliteCache(str(tmp_path / "r.sqlite"), 60, 1 << 20))
+    assert cache.get(key) is None
+    cache.set(key, "# Report")
+    assert cache.get(key)["final_report"] == "# Report"
+    assert cache.stats.hits == 1
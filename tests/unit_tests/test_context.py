@@ -0,0 +1,46 @@
+import pytest
+
+from agent import context
+from agent.context import (
+    ApproximateEncoding,
+    allocate_budget,
+    count_tokens,
+    get_encoding,
+    pack_sources,
+)
+from agent.testing import fake_search_response
+from agent.utils import unique_sources
+
+
+def test_allocate_budget_redistributes_unused_share() -> None:
+    allocation = allocate_budget([10, 1000, 1000], [1.0, 1.0, 2.0], 310)
+    assert allocation[0] == 10
+    assert allocation[2] == 2 * allocation[1]
+    assert sum(allocation) <= 310
+
+
+def test_pack_sources_respects_budget() -> None:
+    sources = unique_sources([fake_search_response("system design", 5)])
+    packed = pack_sources(sources, 600)
+    assert count_tokens(packed.text) <= 600 + 50
+    assert packed.packed_tokens <= 600
+    assert packed.dropped_tokens > 0
+    # The most relevant source is rendered first
+    assert sources[0].url in packed.text.split("URL: ")[1]
+
+
+def test_offline_tokenizer_falls_back_to_approximation(monkeypatch) -> None:
+    def offline(name):
+        raise ConnectionError("no network")
+
+    monkeypatch.setattr(context.tiktoken, "get_encoding", offline)
+    get_encoding.cache_clear()
+    try:
+        assert isinstance(get_encoding(), ApproximateEncoding)
+        # Programming errors are not mistaken for a missing download
+        monkeypatch.setattr(context.tiktoken, "get_encoding", lambda name: 1 / 0)
+        get_encoding.cache_clear()
+        with pytest.raises(ZeroDivisionError):
+            get_encoding()
+    finally:
+        get_encoding.cache_clear()
@@ -0,0 +1,53 @@
+from agent import dedup
+from agent.dedup import drop_near_duplicates
+from agent.sources import Source, content_hash
+
+ARTICLE = " ".join(
+    f"Binary search halves the interval at step {i} until the target is found."
+    for i in range(60)
+)
+
+
+def _source(url: str, text: str, score: float) -> Source:
+    return Source(url, url, "", text, score, content_hash(text))
+
+
+def test_mirrors_collapse_to_best_copy() -> None:
+    sources = [
+        _source("https://a.example/post", ARTICLE, 0.4),
+        _source("https://mirror.example/copy", ARTICLE + " Copied from a.example.", 0.9),
+        _source("https://b.example/other", "Hash maps give average O(1) lookups. " * 40, 0.5),
+    ]
+    result = drop_near_duplicates(sources, threshold=0.8)
+    assert [s.url for s in result.kept] == [
+        "https://mirror.example/copy",
+        "https://b.example/other",
+    ]
+    assert result.removed_bytes == len(ARTICLE)
+
+
+def test_distinct_pages_are_kept() -> None:
+    sources = [
+        _source(f"https://example.com/{i}", f"Topic {i} " + "word " * i * 10, 0.5)
+        for i in range(1, 6)
+    ]
+    assert len(drop_near_duplicates(sources, threshold=0.8).kept) == 5
+
+
+def test_exact_copies_share_one_signature(monkeypatch) -> None:
+    signed = []
+    signature = dedup.minhash_signature
+    monkeypatch.setattr(
+        dedup, "minhash_signature", lambda text: signed.append(text) or signature(text)
+    )
+    sources = [
+        _source("https://a.example/post", ARTICLE, 0.4),
+        _source("https://mirror.example/copy", ARTICLE, 0.9),
+        _source("https://b.example/other", "Hash maps give average O(1) lookups. " * 40, 0.5),
+    ]
+    result = drop_near_duplicates(sources, threshold=0.8)
+    assert [s.url for s in result.kept] == [
+        "https://mirror.example/copy",
+        "https://b.example/other",
+    ]
+    assert len(signed) == 2
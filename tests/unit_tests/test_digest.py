@@ -0,0 +1,75 @@
+import importlib
+
+import pytest
+
+from agent.digest import section_digest
+from agent.models import model_registry
+from agent.state import Section
+from agent.testing import StubChatModel, fake_search_response
+from agent.utils import unique_sources
+
+graph_module = importlib.import_module("agent.graph")
+
+KAFKA = """## Apache Kafka
+
+Apache Kafka is a distributed event streaming platform [1]. It stores records in partitioned logs.
+
+### Producers and consumers
+
+**Producers** write records and **consumer groups** share partitions.
+
+| Concept | Description |
+|---------|-------------|
+| **Topic** | Named stream of records |
+| Partition | Ordered log |
+
+1. What is a partition?
+   - A) An **ordered log**
+   - B) A table
+
+### Sources
+[1] Kafka docs: https://kafka.apache.org/documentation
+"""
+
+
+def test_section_digest_keeps_concepts_and_structure() -> None:
+    section = Section(name="Kafka", description="Kafka basics", research=True, content=KAFKA)
+
+    assert section_digest(section).splitlines() == [
+        "Section: Kafka",
+        "Description: Kafka basics",
+        "Summary: Apache Kafka is a distributed event streaming platform.",
+        "Subsections: Producers and consumers",
+        "Key concepts: Producers, consumer groups, Topic, Partition",
+        "Tables: Concept | Description",
+        "Multiple choice questions: 1",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_final_writers_get_digests(monkeypatch) -> None:
+    final_prompts = []
+
+    def responder(schema, messages):
+        if "<Available report content>" in messages[0].content:
+            final_prompts.append(messages[0].content)
+        return StubChatModel().default_response(schema)
+
+    async def fake_search(query_list, max_depth, *args, **kwargs):
+        return unique_sources([fake_search_response(q, 1) for q in query_list])
+
+    monkeypatch.setattr(
+        model_registry, "factory", lambda **kw: StubChatModel(responder=responder)
+    )
+    monkeypatch.setattr(graph_module, "async_search", fake_search)
+    model_registry.clear()
+
+    result = await graph_module.graph.ainvoke({"topic": "Backend engineer"})
+
+    # The introduction and conclusion see each research section's digest only
+    assert len(final_prompts) == 2
+    for prompt in final_prompts:
+        assert "Section: Skill 3" in prompt
+        assert "Filler text" not in prompt
+    # The final report still has the research sections in full
+    assert "Filler text" in result["final_report"]
@@ -0,0 +1,81 @@
+import asyncio
+import time
+
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from agent.embeddings import EmbeddingService
+
+
+class _RecordingEmbeddings(DeterministicFakeEmbedding):
+    calls: list = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return super().embed_documents(texts)
+
+
+def _service(**kwargs) -> tuple:
+    model = _RecordingEmbeddings(size=4, calls=[])
+    return EmbeddingService("fake", loader=lambda name: model, **kwargs), model
+
+
+def test_model_is_loaded_lazily() -> None:
+    loaded = []
+    sentinel = object()
+
+    def loader(name):
+        loaded.append(name)
+        return sentinel
+
+    service = EmbeddingService("fake", loader=loader)
+    assert loaded == []
+    assert service.model is sentinel
+    assert service.model is sentinel
+    assert loaded == ["fake"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_batch() -> None:
+    service, model = _service(linger_seconds=0.02)
+    results = await asyncio.gather(
+        service.aembed_documents(["a", "b"]),
+        service.aembed_documents(["b", "c"]),
+        service.aembed_query("d"),
+    )
+    assert len(model.calls) == 1
+    assert sorted(model.calls[0]) == ["a", "b", "c", "d"]
+    assert results[0][1] == results[1][0]
+
+
+class _SlowEmbeddings(DeterministicFakeEmbedding):
+    def embed_documents(self, texts):
+        if "fail" in texts:
+            raise RuntimeError("encoder failed")
+        time.sleep(0.05)
+        return super().embed_documents(texts)
+
+
+@pytest.mark.asyncio
+async def test_requests_during_a_batch_start_the_next_one() -> None:
+    model = _SlowEmbeddings(size=4)
+    service = EmbeddingService("fake", loader=lambda name: model, linger_seconds=0.005)
+    first = asyncio.ensure_future(service.aembed_query("a"))
+    await asyncio.sleep(0.02)
+    # The first batch is still encoding; this one must not wait for a third
+    second = await asyncio.wait_for(service.aembed_query("b"), timeout=1)
+    assert second == model.embed_query("b")
+    await first
+    with pytest.raises(RuntimeError, match="encoder failed"):
+        await service.aembed_query("fail")
+
+
+def test_cached_texts_are_not_encoded_again() -> None:
+    service, model = _service(cache_size=2)
+    service.embed_documents(["a", "b"])
+    service.embed_documents(["a", "b"])
+    assert len(model.calls) == 1
+    assert service.stats.cache_hits == 2
+    service.embed_documents(["c"])
+    service.embed_documents(["a"])
+    assert model.calls[-1] == ["a"]
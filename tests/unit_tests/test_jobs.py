@@ -0,0 +1,195 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from agent.jobs import JobManager, QueueFullError
+
+
+@pytest.mark.asyncio
+async def test_jobs_run_with_bounded_concurrency(tmp_path) -> None:
+    jobs = JobManager(str(tmp_path), max_concurrency=2, max_queue=8)
+    jobs.start()
+    running = []
+    peak = []
+
+    async def work(name):
+        running.append(name)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(name)
+        return f"# Report {name}"
+
+    submitted = [jobs.submit(f"jd-{i}", lambda job, i=i: work(i)) for i in range(5)]
+    finished = [await jobs.wait(job.id) for job in submitted]
+    await jobs.stop()
+
+    assert max(peak) == 2
+    assert [job.status for job in finished] == ["done"] * 5
+    assert jobs.report(submitted[3].id) == "# Report 3"
+    # Finished jobs are read back from their own files
+    assert JobManager(str(tmp_path)).get(submitted[3].id).status == "done"
+
+
+@pytest.mark.asyncio
+async def test_identical_jobs_share_one_run(tmp_path) -> None:
+    jobs = JobManager(str(tmp_path), max_concurrency=2, max_queue=8)
+    jobs.start()
+    calls = []
+
+    async def work(job):
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "# Report"
+
+    first = jobs.submit("jd", work)
+    second = jobs.submit("jd", work)
+    assert second.id == first.id
+    await jobs.wait(first.id)
+    # Once finished, the same key starts a new job
+    third = jobs.submit("jd", work)
+    await jobs.wait(third.id)
+    await jobs.stop()
+
+    assert third.id != first.id
+    assert len(calls) == 2
+    assert jobs.stats.deduplicated == 1
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_jobs(tmp_path) -> None:
+    jobs = JobManager(str(tmp_path), max_concurrency=1, max_queue=1)
+    jobs.start()
+    release = asyncio.Event()
+
+    async def work(job):
+        await release.wait()
+        return "# Report"
+
+    jobs.submit("jd-1", work)
+    await asyncio.sleep(0)  # the worker takes the first job off the queue
+    jobs.submit("jd-2", work)
+    with pytest.raises(QueueFullError):
+        jobs.submit("jd-3", work)
+    release.set()
+    await jobs.stop()
+    assert jobs.stats.rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_job_records_error(tmp_path) -> None:
+    jobs = JobManager(str(tmp_path))
+    jobs.start()
+
+    async def work(job):
+        raise RuntimeError("model unavailable")
+
+    job = await jobs.wait(jobs.submit("jd", work).id)
+    await jobs.stop()
+    assert job.status == "failed"
+    assert job.error == "model unavailable"
+    assert jobs.report(job.id) is None
+    assert jobs.get("../etc/passwd") is None
+
+
+@pytest.mark.asyncio
+async def test_stop_marks_unfinished_jobs_failed(tmp_path) -> None:
+    jobs = JobManager(str(tmp_path), max_concurrency=1, max_queue=4)
+    jobs.start()
+    started = asyncio.Event()
+
+    async def work(job):
+        started.set()
+        await asyncio.sleep(60)
+        return "# Report"
+
+    running = jobs.submit("jd-1", work)
+    queued = jobs.submit("jd-2", work)
+    await started.wait()
+    await jobs.stop()
+
+    restarted = JobManager(str(tmp_path))
+    for job in (running, queued):
+        assert restarted.get(job.id).status == "failed"
+        assert restarted.get(job.id).error
+
+
+def test_start_fails_jobs_left_by_a_dead_process(tmp_path) -> None:
+    (tmp_path / "abc123.json").write_text(
+        '{"id": "abc123", "key": "jd", "status": "running", "created_at": 1.0}'
+    )
+    jobs = JobManager(str(tmp_path))
+
+    async def start_and_stop():
+        jobs.start()
+        await jobs.stop()
+
+    asyncio.run(start_and_stop())
+    assert jobs.get("abc123").status == "failed"
+
+
+@pytest.mark.asyncio
+async def test_subscribers_receive_every_event(tmp_path) -> None:
+    jobs = JobManager(str(tmp_path), max_concurrency=1, max_queue=4)
+    jobs.start()
+    release = asyncio.Event()
+
+    async def work(job):
+        jobs.publish(job.id, {"event": "plan", "data": {}})
+        await release.wait()
+        jobs.publish(job.id, {"event": "section", "data": {}})
+        return "# Report"
+
+    async def failing(job):
+        raise RuntimeError("search failed")
+
+    job = jobs.submit("jd", work)
+
+    async def collect():
+        return [e["event"] async for e in jobs.events(job.id)]
+
+    early = asyncio.create_task(collect())
+    await asyncio.sleep(0.01)
+    # A late subscriber still gets the events published before it joined
+    late = asyncio.create_task(collect())
+    await asyncio.sleep(0.01)
+    release.set()
+    assert await early == ["plan", "section"]
+    assert await late == ["plan", "section"]
+    finished = [e["event"] async for e in jobs.events(job.id)]
+    assert finished == ["report"]
+
+    failed = jobs.submit("jd-2", failing)
+    events = [e async for e in jobs.events(failed.id)]
+    await jobs.stop()
+    assert events == [{"event": "error", "data": {"detail": "search failed"}}]
+
+
+def test_cached_jobs_point_at_the_report_cache(tmp_path) -> None:
+    cache = {"jd": "# Cached report"}
+    jobs = JobManager(str(tmp_path), cached_report=cache.get)
+
+    job = jobs.add_finished("jd")
+
+    assert jobs.report(job.id) == "# Cached report"
+    assert sorted(os.listdir(tmp_path)) == [f"{job.id}.json"]
+
+
+@pytest.mark.asyncio
+async def test_expired_job_files_are_pruned(tmp_path) -> None:
+    jobs = JobManager(str(tmp_path), ttl_seconds=60)
+    jobs.start()
+    old = jobs.submit("old", lambda job: asyncio.sleep(0, "# Old"))
+    await jobs.wait(old.id)
+    recent = jobs.add_finished("recent")
+    past = time.time() - 120
+    for extension in ("json", "md"):
+        os.utime(tmp_path / f"{old.id}.{extension}", (past, past))
+
+    assert jobs.prune() == 1
+    await jobs.stop()
+
+    assert jobs.get(old.id) is None
+    assert jobs.report(old.id) is None
+    assert jobs.get(recent.id).status == "done"
@@ -0,0 +1,37 @@
+from agent.models import ModelRegistry
+from agent.state import Queries
+
+
+class _CountingModel:
+    def with_structured_output(self, schema):
+        return (self, schema)
+
+    def bind_tools(self, tools, tool_choice):
+        return (self, tools, tool_choice)
+
+
+def test_registry_reuses_clients() -> None:
+    built = []
+
+    def factory(**kwargs):
+        built.append(kwargs)
+        return _CountingModel()
+
+    registry = ModelRegistry(factory=factory)
+    writer = registry.get("openai", "gpt-4o-mini")
+    assert registry.get("openai", "gpt-4o-mini") is writer
+    structured = registry.get_structured("openai", "gpt-4o-mini", Queries)
+    assert registry.get_structured("openai", "gpt-4o-mini", Queries) is structured
+    assert structured[0] is writer
+    assert len(built) == 1
+    assert registry.stats.hits == 2
+    assert registry.stats.misses == 2
+
+
+def test_registry_reuses_tool_bindings() -> None:
+    registry = ModelRegistry(factory=lambda **kwargs: _CountingModel())
+    planner = registry.get_tool_caller("openai", "gpt-4o", Queries)
+    assert registry.get_tool_caller("openai", "gpt-4o", Queries) is planner
+    assert planner[1:] == ([Queries], "Queries")
+    assert planner[0] is registry.get("openai", "gpt-4o")
+    assert registry.get_structured("openai", "gpt-4o", Queries) is not planner
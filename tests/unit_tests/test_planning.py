@@ -0,0 +1,115 @@
+import importlib
+from collections import Counter
+
+import pytest
+
+from agent.models import model_registry
+from agent.planning import stream_sections
+from agent.runs import open_checkpointer, stream_report
+from agent.state import Sections
+from agent.testing import StubChatModel, default_sections, fake_search_response
+from agent.utils import unique_sources
+
+graph_module = importlib.import_module("agent.graph")
+
+
+class CountingPlanner:
+    """Stub planner that records how many chunks it has streamed."""
+
+    def __init__(self) -> None:
+        self.model = StubChatModel(num_research_sections=4).bind_tools([Sections])
+        self.chunks = 0
+
+    async def astream(self, messages):
+        async for chunk in self.model.astream(messages):
+            self.chunks += 1
+            yield chunk
+
+
+@pytest.mark.asyncio
+async def test_stream_sections_yields_sections_before_plan_ends() -> None:
+    planner = CountingPlanner()
+    seen = []
+    async for section in stream_sections(planner, []):
+        seen.append((section, planner.chunks))
+
+    assert [s for s, _ in seen] == default_sections(4).sections
+    total = planner.chunks
+    # Every section but the last is handed over while the plan still streams
+    assert all(chunks < total for _, chunks in seen[:-1])
+    assert seen[0][1] < total / 2
+
+
+@pytest.mark.asyncio
+async def test_pipelined_planning_researches_during_planning(monkeypatch, tmp_path) -> None:
+    async def fake_search(query_list, max_depth, *args, **kwargs):
+        return unique_sources([fake_search_response(q, 1) for q in query_list])
+
+    monkeypatch.setattr(
+        model_registry,
+        "factory",
+        lambda **kw: StubChatModel(latency=0.01, num_research_sections=3),
+    )
+    monkeypatch.setattr(graph_module, "async_search", fake_search)
+    model_registry.clear()
+
+    async with open_checkpointer(str(tmp_path / "checkpoints.sqlite")) as saver:
+        graph = graph_module.compile_graph(saver)
+        events = [
+            e
+            async for e in stream_report(
+                graph, "Backend engineer", configurable={"planning_mode": "pipelined"}
+            )
+        ]
+
+    names = [e["event"] for e in events]
+    # The research sections finish inside the planning node, then the
+    # introduction and conclusion are written as before
+    assert names == ["validation", "plan"] + ["section"] * 5 + ["report"]
+    researched = {e["data"]["name"] for e in events[2:5]}
+    assert researched == {"Skill 1", "Skill 2", "Skill 3"}
+    report = events[-1]["data"]["final_report"]
+    assert report.count("## Stub section") == 5
+
+
+@pytest.mark.asyncio
+async def test_failed_pipelined_section_is_retried_after_planning(monkeypatch, tmp_path) -> None:
+    calls = Counter()
+    failed = []
+
+    def responder(schema, messages):
+        if schema is None and "Skill 2" in messages[-1].content and not failed:
+            failed.append(True)
+            raise RuntimeError("injected writer failure")
+        calls[schema.__name__ if schema else "writer"] += 1
+        return StubChatModel(num_research_sections=3).default_response(schema)
+
+    async def fake_search(query_list, max_depth, *args, **kwargs):
+        return unique_sources([fake_search_response(q, 1) for q in query_list])
+
+    monkeypatch.setattr(
+        model_registry,
+        "factory",
+        lambda **kw: StubChatModel(num_research_sections=3, responder=responder),
+    )
+    monkeypatch.setattr(graph_module, "async_search", fake_search)
+    model_registry.clear()
+
+    async with open_checkpointer(str(tmp_path / "checkpoints.sqlite")) as saver:
+        graph = graph_module.compile_graph(saver)
+        events = [
+            e
+            async for e in stream_report(
+                graph,
+                "Backend engineer",
+                configurable={"planning_mode": "pipelined"},
+                max_attempts=1,
+            )
+        ]
+
+    assert failed == [True]
+    # The plan and the other sections are not redone for the failed section
+    assert calls["Sections"] == 1
+    assert calls["Queries"] == 1 + 3 + 1
+    assert calls["writer"] == 3 + 2
+    assert events[-1]["data"]["final_report"].count("## Stub section") == 5
@@ -0,0 +1,100 @@
+import asyncio
+import importlib
+
+import pytest
+
+from agent import query_registry
+from agent.models import model_registry
+from agent.query_registry import (
+    QueryRegistry,
+    get_query_registry,
+    release_query_registry,
+)
+from agent.testing import StubChatModel, fake_search_response
+from agent.utils import unique_sources
+
+graph_module = importlib.import_module("agent.graph")
+
+
+@pytest.mark.asyncio
+async def test_duplicate_queries_share_one_search() -> None:
+    registry = QueryRegistry(similarity_threshold=0.8)
+    calls = []
+
+    async def run(query):
+        calls.append(query)
+        await asyncio.sleep(0.01)
+        return {"query": query}
+
+    queries = [
+        "Python decorators interview questions",
+        "python decorators interview questions?",
+        "interview questions python decorators",
+        "SQL window functions tutorial",
+    ]
+    results = await asyncio.gather(
+        *(registry.search(q, (2, "general"), lambda q=q: run(q)) for q in queries)
+    )
+    assert len(calls) == 2
+    assert results[1] == results[0]
+    assert results[2] == results[0]
+    assert registry.searches_saved == 2
+
+
+@pytest.mark.asyncio
+async def test_different_search_params_are_not_shared() -> None:
+    registry = QueryRegistry()
+
+    async def run():
+        return {}
+
+    await registry.search("kafka basics", (2, "general"), run)
+    await registry.search("kafka basics", (5, "general"), run)
+    assert registry.searches_saved == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_search_is_run_again() -> None:
+    registry = QueryRegistry()
+    attempts = []
+
+    async def run():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise TimeoutError("search timed out")
+        return {"ok": True}
+
+    with pytest.raises(TimeoutError):
+        await registry.search("kafka basics", (2, "general"), run)
+    assert await registry.search("kafka basics", (2, "general"), run) == {"ok": True}
+    assert await registry.search("Kafka basics?", (2, "general"), run) == {"ok": True}
+    assert len(attempts) == 2
+
+
+def test_idle_registries_expire() -> None:
+    stale = get_query_registry("stale-report")
+    stale.last_used -= query_registry.REGISTRY_IDLE_SECONDS + 1
+    fresh = get_query_registry("fresh-report")
+
+    assert get_query_registry("fresh-report") is fresh
+    assert get_query_registry("stale-report") is not stale
+    release_query_registry("fresh-report")
+    release_query_registry("stale-report")
+
+
+@pytest.mark.asyncio
+async def test_retried_planning_keeps_the_report_id(monkeypatch) -> None:
+    async def fake_search(query_list, max_depth, *args, **kwargs):
+        return unique_sources([fake_search_response(q, 1) for q in query_list])
+
+    monkeypatch.setattr(model_registry, "factory", lambda **kw: StubChatModel())
+    monkeypatch.setattr(graph_module, "async_search", fake_search)
+    model_registry.clear()
+    config = {"configurable": {"thread_id": "run-1"}}
+
+    first = await graph_module.planning_node({"topic": "Backend engineer"}, config)
+    retried = await graph_module.planning_node({"topic": "Backend engineer"}, config)
+
+    # The retry finds the registry of the first attempt
+    assert first["report_id"] == retried["report_id"] == "run-1"
+    release_query_registry("run-1")
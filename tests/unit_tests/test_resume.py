@@ -0,0 +1,127 @@
+import importlib
+from collections import Counter
+
+import pytest
+
+from agent.models import model_registry
+from agent.runs import (
+    latest_thread,
+    open_checkpointer,
+    prepare_run,
+    run_report,
+)
+from agent.testing import StubChatModel, fake_search_response
+from agent.utils import unique_sources
+
+graph_module = importlib.import_module("agent.graph")
+
+
+@pytest.mark.asyncio
+async def test_resume_skips_finished_work(monkeypatch, tmp_path) -> None:
+    calls = Counter()
+    failed = []
+
+    def responder(schema, messages):
+        prompt = messages[-1].content
+        if schema is None and "Skill 3" in prompt and not failed:
+            failed.append(True)
+            raise RuntimeError("injected writer failure")
+        calls[schema.__name__ if schema else "writer"] += 1
+        return StubChatModel(num_research_sections=4).default_response(schema)
+
+    async def fake_search(query_list, max_depth, *args, **kwargs):
+        return unique_sources([fake_search_response(q, 1) for q in query_list])
+
+    monkeypatch.setattr(
+        model_registry,
+        "factory",
+        lambda **kw: StubChatModel(num_research_sections=4, responder=responder),
+    )
+    monkeypatch.setattr(graph_module, "async_search", fake_search)
+    model_registry.clear()
+
+    async with open_checkpointer(str(tmp_path / "checkpoints.sqlite")) as saver:
+        graph = graph_module.compile_graph(saver)
+        result = await run_report(graph, "Backend engineer", "run-1", max_attempts=2)
+
+    assert result["final_report"]
+    assert failed == [True]
+    # Planning ran once and every research section was written exactly once
+    assert calls["Sections"] == 1
+    assert calls["Queries"] == 1 + 4
+    assert calls["writer"] == 4 + 2
+
+
+@pytest.mark.asyncio
+async def test_failed_run_resumes_on_next_call(monkeypatch, tmp_path) -> None:
+    calls = Counter()
+    failed = []
+
+    def responder(schema, messages):
+        prompt = messages[-1].content
+        if schema is None and "Skill 3" in prompt and not failed:
+            failed.append(True)
+            raise RuntimeError("injected writer failure")
+        calls[schema.__name__ if schema else "writer"] += 1
+        return StubChatModel(num_research_sections=4).default_response(schema)
+
+    async def fake_search(query_list, max_depth, *args, **kwargs):
+        return unique_sources([fake_search_response(q, 1) for q in query_list])
+
+    monkeypatch.setattr(
+        model_registry,
+        "factory",
+        lambda **kw: StubChatModel(num_research_sections=4, responder=responder),
+    )
+    monkeypatch.setattr(graph_module, "async_search", fake_search)
+    model_registry.clear()
+
+    async with open_checkpointer(str(tmp_path / "checkpoints.sqlite")) as saver:
+        graph = graph_module.compile_graph(saver)
+        with pytest.raises(RuntimeError):
+            await run_report(graph, "Backend engineer", max_attempts=1)
+        failed_run = sum(calls.values())
+        # A later request for the same job description picks up the failed run
+        result = await run_report(graph, "Backend engineer", max_attempts=1)
+
+    assert result["final_report"]
+    assert calls["Sections"] == 1
+    assert calls["writer"] == 4 + 2
+    # The resumed run only finishes the missing work
+    assert sum(calls.values()) - failed_run < failed_run
+
+
+@pytest.mark.asyncio
+async def test_finished_run_is_not_reused(monkeypatch, tmp_path) -> None:
+    calls = Counter()
+
+    def responder(schema, messages):
+        calls[schema.__name__ if schema else "writer"] += 1
+        return StubChatModel(num_research_sections=3).default_response(schema)
+
+    async def fake_search(query_list, max_depth, *args, **kwargs):
+        return unique_sources([fake_search_response(q, 1) for q in query_list])
+
+    monkeypatch.setattr(
+        model_registry,
+        "factory",
+        lambda **kw: StubChatModel(num_research_sections=3, responder=responder),
+    )
+    monkeypatch.setattr(graph_module, "async_search", fake_search)
+    model_registry.clear()
+
+    async with open_checkpointer(str(tmp_path / "checkpoints.sqlite")) as saver:
+        graph = graph_module.compile_graph(saver)
+        for _ in range(2):
+            result = await run_report(graph, "Backend engineer")
+            _, config = await prepare_run(graph, "Backend engineer")
+            thread_id = await latest_thread(graph, config["metadata"]["report_key"])
+            state = await graph.aget_state({"configurable": {"thread_id": thread_id}})
+            # Each run only holds its own sections
+            assert len(state.values["completed_sections"]) == 5
+
+    # The second run planned and researched every section again
+    assert calls["Sections"] == 2
+    assert calls["Queries"] == 2 * (1 + 3)
+    assert calls["writer"] == 2 * (3 + 2)
+    assert result["final_report"].count("## Stub section") == 5
@@ -0,0 +1,36 @@
+from agent.retrieval import BM25Index, select_passages, split_passages
+from agent.sources import Source, content_hash
+
+PAGE = "\n\n".join(
+    [
+        "Home | Blog | Pricing | Login",
+        "Kafka partitions split a topic so consumers in a group can read in parallel.",
+        "Subscribe to our newsletter for weekly updates.",
+        "Consumer offsets are committed per partition to track progress.",
+    ]
+)
+
+
+def test_split_passages_respects_size() -> None:
+    passages = split_passages("word " * 1000, max_chars=300)
+    assert all(len(p) <= 300 for p in passages)
+    assert len(passages) > 10
+
+
+def test_bm25_prefers_matching_passage() -> None:
+    index = BM25Index(["kafka partitions and consumers", "pricing and login"])
+    scores = index.score("kafka consumer partitions")
+    assert scores[0] > scores[1] == 0
+
+
+def test_select_passages_drops_boilerplate() -> None:
+    source = Source("https://k.example", "Kafka", "", PAGE, 0.5, content_hash(PAGE))
+    selection = select_passages(
+        [source], ["Kafka partitions", "consumer offsets"], top_k=2, max_chars=80
+    )
+    text = selection.sources[0].raw_content
+    assert "partitions split a topic" in text
+    assert "offsets are committed" in text
+    assert "newsletter" not in text
+    assert selection.chars_after < selection.chars_before
+    assert selection.sources[0].content_hash == content_hash(text)
@@ -0,0 +1,182 @@
+import importlib
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from agent.models import model_registry
+from agent.revision import apply_revision, last_citation_number
+from agent.rubric import check_section, grading_stats
+from agent.state import (
+    Feedback,
+    Queries,
+    SearchQuery,
+    Section,
+    SectionDraft,
+    SectionEdit,
+    SectionRevision,
+)
+from agent.testing import STUB_SECTION_CONTENT, StubChatModel, fake_search_response
+from agent.utils import unique_sources
+
+graph_module = importlib.import_module("agent.graph")
+
+DRAFT = """## Kafka
+
+Kafka stores records in partitioned logs [1].
+
+| Concept | Description |
+|---------|-------------|
+| Topic | Named stream of records |
+
+1. What does Kafka store records in?
+   - A) Partitioned logs
+   - B) Tables
+   Answer: A
+
+### Sources
+[1] Kafka docs: https://kafka.apache.org/documentation
+"""
+
+
+def test_apply_revision_merges_edits_in_place() -> None:
+    revision = SectionRevision(
+        edits=[
+            SectionEdit(kind="subsection", content="### Consumer groups\n\nGroups share partitions [2]."),
+            SectionEdit(kind="table_rows", content="| Partition | Ordered log |"),
+            SectionEdit(
+                kind="questions",
+                content="2. What do consumer groups share?\n   - A) Partitions\n   - B) Brokers",
+            ),
+            SectionEdit(kind="sources", content="[2] Consumer guide: https://example.com/groups"),
+        ]
+    )
+
+    merged = apply_revision(DRAFT, revision)
+
+    lines = merged.splitlines()
+    assert lines.index("| Partition | Ordered log |") == lines.index("| Topic | Named stream of records |") + 1
+    assert merged.index("### Consumer groups") < merged.index("1. What does Kafka")
+    assert merged.index("   Answer: A") < merged.index("2. What do consumer groups")
+    assert merged.index("2. What do consumer groups") < merged.index("### Sources")
+    assert merged.rstrip().endswith("[2] Consumer guide: https://example.com/groups")
+    assert check_section(merged, min_words=0).questions == 2
+    assert last_citation_number(merged) == 2
+    # The original draft is kept verbatim around the insertions
+    assert "Kafka stores records in partitioned logs [1]." in merged
+
+
+def test_apply_revision_adds_missing_table_and_sources() -> None:
+    revision = SectionRevision(
+        edits=[
+            SectionEdit(kind="table_rows", content="| A | B |\n|---|---|\n| 1 | 2 |"),
+            SectionEdit(kind="sources", content="[1] Docs: https://example.com"),
+        ]
+    )
+
+    merged = apply_revision("## Title\n\nProse only.", revision)
+
+    assert check_section(merged).has_table
+    assert "### Sources\n[1] Docs: https://example.com" in merged
+
+
+@pytest.mark.asyncio
+async def test_delta_mode_revises_with_edits(monkeypatch) -> None:
+    calls = []
+    prompts = []
+    grades = iter(["fail", "pass"])
+
+    def responder(schema, messages):
+        calls.append(schema)
+        if schema is Queries:
+            return Queries(queries=[SearchQuery(search_query="kafka basics")])
+        if schema is Feedback:
+            return Feedback(
+                grade=next(grades),
+                follow_up_queries=[SearchQuery(search_query="kafka follow up")],
+                missing=["no question on consumer groups"],
+            )
+        if schema is SectionRevision:
+            prompts.append(messages[0].content)
+            return SectionRevision(
+                edits=[
+                    SectionEdit(
+                        kind="questions",
+                        content="4. What do consumer groups share?\n   - A) Partitions\n   - B) Brokers",
+                    )
+                ]
+            )
+        return AIMessage(content=STUB_SECTION_CONTENT)
+
+    async def fake_search(query_list, max_depth, *args, **kwargs):
+        return unique_sources([fake_search_response(q, 1) for q in query_list])
+
+    monkeypatch.setattr(
+        model_registry, "factory", lambda **kw: StubChatModel(responder=responder)
+    )
+    monkeypatch.setattr(graph_module, "async_search", fake_search)
+    model_registry.clear()
+
+    section = Section(name="Kafka", description="Kafka", research=True, content="")
+    result = await graph_module.section_workflow.compile().ainvoke(
+        {
+            "topic": "Data engineer",
+            "report_id": "test",
+            "section": section,
+            "search_iterations": 0,
+        },
+        {"configurable": {"revision_mode": "delta", "max_search_depth": 3}},
+    )
+
+    content = result["completed_sections"][0].content
+    assert content.startswith(STUB_SECTION_CONTENT.rstrip())
+    assert check_section(content).questions == 4
+    # The revision only produced the edits, and the merged draft was graded
+    assert calls == [Queries, None, Feedback, SectionRevision, Feedback]
+    assert "- no question on consumer groups" in prompts[0]
+    assert "numbered from 4" in prompts[0]
+
+
+@pytest.mark.asyncio
+async def test_delta_revisions_are_graded_separately_in_combined_mode(monkeypatch) -> None:
+    calls = []
+
+    def responder(schema, messages):
+        calls.append(schema)
+        if schema is SectionDraft:
+            return SectionDraft(
+                content=STUB_SECTION_CONTENT,
+                grade="fail",
+                follow_up_queries=[SearchQuery(search_query="kafka follow up")],
+            )
+        return StubChatModel().default_response(schema)
+
+    async def fake_search(query_list, max_depth, *args, **kwargs):
+        return unique_sources([fake_search_response(q, 1) for q in query_list])
+
+    monkeypatch.setattr(
+        model_registry, "factory", lambda **kw: StubChatModel(responder=responder)
+    )
+    monkeypatch.setattr(graph_module, "async_search", fake_search)
+    model_registry.clear()
+    before = grading_stats.delta_revision_grades
+
+    section = Section(name="Kafka", description="Kafka", research=True, content="")
+    await graph_module.section_workflow.compile().ainvoke(
+        {
+            "topic": "Data engineer",
+            "report_id": "test",
+            "section": section,
+            "search_iterations": 0,
+        },
+        {
+            "configurable": {
+                "revision_mode": "delta",
+                "grading_mode": "combined",
+                "max_search_depth": 3,
+            }
+        },
+    )
+
+    # The first draft grades itself; the merged revision needs the grader
+    assert calls == [Queries, SectionDraft, SectionRevision, Feedback]
+    assert grading_stats.delta_revision_grades == before + 1
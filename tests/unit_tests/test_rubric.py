@@ -0,0 +1,82 @@
+import importlib
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from agent.models import model_registry
+from agent.rubric import check_section, grading_stats
+from agent.state import Feedback, Queries, SearchQuery, Section
+from agent.testing import STUB_SECTION_CONTENT, StubChatModel, fake_search_response
+from agent.utils import unique_sources
+
+graph_module = importlib.import_module("agent.graph")
+
+
+def test_rubric_counts_questions_tables_and_lists() -> None:
+    result = check_section(STUB_SECTION_CONTENT)
+    assert result.passed
+    assert result.questions == 3
+    assert result.has_table
+
+    draft = """## Caching
+
+Caching keeps hot data close to the application.
+
+- Cache-aside loads data on a miss
+- Write-through updates the cache on every write
+
+1. What does cache-aside do on a miss?
+   a) Loads the data
+   b) Returns an error
+"""
+    result = check_section(draft)
+    assert result.has_list and not result.has_table
+    assert result.questions == 1
+    assert result.failures == [
+        "1 of 3 multiple-choice questions",
+        f"{result.words} of 150 words",
+    ]
+    assert "no table or list" in check_section("Just prose.").failures
+
+
+@pytest.mark.asyncio
+async def test_structural_failure_skips_llm_grader(monkeypatch) -> None:
+    drafts = iter(["## Too short", STUB_SECTION_CONTENT])
+    calls = []
+    fetched = []
+
+    def responder(schema, messages):
+        calls.append(schema)
+        if schema is Queries:
+            return Queries(queries=[SearchQuery(search_query="kafka basics")])
+        if schema is Feedback:
+            return Feedback(grade="pass", follow_up_queries=[])
+        return AIMessage(content=next(drafts))
+
+    async def fake_search(query_list, max_depth, *args, **kwargs):
+        fetched.append(list(query_list))
+        return unique_sources([fake_search_response(q, 1) for q in query_list])
+
+    monkeypatch.setattr(
+        model_registry, "factory", lambda **kw: StubChatModel(responder=responder)
+    )
+    monkeypatch.setattr(graph_module, "async_search", fake_search)
+    model_registry.clear()
+    saved = grading_stats.local_failures
+
+    section = Section(name="Kafka", description="Kafka", research=True, content="")
+    result = await graph_module.section_workflow.compile().ainvoke(
+        {
+            "topic": "Data engineer",
+            "report_id": "test",
+            "section": section,
+            "search_iterations": 0,
+        },
+        {"configurable": {"max_search_depth": 3}},
+    )
+
+    assert result["completed_sections"][0].content == STUB_SECTION_CONTENT
+    # Only the structurally complete second draft reached the LLM grader
+    assert calls.count(Feedback) == 1
+    assert grading_stats.local_failures == saved + 1
+    assert "Kafka interview questions and answers" in fetched[1]
@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+
+from agent.scheduler import SearchScheduler
+
+
+@pytest.mark.asyncio
+async def test_retries_timeouts_with_backoff() -> None:
+    scheduler = SearchScheduler(rate_per_second=1000, max_retries=3, base_delay=0)
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise TimeoutError()
+        return "ok"
+
+    assert await scheduler.run(flaky) == "ok"
+    assert scheduler.stats.retries == 2
+    assert scheduler.stats.completed == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrency_cap_and_queue_metrics() -> None:
+    scheduler = SearchScheduler(max_concurrency=2, rate_per_second=1000)
+    in_flight = []
+    peak = []
+
+    async def search():
+        in_flight.append(1)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.pop()
+
+    await asyncio.gather(*(scheduler.run(search) for _ in range(6)))
+    assert max(peak) == 2
+    assert scheduler.stats.max_queue_depth >= 4
+    assert scheduler.stats.queue_depth == 0
@@ -0,0 +1,33 @@
+import asyncio
+
+from agent.search_client import TavilySearchClient
+
+
+def test_pool_from_a_finished_loop_is_closed() -> None:
+    search_client = TavilySearchClient(api_key="test")
+
+    async def get_client():
+        return await search_client.get_client()
+
+    first = asyncio.run(get_client())
+    second = asyncio.run(get_client())
+
+    assert second is not first
+    assert first.is_closed
+    assert not second.is_closed
+    asyncio.run(search_client.aclose())
+
+
+def test_proxies_come_from_the_environment(monkeypatch) -> None:
+    monkeypatch.setenv("TAVILY_HTTPS_PROXY", "http://proxy.example:3128")
+    monkeypatch.delenv("TAVILY_HTTP_PROXY", raising=False)
+
+    search_client = TavilySearchClient(api_key="test")
+
+    assert search_client.proxies == {"https://": "http://proxy.example:3128"}
+    assert TavilySearchClient(
+        api_key="test", proxies={"http": "http://other.example:8080"}
+    ).proxies == {
+        "http://": "http://other.example:8080",
+        "https://": "http://proxy.example:3128",
+    }
@@ -0,0 +1,40 @@
+"""Benchmark that research sections fanned out with Send run concurrently."""
+import importlib
+import time
+
+import pytest
+
+from agent.models import model_registry
+from agent.testing import fake_search_response, stub_model_factory
+from agent.utils import unique_sources
+
+graph_module = importlib.import_module("agent.graph")
+
+LATENCY = 0.2
+
+
+async def _fake_search(query_list, max_depth, *args, **kwargs):
+    return unique_sources([fake_search_response(q, max_depth) for q in query_list])
+
+
+async def _run_report(monkeypatch, num_sections: int) -> float:
+    monkeypatch.setattr(
+        model_registry,
+        "factory",
+        stub_model_factory(latency=LATENCY, num_research_sections=num_sections),
+    )
+    monkeypatch.setattr(graph_module, "async_search", _fake_search)
+    model_registry.clear()
+    start = time.perf_counter()
+    result = await graph_module.graph.ainvoke({"topic": "Backend engineer"})
+    elapsed = time.perf_counter() - start
+    assert result["final_report"]
+    return elapsed
+
+
+@pytest.mark.asyncio
+async def test_sections_run_concurrently(monkeypatch) -> None:
+    single = await _run_report(monkeypatch, 1)
+    many = await _run_report(monkeypatch, 8)
+    # Eight sections should cost roughly one section's latency, not eight
+    assert many < single + 2 * LATENCY
@@ -0,0 +1,111 @@
+import importlib
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from agent.models import model_registry
+from agent.state import Feedback, Queries, SearchQuery, Section, SectionDraft
+from agent.testing import STUB_SECTION_CONTENT, StubChatModel, fake_search_response
+from agent.utils import unique_sources
+
+graph_module = importlib.import_module("agent.graph")
+
+
+@pytest.mark.asyncio
+async def test_follow_up_round_only_sees_new_evidence(monkeypatch) -> None:
+    prompts = {"writer": [], "grader": []}
+    grades = iter(["fail", "pass"])
+
+    def responder(schema, messages):
+        if schema is Queries:
+            return Queries(queries=[SearchQuery(search_query="kafka basics")])
+        if schema is Feedback:
+            prompts["grader"].append(messages[0].content)
+            return Feedback(
+                grade=next(grades),
+                follow_up_queries=[SearchQuery(search_query="kafka follow up")],
+            )
+        prompts["writer"].append(messages[1].content)
+        return AIMessage(content=f"## Kafka draft {len(prompts['writer'])}")
+
+    fetched = []
+
+    async def fake_search(query_list, max_depth, *args, **kwargs):
+        fetched.append(list(query_list))
+        # Every round also returns a page the section has already seen
+        queries = ["kafka basics", *query_list]
+        return unique_sources([fake_search_response(q, 1) for q in queries])
+
+    monkeypatch.setattr(
+        model_registry, "factory", lambda **kw: StubChatModel(responder=responder)
+    )
+    monkeypatch.setattr(graph_module, "async_search", fake_search)
+    model_registry.clear()
+
+    section = Section(name="Kafka", description="Kafka", research=True, content="")
+    result = await graph_module.section_workflow.compile().ainvoke(
+        {
+            "topic": "Data engineer",
+            "report_id": "test",
+            "section": section,
+            "search_iterations": 0,
+        },
+        # Drafts are one line, so skip the structural rubric to reach the grader
+        {
+            "configurable": {
+                "max_search_depth": 3,
+                "passage_top_k": 10,
+                "local_grading": False,
+            }
+        },
+    )
+
+    assert fetched == [["kafka basics"], ["kafka follow up"]]
+    assert result["completed_sections"][0].content == "## Kafka draft 2"
+    revision_prompt = prompts["writer"][1]
+    assert "kafka-follow-up" in revision_prompt
+    assert "kafka-basics" not in revision_prompt
+    assert "## Kafka draft 1" in revision_prompt
+    assert "kafka-follow-up" in prompts["grader"][1]
+    assert "kafka-basics" not in prompts["grader"][1]
+
+
+@pytest.mark.asyncio
+async def test_combined_mode_writes_and_grades_in_one_call(monkeypatch) -> None:
+    calls = []
+    grades = iter(["fail", "pass"])
+
+    def responder(schema, messages):
+        calls.append(schema)
+        if schema is Queries:
+            return Queries(queries=[SearchQuery(search_query="kafka basics")])
+        assert schema is SectionDraft
+        return SectionDraft(
+            content=STUB_SECTION_CONTENT,
+            grade=next(grades),
+            follow_up_queries=[SearchQuery(search_query="kafka follow up")],
+        )
+
+    async def fake_search(query_list, max_depth, *args, **kwargs):
+        return unique_sources([fake_search_response(q, 1) for q in query_list])
+
+    monkeypatch.setattr(
+        model_registry, "factory", lambda **kw: StubChatModel(responder=responder)
+    )
+    monkeypatch.setattr(graph_module, "async_search", fake_search)
+    model_registry.clear()
+
+    section = Section(name="Kafka", description="Kafka", research=True, content="")
+    result = await graph_module.section_workflow.compile().ainvoke(
+        {
+            "topic": "Data engineer",
+            "report_id": "test",
+            "section": section,
+            "search_iterations": 0,
+        },
+        {"configurable": {"grading_mode": "combined", "max_search_depth": 3}},
+    )
+
+    assert result["completed_sections"][0].content == STUB_SECTION_CONTENT
+    # Two iterations, each a single structured call with no separate grader
+    assert calls == [Queries, SectionDraft, SectionDraft]
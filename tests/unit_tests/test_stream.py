@@ -0,0 +1,64 @@
+import importlib
+import json
+
+import pytest
+
+from agent.models import model_registry
+from agent.runs import format_sse, open_checkpointer, stream_report
+from agent.state import JobDescriptionValidation
+from agent.testing import StubChatModel, fake_search_response
+from agent.utils import unique_sources
+
+graph_module = importlib.import_module("agent.graph")
+
+
+async def fake_search(query_list, max_depth, *args, **kwargs):
+    return unique_sources([fake_search_response(q, 1) for q in query_list])
+
+
+@pytest.mark.asyncio
+async def test_stream_emits_sections_before_report(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(
+        model_registry,
+        "factory",
+        lambda **kw: StubChatModel(latency=0.01, num_research_sections=3),
+    )
+    monkeypatch.setattr(graph_module, "async_search", fake_search)
+    model_registry.clear()
+
+    async with open_checkpointer(str(tmp_path / "checkpoints.sqlite")) as saver:
+        graph = graph_module.compile_graph(saver)
+        events = [e async for e in stream_report(graph, "Backend engineer")]
+
+    names = [e["event"] for e in events]
+    assert names[:2] == ["validation", "plan"]
+    assert events[0]["data"] == {"valid": True}
+    assert len(events[1]["data"]["sections"]) == 5
+    # Three research sections, then the introduction and conclusion
+    assert names[2:] == ["section"] * 5 + ["report"]
+    assert events[-1]["data"]["final_report"]
+
+    encoded = format_sse(events[0])
+    assert encoded.startswith("event: validation\ndata: ")
+    assert json.loads(encoded.split("data: ")[1]) == {"valid": True}
+
+
+@pytest.mark.asyncio
+async def test_stream_reports_invalid_job_description(monkeypatch, tmp_path) -> None:
+    def responder(schema, messages):
+        if schema is JobDescriptionValidation:
+            return JobDescriptionValidation(valid="invalid")
+        return StubChatModel().default_response(schema)
+
+    monkeypatch.setattr(
+        model_registry, "factory", lambda **kw: StubChatModel(responder=responder)
+    )
+    model_registry.clear()
+
+    async with open_checkpointer(str(tmp_path / "checkpoints.sqlite")) as saver:
+        graph = graph_module.compile_graph(saver)
+        events = [e async for e in stream_report(graph, "Not a job posting")]
+
+    assert [e["event"] for e in events] == ["validation", "report"]
+    assert events[0]["data"] == {"valid": False}
+    assert "Invalid job description" in events[1]["data"]["final_report"]
@@ -0,0 +1,56 @@
+import importlib
+
+import pytest
+
+from agent.models import model_registry
+from agent.state import JobDescriptionValidation
+from agent.testing import stub_model_factory
+from agent.validation import (
+    SEED_JOB_DESCRIPTIONS,
+    SEED_NON_JOB_DESCRIPTIONS,
+    JobDescriptionClassifier,
+    LinearClassifier,
+)
+
+graph_module = importlib.import_module("agent.graph")
+
+POSTING = """Product Analyst
+Responsibilities
+- Analyze conversion funnels with SQL
+- Build dashboards in Looker
+Requirements
+- 2+ years of experience in analytics
+- Strong communication skills"""
+
+
+@pytest.fixture(scope="module")
+def classifier() -> JobDescriptionClassifier:
+    model = LinearClassifier.train(SEED_JOB_DESCRIPTIONS, SEED_NON_JOB_DESCRIPTIONS)
+    return JobDescriptionClassifier(model)
+
+
+def test_clear_cases_are_decided_locally(classifier) -> None:
+    assert classifier.classify(POSTING) == "valid"
+    assert classifier.classify("Write me a haiku about autumn leaves") == "invalid"
+    # A bare title could still be a terse posting, so the LLM decides
+    assert classifier.classify("Backend engineer") is None
+    assert classifier.stats.fast_valid == 1
+    assert classifier.stats.fast_invalid == 1
+    assert classifier.stats.escalated == 1
+    assert classifier.stats.fast_path_share == pytest.approx(2 / 3)
+
+
+@pytest.mark.asyncio
+async def test_fast_path_skips_llm_validation(monkeypatch) -> None:
+    factory = stub_model_factory()
+    monkeypatch.setattr(model_registry, "factory", factory)
+    model_registry.clear()
+
+    result = await graph_module.is_valid_job_description({"topic": POSTING}, {})
+    assert result.goto == "planning_node"
+    assert JobDescriptionValidation not in factory.calls
+
+    await graph_module.is_valid_job_description(
+        {"topic": POSTING}, {"configurable": {"fast_validation": False}}
+    )
+    assert factory.calls == [JobDescriptionValidation]
@@ -0,0 +1,116 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from agent import vectorstore
+from agent.configuration import Configuration
+from agent.utils import search_vector_index
+from agent.vectorstore import LocalVectorIndex, build_local_index, get_vector_index
+
+
+class _CountingEmbeddings(DeterministicFakeEmbedding):
+    batches: int = 0
+
+    def embed_documents(self, texts):
+        self.batches += 1
+        return super().embed_documents(texts)
+
+
+def test_local_index_returns_nearest_first(tmp_path) -> None:
+    index = LocalVectorIndex(dimension=3)
+    index.upsert(
+        ["a", "b", "c"],
+        [[1, 0, 0], [0, 1, 0], [0.9, 0.1, 0]],
+        [{"text": "a"}, {"text": "b"}, {"text": "c"}],
+    )
+    matches = index.query([[1, 0, 0], [0, 1, 0]], top_k=2)
+    assert [m["id"] for m in matches[0]] == ["a", "c"]
+    assert matches[1][0]["id"] == "b"
+
+    path = str(tmp_path / "index.npz")
+    index.save(path)
+    assert LocalVectorIndex.load(path).query([[0, 1, 0]], 1)[0][0]["id"] == "b"
+
+
+def test_query_leaves_caller_vectors_unchanged() -> None:
+    index = LocalVectorIndex(dimension=2)
+    index.upsert(["a"], [[1, 0]], [{"text": "a"}])
+    vectors = np.array([[3.0, 4.0]], dtype=np.float32)
+
+    index.query(vectors, top_k=1)
+
+    assert vectors.tolist() == [[3.0, 4.0]]
+
+
+def test_local_backend_uses_the_built_index(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(vectorstore, "_local_indexes", {})
+    path = str(tmp_path / "index" / "local_index.npz")
+    config = Configuration(rag_backend="local", local_index_path=path)
+    # Without an index file the sections fall back to the web results
+    assert get_vector_index(config) is None
+
+    embeddings = DeterministicFakeEmbedding(size=8)
+    documents = [{"text": "hash maps", "title": "Maps"}, {"text": "binary trees"}]
+    build_local_index(documents, embeddings, path)
+
+    index = get_vector_index(config)
+    match = index.query([embeddings.embed_query("hash maps")], top_k=1)[0][0]
+    assert match["metadata"] == {"text": "hash maps", "title": "Maps"}
+
+
+@pytest.mark.asyncio
+async def test_queries_are_embedded_in_one_batch() -> None:
+    embeddings = _CountingEmbeddings(size=8)
+    texts = ["hash maps", "binary trees", "graph traversal"]
+    index = LocalVectorIndex(dimension=8)
+    index.upsert(
+        texts,
+        embeddings.embed_documents(texts),
+        [{"text": t, "title": t} for t in texts],
+    )
+    embeddings.batches = 0
+
+    context = await search_vector_index(index, embeddings, texts, top_k=1)
+    assert embeddings.batches == 1
+    assert all(f"Text: {t}" in context for t in texts)
+
+
+class _FakePinecone:
+    """Stands in for ``PineconeAsyncio`` and counts index lookups."""
+
+    clients = 0
+    lookups = 0
+
+    def __init__(self, api_key=None) -> None:
+        _FakePinecone.clients += 1
+
+    async def describe_index(self, name):
+        _FakePinecone.lookups += 1
+        return SimpleNamespace(host=f"{name}.example.com")
+
+    def IndexAsyncio(self, host):
+        return self
+
+    async def query(self, vector, top_k, include_metadata):
+        return SimpleNamespace(matches=[])
+
+    async def close(self) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_pinecone_index_is_reused_across_searches(monkeypatch) -> None:
+    monkeypatch.setattr(vectorstore, "PineconeAsyncio", _FakePinecone)
+    monkeypatch.setattr(vectorstore, "_pinecone_indexes", {})
+    config = Configuration(rag_backend="pinecone")
+
+    index = get_vector_index(config)
+    assert get_vector_index(config) is index
+    await index.query_many([[1.0, 0.0]], top_k=2)
+    await get_vector_index(config).query_many([[0.0, 1.0]], top_k=2)
+
+    assert _FakePinecone.clients == 1
+    assert _FakePinecone.lookups == 1
+    await vectorstore.close_vector_indexes()